@@ -42,9 +42,38 @@ class AutomationOrchestrator:
         Initialise l'orchestrateur avec les clients nécessaires
         """
         self.supabase = get_supabase_client()
+        # Entreprises et formations reviennent d'une page de sessions à l'autre :
+        # les lectures groupées servent les IDs déjà en cache
+        if self.supabase.cache is None:
+            self.supabase.activer_cache()
         self.email = get_email_client()
         self.pdf = get_pdf_generator()
         
+    def _precharger(self, sessions):
+        """
+        Charge en une fois les entreprises et formations d'un lot de sessions
+        
+        Returns:
+            tuple: (entreprises par ID, formations par ID)
+        """
+        entreprises = self.supabase.get_entreprises_by_ids([s.get("entreprise_id") for s in sessions])
+        formations = self.supabase.get_formations_by_ids([s.get("formation_catalogue_id") for s in sessions])
+        return entreprises, formations
+    
+    def _parcourir_sessions(self, statut):
+        """
+        Parcourt les sessions d'un statut page par page (mémoire constante),
+        entreprises et formations étant préchargées pour chaque page ; seules les
+        colonnes de la projection "scheduling" sont lues
+        
+        Yields:
+            tuple: (session, entreprise ou None, formation ou None)
+        """
+        for sessions in self.supabase.iter_sessions_pages({"statut": statut}, columns="scheduling"):
+            entreprises, formations = self._precharger(sessions)
+            for session in sessions:
+                yield session, entreprises.get(session["entreprise_id"]), formations.get(session["formation_catalogue_id"])
+    
     def process_new_requests(self):
         """
         Traite les nouvelles demandes de formation
@@ -53,21 +82,12 @@ class AutomationOrchestrator:
         """
         logger.info("Traitement des nouvelles demandes de formation...")
         
-        # Récupérer les sessions avec statut "demande"
-        sessions = self.supabase.get_sessions({"statut": "demande"})
-        
-        if not sessions:
-            logger.info("Aucune nouvelle demande à traiter")
-            return
-        
-        logger.info(f"Traitement de {len(sessions)} nouvelles demandes")
-        
-        for session in sessions:
+        # Parcourir les sessions avec statut "demande" par pages
+        # (entreprises et formations préchargées pour chaque page)
+        nombre = 0
+        for session, entreprise, formation in self._parcourir_sessions("demande"):
+            nombre += 1
             try:
-                # Récupérer les détails de l'entreprise et de la formation
-                entreprise = self.supabase.get_entreprise_by_id(session["entreprise_id"])
-                formation = self.supabase.get_formation_by_id(session["formation_catalogue_id"])
-                
                 if not entreprise or not formation:
                     logger.error(f"Données manquantes pour la session {session['id']}")
                     continue
@@ -108,6 +128,11 @@ class AutomationOrchestrator:
                 
             except Exception as e:
                 logger.error(f"Erreur lors du traitement de la session {session['id']}: {str(e)}")
+        
+        if nombre == 0:
+            logger.info("Aucune nouvelle demande à traiter")
+        else:
+            logger.info(f"{nombre} nouvelles demandes traitées")
     
     def process_scheduled_sessions(self):
         """
@@ -117,16 +142,11 @@ class AutomationOrchestrator:
         """
         logger.info("Traitement des sessions planifiées...")
         
-        # Récupérer les sessions avec statut "confirmee"
-        sessions = self.supabase.get_sessions({"statut": "confirmee"})
-        
-        if not sessions:
-            logger.info("Aucune session planifiée à traiter")
-            return
-        
-        logger.info(f"Traitement de {len(sessions)} sessions planifiées")
-        
-        for session in sessions:
+        # Parcourir les sessions avec statut "confirmee" par pages
+        # (entreprises et formations préchargées pour chaque page)
+        nombre = 0
+        for session, entreprise, formation in self._parcourir_sessions("confirmee"):
+            nombre += 1
             try:
                 # Vérifier si la date de début est dans moins de 7 jours
                 date_debut = datetime.strptime(session["date_debut"], "%Y-%m-%d")
@@ -136,10 +156,6 @@ class AutomationOrchestrator:
                     logger.info(f"Session {session['id']} pas encore à 7 jours de son début")
                     continue
                 
-                # Récupérer les détails de l'entreprise et de la formation
-                entreprise = self.supabase.get_entreprise_by_id(session["entreprise_id"])
-                formation = self.supabase.get_formation_by_id(session["formation_catalogue_id"])
-                
                 if not entreprise or not formation:
                     logger.error(f"Données manquantes pour la session {session['id']}")
                     continue
@@ -165,6 +181,11 @@ class AutomationOrchestrator:
                 
             except Exception as e:
                 logger.error(f"Erreur lors du traitement de la session {session['id']}: {str(e)}")
+        
+        if nombre == 0:
+            logger.info("Aucune session planifiée à traiter")
+        else:
+            logger.info(f"{nombre} sessions planifiées traitées")
     
     def process_completed_sessions(self):
         """
@@ -174,21 +195,12 @@ class AutomationOrchestrator:
         """
         logger.info("Traitement des sessions terminées...")
         
-        # Récupérer les sessions avec statut "terminee"
-        sessions = self.supabase.get_sessions({"statut": "terminee"})
-        
-        if not sessions:
-            logger.info("Aucune session terminée à traiter")
-            return
-        
-        logger.info(f"Traitement de {len(sessions)} sessions terminées")
-        
-        for session in sessions:
+        # Parcourir les sessions avec statut "terminee" par pages
+        # (entreprises et formations préchargées pour chaque page)
+        nombre = 0
+        for session, entreprise, formation in self._parcourir_sessions("terminee"):
+            nombre += 1
             try:
-                # Récupérer les détails de l'entreprise et de la formation
-                entreprise = self.supabase.get_entreprise_by_id(session["entreprise_id"])
-                formation = self.supabase.get_formation_by_id(session["formation_catalogue_id"])
-                
                 if not entreprise or not formation:
                     logger.error(f"Données manquantes pour la session {session['id']}")
                     continue
@@ -225,6 +237,11 @@ class AutomationOrchestrator:
                 
             except Exception as e:
                 logger.error(f"Erreur lors du traitement de la session {session['id']}: {str(e)}")
+        
+        if nombre == 0:
+            logger.info("Aucune session terminée à traiter")
+        else:
+            logger.info(f"{nombre} sessions terminées traitées")
     
     def check_upcoming_sessions(self):
         """
@@ -232,16 +249,11 @@ class AutomationOrchestrator:
         """
         logger.info("Vérification des sessions à venir...")
         
-        # Récupérer les sessions avec statut "convoquee"
-        sessions = self.supabase.get_sessions({"statut": "convoquee"})
-        
-        if not sessions:
-            logger.info("Aucune session à venir à vérifier")
-            return
-        
-        logger.info(f"Vérification de {len(sessions)} sessions à venir")
-        
-        for session in sessions:
+        # Parcourir les sessions avec statut "convoquee" par pages
+        # (entreprises et formations préchargées pour chaque page)
+        nombre = 0
+        for session, entreprise, formation in self._parcourir_sessions("convoquee"):
+            nombre += 1
             try:
                 # Vérifier si la date de début est dans moins de 2 jours
                 date_debut = datetime.strptime(session["date_debut"], "%Y-%m-%d")
@@ -251,10 +263,6 @@ class AutomationOrchestrator:
                     logger.info(f"Session {session['id']} pas encore à 2 jours de son début")
                     continue
                 
-                # Récupérer les détails de l'entreprise et de la formation
-                entreprise = self.supabase.get_entreprise_by_id(session["entreprise_id"])
-                formation = self.supabase.get_formation_by_id(session["formation_catalogue_id"])
-                
                 if not entreprise or not formation:
                     logger.error(f"Données manquantes pour la session {session['id']}")
                     continue
@@ -288,6 +296,11 @@ class AutomationOrchestrator:
                 
             except Exception as e:
                 logger.error(f"Erreur lors de la vérification de la session {session['id']}: {str(e)}")
+        
+        if nombre == 0:
+            logger.info("Aucune session à venir à vérifier")
+        else:
+            logger.info(f"{nombre} sessions à venir vérifiées")
     
     def run_all_tasks(self):
         """
@@ -300,6 +313,9 @@ class AutomationOrchestrator:
         self.process_completed_sessions()
         self.check_upcoming_sessions()
         
+        # Compteurs Supabase (nouvelles tentatives, disjoncteur, latence, cache)
+        logger.info(f"Statistiques Supabase: {self.supabase.statistiques()}")
+        
         logger.info("Automatisation terminée avec succès")
 
 def main():
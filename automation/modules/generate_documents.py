@@ -1,4 +1,5 @@
 import wmill
+import asyncio
 import uuid
 import base64
 from datetime import datetime
@@ -9,7 +10,12 @@ from pathlib import Path
 
 # Ajouter le répertoire parent au path pour pouvoir importer les modules
 sys.path.append(str(Path(__file__).parent.parent))
+sys.path.append(str(Path(__file__).parent.parent.parent / "services"))
 
+from documentRendu import empreinte_entrees
+from utils.async_supabase_client import get_async_supabase_client
+from utils.data_access import get_data_access
+from utils.document_publisher import DocumentPublisher
 from utils.supabase_client import get_supabase_client
 
 async def main(
@@ -63,17 +69,30 @@ async def main(
         participants = [None]  # Un seul document sans participant spécifique
     
     # Générer les documents pour chaque participant ou un document global
-    documents_generes = []
+    # (les rendus se chevauchent : wmill.run_script, bloquant, est exécuté dans le pool
+    # de threads du client asynchrone ; l'ordre des participants est conservé)
+    rendus = await asyncio.gather(*[
+        render_document(session=session, participant=participant, type_document=type_document)
+        for participant in participants
+    ])
     
-    for participant in participants:
-        document_info = await generate_document(
+    # Sauvegarder tous les documents dans Supabase en un lot
+    urls = [None] * len(rendus)
+    if sauvegarder_supabase:
+        urls = await save_documents_to_supabase(session, participants, type_document, rendus)
+    
+    # Envoyer les emails simultanément
+    documents_generes = await asyncio.gather(*[
+        finalize_document(
             session=session,
             participant=participant,
             type_document=type_document,
-            envoyer_email=envoyer_email,
-            sauvegarder_supabase=sauvegarder_supabase
+            rendu=rendu,
+            document_url=document_url,
+            envoyer_email=envoyer_email
         )
-        documents_generes.append(document_info)
+        for participant, rendu, document_url in zip(participants, rendus, urls)
+    ])
     
     # Retourner les informations sur les documents générés
     return {
@@ -85,7 +104,7 @@ async def main(
         },
         "type_document": type_document,
         "nombre_documents": len(documents_generes),
-        "documents": documents_generes
+        "documents": list(documents_generes)
     }
 
 async def get_session_details(session_id):
@@ -94,13 +113,7 @@ async def get_session_details(session_id):
     """
     try:
         # Utiliser la vue qui joint les tables sessions, formations et entreprises
-        vue_sessions = await wmill.get_resource("supabase/vue_sessions_formation")
-        session = next((s for s in vue_sessions if s["id"] == session_id), None)
-        
-        if not session:
-            return None
-        
-        return session
+        return await get_async_supabase_client().executer(get_data_access().get_session_details, session_id)
     except Exception as e:
         print(f"Erreur lors de la récupération des détails de la session: {str(e)}")
         return None
@@ -110,9 +123,7 @@ async def get_participant(participant_id):
     Récupère les informations d'un participant
     """
     try:
-        participants = await wmill.get_resource("supabase/participants")
-        participant = next((p for p in participants if p["id"] == participant_id), None)
-        return participant
+        return await get_async_supabase_client().executer(get_data_access().get_participant, participant_id)
     except Exception as e:
         print(f"Erreur lors de la récupération du participant: {str(e)}")
         return None
@@ -122,23 +133,24 @@ async def get_session_participants(session_id):
     Récupère tous les participants d'une session
     """
     try:
-        participants = await wmill.get_resource("supabase/participants")
-        session_participants = [p for p in participants if p["session_formation_id"] == session_id]
-        return session_participants
+        return await get_async_supabase_client().executer(get_data_access().get_session_participants, session_id)
     except Exception as e:
         print(f"Erreur lors de la récupération des participants: {str(e)}")
         return []
 
-async def generate_document(session, participant, type_document, envoyer_email, sauvegarder_supabase):
+async def render_document(session, participant, type_document):
     """
-    Génère un document pour une session et un participant
+    Génère le contenu d'un document pour une session et un participant
+    
+    Returns:
+        tuple: (nom du fichier, contenu du document, empreinte des entrées) ou l'exception levée
     """
     try:
         # Préparer les données pour le document
         document_data = prepare_document_data(session, participant, type_document)
         
-        # Appeler le service de génération de document via Node.js
-        document_buffer = None
+        # Script Windmill du service de génération de document via Node.js
+        script = None
         document_filename = None
         
         if type_document == "convocation":
@@ -147,8 +159,8 @@ async def generate_document(session, participant, type_document, envoyer_email,
             if participant:
                 document_filename = f"Convocation_{participant['nom']}_{participant['prenom']}_{datetime.now().strftime('%Y%m%d')}.pdf"
             
-            # Appeler le service Node.js pour générer la convocation
-            document_buffer = await wmill.run_script("documents/generate_invitation", document_data)
+            # Service Node.js de génération de la convocation
+            script = "documents/generate_invitation"
             
         elif type_document == "certificat":
             # Générer un certificat de réalisation
@@ -157,8 +169,8 @@ async def generate_document(session, participant, type_document, envoyer_email,
             
             document_filename = f"Certificat_{participant['nom']}_{participant['prenom']}_{datetime.now().strftime('%Y%m%d')}.pdf"
             
-            # Appeler le service Node.js pour générer le certificat
-            document_buffer = await wmill.run_script("documents/generate_certificate", document_data)
+            # Service Node.js de génération du certificat
+            script = "documents/generate_certificate"
             
         elif type_document == "evaluation":
             # Générer un formulaire d'évaluation
@@ -166,60 +178,73 @@ async def generate_document(session, participant, type_document, envoyer_email,
             if participant:
                 document_filename = f"Evaluation_{participant['nom']}_{participant['prenom']}_{datetime.now().strftime('%Y%m%d')}.pdf"
             
-            # Appeler le service Node.js pour générer l'évaluation
-            document_buffer = await wmill.run_script("documents/generate_evaluation", document_data)
+            # Service Node.js de génération de l'évaluation
+            script = "documents/generate_evaluation"
             
         else:
             raise ValueError(f"Type de document non pris en charge: {type_document}")
         
-        # Sauvegarder le document dans Supabase si demandé
-        document_url = None
-        if sauvegarder_supabase and document_buffer:
-            document_url = await save_document_to_supabase(
-                session_id=session["id"],
-                participant_id=participant["id"] if participant else None,
-                document_type=type_document,
-                document_filename=document_filename,
-                document_buffer=document_buffer
-            )
-        
-        # Envoyer par email si demandé
-        email_sent = False
-        if envoyer_email and participant and participant.get("email") and document_buffer:
-            email_sent = await send_document_by_email(
-                email=participant["email"],
-                nom=participant["nom"],
-                prenom=participant["prenom"],
-                type_document=type_document,
-                document_filename=document_filename,
-                document_buffer=document_buffer,
-                formation_titre=session["formation_titre"]
-            )
-        
-        # Retourner les informations sur le document généré
-        return {
-            "type": type_document,
-            "filename": document_filename,
-            "participant": {
-                "id": participant["id"] if participant else None,
-                "nom": participant["nom"] if participant else None,
-                "prenom": participant["prenom"] if participant else None,
-                "email": participant["email"] if participant else None
-            } if participant else None,
-            "url": document_url,
-            "email_sent": email_sent
-        }
+        # Rendu incrémental : un document déjà publié avec les mêmes données
+        # (documents.metadata->>empreinte_entrees) est repris sans appeler le service
+        empreinte = empreinte_entrees(document_data, script)
+        publie = await get_async_supabase_client().executer(
+            _publisher().contenu_publie, empreinte, session["id"], participant["id"] if participant else None
+        )
+        if publie is not None:
+            ligne, document_buffer = publie
+            return ligne["nom_fichier"], document_buffer, empreinte
+
+        # Appeler le service Node.js pour générer le document (appel bloquant exécuté hors de la boucle)
+        document_buffer = await get_async_supabase_client().executer(wmill.run_script, script, document_data)
+
+        return document_filename, document_buffer, empreinte
     except Exception as e:
         print(f"Erreur lors de la génération du document: {str(e)}")
+        return e
+
+async def finalize_document(session, participant, type_document, rendu, document_url, envoyer_email):
+    """
+    Envoie un document généré par email et retourne ses informations
+    """
+    if isinstance(rendu, Exception):
         return {
             "type": type_document,
-            "error": str(e),
+            "error": str(rendu),
             "participant": {
                 "id": participant["id"] if participant else None,
                 "nom": participant["nom"] if participant else None,
                 "prenom": participant["prenom"] if participant else None
             } if participant else None
         }
+    
+    document_filename, document_buffer, _ = rendu
+    
+    # Envoyer par email si demandé
+    email_sent = False
+    if envoyer_email and participant and participant.get("email") and document_buffer:
+        email_sent = await send_document_by_email(
+            email=participant["email"],
+            nom=participant["nom"],
+            prenom=participant["prenom"],
+            type_document=type_document,
+            document_filename=document_filename,
+            document_buffer=document_buffer,
+            formation_titre=session["formation_titre"]
+        )
+    
+    # Retourner les informations sur le document généré
+    return {
+        "type": type_document,
+        "filename": document_filename,
+        "participant": {
+            "id": participant["id"] if participant else None,
+            "nom": participant["nom"] if participant else None,
+            "prenom": participant["prenom"] if participant else None,
+            "email": participant["email"] if participant else None
+        } if participant else None,
+        "url": document_url,
+        "email_sent": email_sent
+    }
 
 def prepare_document_data(session, participant, type_document):
     """
@@ -269,68 +294,72 @@ def format_date_range(date_debut, date_fin):
     except:
         return date_debut  # Retourner la date brute en cas d'erreur
 
-async def save_document_to_supabase(session_id, participant_id, document_type, document_filename, document_buffer):
+async def save_documents_to_supabase(session, participants, document_type, rendus):
     """
-    Sauvegarde un document dans Supabase Storage et ses métadonnées dans la table documents
+    Sauvegarde les documents générés dans Supabase Storage et leurs métadonnées
+    dans la table documents (uploads simultanés, une seule insertion)
+    
+    Returns:
+        list: URL de chaque document (None si non sauvegardé), dans l'ordre des rendus
     """
+    urls = [None] * len(rendus)
     try:
-        # Créer un ID unique pour le document
-        document_id = str(uuid.uuid4())
-        
-        # Obtenir le client Supabase
-        supabase_client = get_supabase_client()
-        
-        # Définir le chemin du fichier dans le bucket
-        # Format: sessions/{session_id}/{document_type}/{document_id}_{filename}
-        storage_path = f"sessions/{session_id}/{document_type}/{document_id}_{document_filename}"
-        
-        # Upload le document vers Supabase Storage
         bucket_name = "documents"
-        upload_result = supabase_client.upload_document(
-            bucket_name=bucket_name,
-            file_path=storage_path,
-            file_data=document_buffer,
-            content_type='application/pdf'
-        )
-        
-        if not upload_result:
-            print(f"Échec de l'upload du document vers Supabase Storage")
-            return None
+        documents = []
+        positions = []
         
-        # Obtenir l'URL signée du document
-        document_url = supabase_client.get_document_url(bucket_name, storage_path)
+        for position, (participant, rendu) in enumerate(zip(participants, rendus)):
+            if isinstance(rendu, Exception) or not rendu[1]:
+                continue
+            document_filename, document_buffer, empreinte = rendu
+            
+            # Le fichier est stocké sous l'empreinte de son contenu :
+            # un document identique déjà publié n'est pas uploadé à nouveau ;
+            # l'empreinte des entrées évite le rendu et la ligne lors d'une régénération
+            documents.append({
+                "contenu": document_buffer,
+                "content_type": "application/pdf",
+                "empreinte_entrees": empreinte,
+                "metadata": {
+                    "id": str(uuid.uuid4()),
+                    "session_formation_id": session["id"],
+                    "participant_id": participant["id"] if participant else None,
+                    "type": document_type,
+                    "nom_fichier": document_filename,
+                    "metadata": {
+                        "uploaded_at": datetime.now().isoformat(),
+                        "bucket": bucket_name
+                    }
+                }
+            })
+            positions.append(position)
         
-        # Créer l'entrée de métadonnées dans la table documents
-        document_metadata = {
-            "id": document_id,
-            "session_formation_id": session_id,
-            "participant_id": participant_id,
-            "type": document_type,
-            "nom_fichier": document_filename,
-            "storage_path": storage_path,
-            "taille_fichier": len(document_buffer),
-            "mime_type": "application/pdf",
-            "metadata": {
-                "uploaded_at": datetime.now().isoformat(),
-                "bucket": bucket_name
-            }
-        }
+        if not documents:
+            return urls
         
-        # Sauvegarder les métadonnées dans la table documents
-        saved_metadata = supabase_client.save_document_metadata(document_metadata)
+        resultats = await get_async_supabase_client().executer(_publisher(bucket_name).publier, documents)
         
-        if not saved_metadata:
-            print(f"Échec de la sauvegarde des métadonnées du document")
-            # Le fichier est uploadé mais les métadonnées n'ont pas été sauvegardées
+        for position, resultat in zip(positions, resultats):
+            if resultat["error"]:
+                print(f"Échec de la sauvegarde du document {resultat['storage_path']}: {resultat['error']}")
+            # Le fichier peut être uploadé sans que les métadonnées soient sauvegardées
             # On retourne quand même l'URL
+            if resultat["uploaded"]:
+                urls[position] = resultat["url"] or resultat["storage_path"]
         
-        # Retourner l'URL du document
-        return document_url if document_url else storage_path
+        return urls
     except Exception as e:
-        print(f"Erreur lors de la sauvegarde du document dans Supabase: {str(e)}")
+        print(f"Erreur lors de la sauvegarde des documents dans Supabase: {str(e)}")
         import traceback
         traceback.print_exc()
-        return None
+        return urls
+
+def _publisher(bucket_name="documents"):
+    """
+    Publisher des documents partageant le client et la résilience du SupabaseClient
+    """
+    supabase_client = get_supabase_client()
+    return DocumentPublisher(supabase_client.client, bucket_name, resilience=supabase_client.resilience)
 
 async def send_document_by_email(email, nom, prenom, type_document, document_filename, document_buffer, formation_titre):
     """
@@ -386,8 +415,8 @@ async def send_document_by_email(email, nom, prenom, type_document, document_fil
             ]
         }
         
-        # Envoyer l'email via le service d'email configuré dans Windmill
-        await wmill.run_script("email/send_email_with_attachment", email_data)
+        # Envoyer l'email via le service d'email configuré dans Windmill (appel bloquant exécuté hors de la boucle)
+        await get_async_supabase_client().executer(wmill.run_script, "email/send_email_with_attachment", email_data)
         
         return True
     except Exception as e:
@@ -1,79 +1,97 @@
 import wmill
 from datetime import datetime, timedelta
+import base64
 import json
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour pouvoir importer les modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.supabase_client import get_supabase_client
 
 async def main(
     statut=None,  # Optionnel: filtrer par statut (demande, en_attente, confirmee, convoquee, terminee, archivee, annulee)
     periode=None,  # Optionnel: "a_venir", "passees", "toutes"
     entreprise_id=None,  # Optionnel: filtrer par ID d'entreprise
     jours_a_venir=30,  # Nombre de jours à considérer pour les sessions à venir
-    inclure_participants=False  # Inclure les détails des participants
+    inclure_participants=False,  # Inclure les détails des participants
+    limite=None,  # Optionnel: nombre de sessions par page
+    curseur=None  # Optionnel: curseur renvoyé par la page précédente
 ):
     """
     Liste les sessions de formation avec possibilité de filtrage
-    
+
     Args:
         statut: Filtrer par statut (demande, en_attente, confirmee, convoquee, terminee, archivee, annulee)
         periode: "a_venir" (sessions futures), "passees" (sessions passées), "toutes" (toutes les sessions)
         entreprise_id: ID de l'entreprise pour filtrer les sessions
         jours_a_venir: Pour periode="a_venir", nombre de jours à considérer
         inclure_participants: Si True, inclut les détails des participants pour chaque session
-        
+        limite: Nombre maximum de sessions retournées (pagination)
+        curseur: Valeur "curseur_suivant" de la page précédente
+
     Returns:
         Liste des sessions de formation correspondant aux critères
     """
     # Initialiser la période si non spécifiée
     if periode is None:
         periode = "a_venir"
-    
-    # Récupérer toutes les sessions depuis Supabase via MCP
-    sessions = await wmill.get_resource("supabase/sessions_formation")
-    
-    # Récupérer les formations et entreprises pour enrichir les données
-    formations = await wmill.get_resource("supabase/formations_catalogue")
-    entreprises = await wmill.get_resource("supabase/entreprises")
-    
+
+    supabase_client = get_supabase_client()
+
+    # Filtres appliqués directement par la base
+    date_aujourdhui = datetime.now().date()
+    date_limite = date_aujourdhui + timedelta(days=jours_a_venir)
+
+    filtres = {
+        "statut": statut,
+        "entreprise_id": entreprise_id
+    }
+    if periode == "a_venir":
+        filtres["date_debut_min"] = date_aujourdhui.isoformat()
+        filtres["date_debut_max"] = (date_limite + timedelta(days=1)).isoformat()
+    elif periode == "passees":
+        filtres["date_debut_max"] = date_aujourdhui.isoformat()
+
+    # Récupérer la page de sessions, triée par date de début
+    sessions, total = supabase_client.get_sessions_page(
+        filters=filtres,
+        limit=limite,
+        after=decoder_curseur(curseur),
+        columns="listing"
+    )
+
+    # Récupérer uniquement les formations et entreprises référencées
+    formations = supabase_client.get_rows_by_column(
+        "formations_catalogue", "id", [s.get("formation_catalogue_id") for s in sessions], columns="listing"
+    )
+    entreprises = supabase_client.get_rows_by_column(
+        "entreprises", "id", [s.get("entreprise_id") for s in sessions], columns="listing"
+    )
+
     # Créer des dictionnaires pour un accès rapide
     formations_dict = {f["id"]: f for f in formations}
     entreprises_dict = {e["id"]: e for e in entreprises}
-    
-    # Filtrer les sessions selon les critères
-    date_aujourdhui = datetime.now().date()
-    date_limite = date_aujourdhui + timedelta(days=jours_a_venir)
-    
+
+    # Récupérer les participants de toutes les sessions en une seule requête
+    participants_par_session = {}
+    if inclure_participants:
+        participants = supabase_client.get_rows_by_column(
+            "participants", "session_formation_id", [s["id"] for s in sessions], columns="listing"
+        )
+        for participant in participants:
+            participants_par_session.setdefault(participant["session_formation_id"], []).append(participant)
+
     sessions_filtrees = []
-    
+
     for session in sessions:
-        # Convertir les dates de string à date
-        if session.get("date_debut"):
-            date_debut = datetime.fromisoformat(session["date_debut"].replace("Z", "+00:00")).date()
-        else:
-            date_debut = None
-            
-        # Appliquer le filtre de période
-        if periode == "a_venir" and date_debut:
-            if date_debut < date_aujourdhui:
-                continue
-            if date_debut > date_limite:
-                continue
-        elif periode == "passees" and date_debut:
-            if date_debut >= date_aujourdhui:
-                continue
-                
-        # Appliquer le filtre de statut
-        if statut and session.get("statut") != statut:
-            continue
-            
-        # Appliquer le filtre d'entreprise
-        if entreprise_id and session.get("entreprise_id") != entreprise_id:
-            continue
-            
         # Enrichir la session avec les données de formation et d'entreprise
         formation_id = session.get("formation_catalogue_id")
-        entreprise_id = session.get("entreprise_id")
-        
+        session_entreprise_id = session.get("entreprise_id")
+
         session_enrichie = session.copy()
-        
+
         if formation_id and formation_id in formations_dict:
             formation = formations_dict[formation_id]
             session_enrichie["formation"] = {
@@ -81,27 +99,48 @@ async def main(
                 "duree": formation.get("duree"),
                 "prix_ht": formation.get("prix_ht")
             }
-            
-        if entreprise_id and entreprise_id in entreprises_dict:
-            entreprise = entreprises_dict[entreprise_id]
+
+        if session_entreprise_id and session_entreprise_id in entreprises_dict:
+            entreprise = entreprises_dict[session_entreprise_id]
             session_enrichie["entreprise"] = {
                 "nom": entreprise.get("nom"),
                 "email_contact": entreprise.get("email_contact"),
                 "telephone": entreprise.get("telephone")
             }
-            
+
         # Ajouter les participants si demandé
         if inclure_participants:
-            participants = await wmill.get_resource("supabase/participants")
-            session_participants = [p for p in participants if p.get("session_formation_id") == session["id"]]
-            session_enrichie["participants"] = session_participants
-            
+            session_enrichie["participants"] = participants_par_session.get(session["id"], [])
+
         sessions_filtrees.append(session_enrichie)
-    
-    # Trier les sessions par date de début
-    sessions_filtrees.sort(key=lambda s: s.get("date_debut", "9999-12-31"))
-    
+
+    # Curseur de la page suivante (None s'il n'y a plus de sessions)
+    curseur_suivant = None
+    if limite and len(sessions) == limite:
+        derniere = sessions[-1]
+        curseur_suivant = encoder_curseur(derniere.get("date_debut"), derniere["id"])
+
     return {
-        "total": len(sessions_filtrees),
-        "sessions": sessions_filtrees
+        "total": total,
+        "sessions": sessions_filtrees,
+        "curseur_suivant": curseur_suivant
     }
+
+def encoder_curseur(date_debut, session_id):
+    """
+    Encode la position (date_debut, id) de la dernière session d'une page
+    """
+    return base64.urlsafe_b64encode(json.dumps([date_debut, session_id]).encode("utf-8")).decode("ascii")
+
+def decoder_curseur(curseur):
+    """
+    Décode un curseur de pagination en (date_debut, id)
+    """
+    if not curseur:
+        return None
+
+    try:
+        date_debut, session_id = json.loads(base64.urlsafe_b64decode(curseur.encode("ascii")))
+        return date_debut, session_id
+    except Exception:
+        raise ValueError(f"Curseur de pagination invalide: {curseur}")
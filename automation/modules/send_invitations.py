@@ -1,7 +1,16 @@
 import wmill
+import asyncio
 import base64
 from datetime import datetime, timedelta
 import json
+import sys
+from pathlib import Path
+
+# Ajouter le répertoire parent au path pour pouvoir importer les modules
+sys.path.append(str(Path(__file__).parent.parent))
+
+from utils.async_supabase_client import get_async_supabase_client
+from utils.data_access import get_data_access
 
 async def main(
     session_id,  # ID de la session de formation (UUID)
@@ -74,17 +83,15 @@ async def main(
         else:
             print(f"Avertissement: Erreur lors de la génération des documents: {documents_result}")
     
-    # Envoyer les emails de convocation
-    emails_envoyes = []
+    # Documents générés par participant
+    documents_par_participant = {}
+    for doc in documents:
+        if doc.get("participant") and doc.get("participant").get("id") not in documents_par_participant:
+            documents_par_participant[doc["participant"]["id"]] = doc
     
-    for participant in participants:
-        # Trouver le document correspondant au participant
-        document = None
-        if documents:
-            for doc in documents:
-                if doc.get("participant") and doc.get("participant").get("id") == participant.get("id"):
-                    document = doc
-                    break
+    # Envoyer les emails de convocation (envois simultanés, l'ordre des participants est conservé)
+    async def envoyer(participant):
+        document = documents_par_participant.get(participant.get("id"))
         
         # Envoyer l'email
         email_result = await send_invitation_email(
@@ -94,7 +101,7 @@ async def main(
             email_test=email_test
         )
         
-        emails_envoyes.append({
+        return {
             "participant": {
                 "id": participant.get("id"),
                 "nom": participant.get("nom"),
@@ -104,7 +111,9 @@ async def main(
             "email_sent": email_result.get("success", False),
             "document_attached": document is not None,
             "error": email_result.get("error")
-        })
+        }
+    
+    emails_envoyes = list(await asyncio.gather(*[envoyer(participant) for participant in participants]))
     
     # Mettre à jour le statut de la session si demandé
     if mettre_a_jour_statut and all(email.get("email_sent") for email in emails_envoyes):
@@ -133,13 +142,7 @@ async def get_session_details(session_id):
     """
     try:
         # Utiliser la vue qui joint les tables sessions, formations et entreprises
-        vue_sessions = await wmill.get_resource("supabase/vue_sessions_formation")
-        session = next((s for s in vue_sessions if s["id"] == session_id), None)
-        
-        if not session:
-            return None
-        
-        return session
+        return await get_async_supabase_client().executer(get_data_access().get_session_details, session_id)
     except Exception as e:
         print(f"Erreur lors de la récupération des détails de la session: {str(e)}")
         return None
@@ -149,9 +152,7 @@ async def get_participant(participant_id):
     Récupère les informations d'un participant
     """
     try:
-        participants = await wmill.get_resource("supabase/participants")
-        participant = next((p for p in participants if p["id"] == participant_id), None)
-        return participant
+        return await get_async_supabase_client().executer(get_data_access().get_participant, participant_id)
     except Exception as e:
         print(f"Erreur lors de la récupération du participant: {str(e)}")
         return None
@@ -161,9 +162,7 @@ async def get_session_participants(session_id):
     Récupère tous les participants d'une session
     """
     try:
-        participants = await wmill.get_resource("supabase/participants")
-        session_participants = [p for p in participants if p["session_formation_id"] == session_id]
-        return session_participants
+        return await get_async_supabase_client().executer(get_data_access().get_session_participants, session_id)
     except Exception as e:
         print(f"Erreur lors de la récupération des participants: {str(e)}")
         return []
@@ -216,8 +215,7 @@ async def send_invitation_email(session, participant, document=None, email_test=
             # Récupérer le document depuis Supabase
             document_id = document.get("url").split("/")[1]  # Extraire l'ID du document de l'URL
             
-            documents = await wmill.get_resource("supabase/documents")
-            doc_entry = next((d for d in documents if d["id"] == document_id), None)
+            doc_entry = await get_async_supabase_client().executer(get_data_access().get_document, document_id)
             
             if doc_entry and doc_entry.get("contenu"):
                 email_data["attachments"] = [
@@ -258,8 +256,7 @@ async def update_session_status(session_id, new_status):
     """
     try:
         # Récupérer la session actuelle
-        sessions = await wmill.get_resource("supabase/sessions_formation")
-        session = next((s for s in sessions if s["id"] == session_id), None)
+        session = await get_async_supabase_client().executer(get_data_access().get_session, session_id)
         
         if not session:
             raise ValueError(f"Session avec ID {session_id} non trouvée")
@@ -269,7 +266,9 @@ async def update_session_status(session_id, new_status):
         session["updated_at"] = datetime.now().isoformat()
         
         # Mettre à jour les métadonnées
-        metadata = json.loads(session.get("metadata", "{}"))
+        metadata = session.get("metadata") or {}
+        if isinstance(metadata, str):
+            metadata = json.loads(metadata)
         metadata["date_convocation"] = datetime.now().isoformat()
         session["metadata"] = json.dumps(metadata)
         
@@ -0,0 +1,104 @@
+"""
+Client Supabase asynchrone pour les modules Windmill (async def main)
+Mêmes méthodes que SupabaseClient, exécutées dans un pool de threads borné
+par un sémaphore : les appels de plusieurs participants se chevauchent au lieu
+d'être attendus un par un, sur le pool de connexions HTTP (keep-alive) du client partagé
+"""
+
+import asyncio
+import functools
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .supabase_client import get_supabase_client
+
+# Nombre maximum de requêtes Supabase simultanées par exécution
+CONCURRENCE_PAR_DEFAUT = 8
+
+
+class AsyncSupabaseClient:
+    """
+    Variante asyncio de SupabaseClient
+    """
+
+    def __init__(self, supabase_client=None, max_concurrence=None):
+        """
+        Args:
+            supabase_client (SupabaseClient): Client synchrone partagé (par défaut, le singleton)
+            max_concurrence (int): Nombre maximum d'appels simultanés (défaut : SUPABASE_CONCURRENCE ou 8)
+        """
+        self.sync = supabase_client or get_supabase_client()
+        self.max_concurrence = max_concurrence or int(os.getenv("SUPABASE_CONCURRENCE", CONCURRENCE_PAR_DEFAUT))
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrence, thread_name_prefix="supabase")
+        self._semaphores = {}
+
+    def _semaphore(self):
+        """
+        Sémaphore de la boucle d'événements courante (une par exécution asyncio.run)
+        """
+        boucle = asyncio.get_running_loop()
+        if boucle not in self._semaphores:
+            self._semaphores = {boucle: asyncio.Semaphore(self.max_concurrence)}
+        return self._semaphores[boucle]
+
+    async def executer(self, fonction, *args, **kwargs):
+        """
+        Exécute un appel bloquant (client, couche d'accès aux données...) sans bloquer la boucle
+
+        Args:
+            fonction (callable): Fonction à appeler
+            *args, **kwargs: Arguments de la fonction
+
+        Returns:
+            Le résultat de la fonction
+        """
+        async with self._semaphore():
+            boucle = asyncio.get_running_loop()
+            return await boucle.run_in_executor(self._executor, functools.partial(fonction, *args, **kwargs))
+
+    async def _iterer(self, iterateur):
+        """
+        Parcourt un itérateur synchrone (iter_*), chaque page étant lue dans le pool
+        """
+        fin = object()
+        while True:
+            element = await self.executer(next, iterateur, fin)
+            if element is fin:
+                return
+            yield element
+
+    def __getattr__(self, nom):
+        """
+        Expose les méthodes de SupabaseClient en version asynchrone :
+        get_*/update_*/upload_* renvoient une coroutine, iter_* un itérateur asynchrone
+        """
+        attribut = getattr(self.sync, nom)
+        if not callable(attribut):
+            return attribut
+
+        if nom.startswith("iter_"):
+            @functools.wraps(attribut)
+            def iterateur(*args, **kwargs):
+                return self._iterer(attribut(*args, **kwargs))
+            return iterateur
+
+        @functools.wraps(attribut)
+        async def methode(*args, **kwargs):
+            return await self.executer(attribut, *args, **kwargs)
+        return methode
+
+
+# Singleton pour réutiliser le même pool de threads et de connexions
+_async_supabase_client = None
+
+def get_async_supabase_client():
+    """
+    Récupère une instance du client Supabase asynchrone (singleton)
+
+    Returns:
+        AsyncSupabaseClient: Instance partagée
+    """
+    global _async_supabase_client
+    if _async_supabase_client is None:
+        _async_supabase_client = AsyncSupabaseClient()
+    return _async_supabase_client
@@ -0,0 +1,165 @@
+"""
+Cache de lecture pour le client Supabase
+Durée de vie par table, éviction LRU bornée en taille, et regroupement des
+requêtes identiques en cours (un seul appel PostgREST pour plusieurs threads)
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+
+# Durée de vie par défaut des entrées, en secondes (0 : table non mise en cache)
+TTL_PAR_TABLE = {
+    "formations_catalogue": 3600,
+    "organisme_formation": 3600,
+    "entreprises": 300,
+    "sessions_formation": 30,
+    "vue_sessions_formation": 30,
+    "participants": 30,
+}
+
+
+class CacheLecture:
+    """
+    Cache LRU avec durée de vie par table, partagé par les threads d'une exécution
+    """
+
+    def __init__(self, ttl_par_table=None, taille_max=1000):
+        """
+        Args:
+            ttl_par_table (dict): Durée de vie en secondes par table (complète TTL_PAR_TABLE)
+            taille_max (int): Nombre maximum d'entrées conservées
+        """
+        self.ttl_par_table = {**TTL_PAR_TABLE, **(ttl_par_table or {})}
+        self.taille_max = taille_max
+        self._entrees = OrderedDict()
+        self._en_cours = {}
+        self._verrou = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.regroupees = 0
+
+    def lire(self, table, cle, charger):
+        """
+        Retourne la valeur en cache ou l'obtient via charger()
+
+        Args:
+            table (str): Table interrogée (détermine la durée de vie)
+            cle (tuple): Clé de la requête (méthode et arguments)
+            charger (callable): Fonction exécutant la requête
+
+        Returns:
+            La valeur renvoyée par charger()
+        """
+        ttl = self.ttl_par_table.get(table, 0)
+        if ttl <= 0:
+            return charger()
+
+        cle = (table,) + tuple(cle)
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None and entree[0] > time.monotonic():
+                self._entrees.move_to_end(cle)
+                self.hits += 1
+                return entree[1]
+
+            # Même requête déjà en cours dans un autre thread : attendre son résultat
+            futur = self._en_cours.get(cle)
+            if futur is not None:
+                self.regroupees += 1
+                proprietaire = False
+            else:
+                futur = Future()
+                self._en_cours[cle] = futur
+                self.misses += 1
+                proprietaire = True
+
+        if not proprietaire:
+            return futur.result()
+
+        try:
+            valeur = charger()
+        except Exception as e:
+            with self._verrou:
+                self._en_cours.pop(cle, None)
+            futur.set_exception(e)
+            raise
+
+        with self._verrou:
+            # Une invalidation pendant le chargement rend la valeur obsolète : ne pas la conserver
+            if self._en_cours.pop(cle, None) is futur:
+                self._conserver(cle, ttl, valeur)
+        futur.set_result(valeur)
+        return valeur
+
+    def _conserver(self, cle, ttl, valeur):
+        """Ajoute une entrée (verrou déjà pris) et évince les plus anciennes"""
+        self._entrees[cle] = (time.monotonic() + ttl, valeur)
+        self._entrees.move_to_end(cle)
+        while len(self._entrees) > self.taille_max:
+            self._entrees.popitem(last=False)
+
+    def consulter(self, table, cle):
+        """
+        Cherche une entrée sans la charger (lectures groupées : une requête pour les clés absentes)
+
+        Args:
+            table (str): Table interrogée
+            cle (tuple): Clé de la requête
+
+        Returns:
+            tuple: (True, valeur) si l'entrée est en cache et valide, sinon (False, None)
+        """
+        if self.ttl_par_table.get(table, 0) <= 0:
+            return False, None
+        cle = (table,) + tuple(cle)
+        with self._verrou:
+            entree = self._entrees.get(cle)
+            if entree is not None and entree[0] > time.monotonic():
+                self._entrees.move_to_end(cle)
+                self.hits += 1
+                return True, entree[1]
+            self.misses += 1
+        return False, None
+
+    def stocker(self, table, cle, valeur):
+        """
+        Ajoute une valeur chargée hors de lire() (résultat d'une lecture groupée)
+
+        Args:
+            table (str): Table interrogée (détermine la durée de vie)
+            cle (tuple): Clé de la requête
+            valeur: Valeur à conserver
+        """
+        ttl = self.ttl_par_table.get(table, 0)
+        if ttl <= 0:
+            return
+        with self._verrou:
+            self._conserver((table,) + tuple(cle), ttl, valeur)
+
+    def invalider(self, *tables):
+        """
+        Supprime les entrées des tables indiquées (toutes les entrées si aucune table)
+        """
+        with self._verrou:
+            if not tables:
+                self._entrees.clear()
+                self._en_cours.clear()
+                return
+            for cle in [c for c in self._entrees if c[0] in tables]:
+                del self._entrees[cle]
+            for cle in [c for c in self._en_cours if c[0] in tables]:
+                del self._en_cours[cle]
+
+    def statistiques(self):
+        """
+        Retourne les compteurs du cache
+        """
+        with self._verrou:
+            return {
+                "entrees": len(self._entrees),
+                "hits": self.hits,
+                "misses": self.misses,
+                "regroupees": self.regroupees,
+            }
@@ -0,0 +1,137 @@
+"""
+Couche d'accès aux données pour les modules Windmill
+Requêtes filtrées par id ou clé étrangère, et index en mémoire construits
+une seule fois par exécution quand une table entière est nécessaire
+"""
+
+from .supabase_client import get_supabase_client
+
+
+class IndexTable:
+    """
+    Lignes d'une table indexées par id et par session_formation_id
+    """
+
+    def __init__(self, rows):
+        """
+        Construit les index en un seul parcours
+
+        Args:
+            rows (list): Lignes de la table
+        """
+        self.rows = rows
+        self.par_id = {}
+        self.par_session = {}
+
+        for row in rows:
+            if "id" in row:
+                self.par_id[row["id"]] = row
+            if row.get("session_formation_id") is not None:
+                self.par_session.setdefault(row["session_formation_id"], []).append(row)
+
+    def get(self, row_id):
+        """
+        Retourne la ligne d'id donné ou None
+        """
+        return self.par_id.get(row_id)
+
+    def get_by_session(self, session_id):
+        """
+        Retourne les lignes rattachées à une session
+        """
+        return self.par_session.get(session_id, [])
+
+    def __len__(self):
+        return len(self.rows)
+
+
+class DataAccess:
+    """
+    Accès aux données partagé par les modules d'une même exécution
+    """
+
+    def __init__(self, supabase_client=None):
+        """
+        Args:
+            supabase_client (SupabaseClient): Client à utiliser (par défaut, le singleton)
+        """
+        self.supabase = supabase_client or get_supabase_client()
+        self._index = {}
+
+    # Requêtes filtrées
+
+    def get_session_details(self, session_id):
+        """
+        Récupère une session avec les informations liées (vue_sessions_formation)
+        """
+        return self.supabase.get_session_details_by_id(session_id)
+
+    def get_session(self, session_id):
+        """
+        Récupère une ligne de sessions_formation
+        """
+        return self.supabase.get_session_by_id(session_id)
+
+    def get_participant(self, participant_id):
+        """
+        Récupère un participant par son ID
+        """
+        if "participants" in self._index:
+            return self._index["participants"].get(participant_id)
+        return self.supabase.get_participant_by_id(participant_id)
+
+    def get_session_participants(self, session_id):
+        """
+        Récupère les participants d'une session
+        """
+        if "participants" in self._index:
+            return self._index["participants"].get_by_session(session_id)
+        return self.supabase.get_participants_by_session(session_id)
+
+    def get_document(self, document_id):
+        """
+        Récupère un document par son ID
+        """
+        return self.supabase.get_document_by_id(document_id)
+
+    # Tables complètes
+
+    def index_table(self, table_name):
+        """
+        Charge une table entière une seule fois (par pages : un select unique serait
+        tronqué par la limite max-rows de PostgREST) et l'indexe par id et session_formation_id
+
+        Args:
+            table_name (str): Nom de la table
+
+        Returns:
+            IndexTable: Lignes indexées
+        """
+        if table_name not in self._index:
+            self._index[table_name] = IndexTable(list(self.supabase.iter_table(table_name)))
+        return self._index[table_name]
+
+    def invalider(self, table_name=None):
+        """
+        Supprime l'index d'une table (ou tous les index) après une écriture
+        """
+        if table_name is None:
+            self._index.clear()
+        else:
+            self._index.pop(table_name, None)
+
+
+# Une instance par exécution : chaque exécution Windmill tourne dans son propre processus
+_data_access = None
+
+def get_data_access():
+    """
+    Récupère la couche d'accès aux données de l'exécution (singleton)
+
+    Returns:
+        DataAccess: Instance partagée
+    """
+    global _data_access
+    if _data_access is None:
+        _data_access = DataAccess()
+    return _data_access
@@ -0,0 +1,331 @@
+"""
+Publication des documents générés dans Supabase
+Uploads simultanés (pool borné), URLs signées en un seul appel, et
+métadonnées enregistrées en une seule insertion dans la table documents
+
+Stockage par contenu : sans storage_path explicite, un document est rangé sous
+son empreinte SHA-256 (sha256/ab/abcd....pdf). Des documents identiques sont
+stockés une seule fois et référencés par plusieurs lignes de la table documents,
+et l'upload est évité quand l'empreinte est déjà connue
+
+Régénération incrémentale : un document déjà publié pour la même session et le
+même participant avec la même empreinte d'entrées (metadata.empreinte_entrees)
+n'est ni uploadé ni inséré à nouveau, sa ligne existante est renvoyée
+"""
+
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+
+from .resilience import Resilience
+
+# Durée de validité des URLs signées (7 jours)
+EXPIRATION_URL = 60 * 60 * 24 * 7
+
+# Préfixe des fichiers stockés par contenu
+PREFIXE_CONTENU = "sha256"
+
+
+def empreinte(contenu):
+    """
+    Empreinte SHA-256 d'un contenu
+
+    Args:
+        contenu (bytes): Contenu du document
+
+    Returns:
+        str: Empreinte hexadécimale
+    """
+    return hashlib.sha256(contenu).hexdigest()
+
+
+def chemin_contenu(sha256, extension=".pdf"):
+    """
+    Chemin de stockage d'un contenu (deux caractères de répertoire pour
+    éviter des milliers de fichiers dans un même dossier)
+
+    Args:
+        sha256 (str): Empreinte du contenu
+        extension (str): Extension du fichier
+
+    Returns:
+        str: Chemin dans le bucket
+    """
+    return f"{PREFIXE_CONTENU}/{sha256[:2]}/{sha256}{extension}"
+
+
+class DocumentPublisher:
+    """
+    Publie un lot de documents : Storage, URLs signées, table documents
+    """
+
+    def __init__(self, client, bucket_name="documents", max_workers=4,
+                 resilience=None, expiration_url=EXPIRATION_URL):
+        """
+        Args:
+            client: Client supabase-py (create_client), ou SupabaseClient.client
+            bucket_name (str): Bucket de stockage
+            max_workers (int): Nombre maximum d'uploads simultanés
+            resilience (Resilience): Nouvelles tentatives et disjoncteur (par défaut, une instance dédiée)
+            expiration_url (int): Durée de validité des URLs signées en secondes (None : pas d'URL)
+        """
+        self.client = client
+        self.bucket_name = bucket_name
+        self.max_workers = max_workers
+        self.resilience = resilience or Resilience()
+        self.expiration_url = expiration_url
+
+    def _upload(self, document):
+        """
+        Upload un document (upsert : un nouvel essai remplace le fichier)
+
+        Returns:
+            str: Message d'erreur, ou None si l'upload a réussi
+        """
+        try:
+            self.resilience.executer("storage", lambda: self.client.storage.from_(self.bucket_name).upload(
+                document["storage_path"],
+                document["contenu"],
+                {
+                    'content-type': document.get("content_type", 'application/pdf'),
+                    'upsert': 'true'
+                }
+            ))
+            return None
+        except Exception as e:
+            print(f"Erreur lors de l'upload de {document['storage_path']}: {str(e)}")
+            return str(e)
+
+    def _chemins_existants(self, chemins):
+        """
+        Chemins déjà référencés par la table documents (fichiers déjà présents dans Storage)
+
+        Returns:
+            set: Chemins existants (vide en cas d'erreur : les fichiers seront uploadés)
+        """
+        if not chemins:
+            return set()
+        try:
+            reponse = self.resilience.executer(
+                "documents", self.client.table("documents").select("storage_path").in_("storage_path", list(chemins)).execute
+            )
+            return {ligne["storage_path"] for ligne in reponse.data or []}
+        except Exception as e:
+            print(f"Erreur lors de la recherche des documents déjà stockés: {str(e)}")
+            return set()
+
+    def _documents_publies(self, documents):
+        """
+        Lignes de la table documents déjà publiées avec la même empreinte d'entrées,
+        pour la même session, le même participant et le même type MIME (une requête)
+
+        Returns:
+            dict: Ligne existante par clé (empreinte, session, participant, type MIME)
+                (vide en cas d'erreur : les documents seront publiés)
+        """
+        empreintes = list(dict.fromkeys(d["empreinte_entrees"] for d in documents if d.get("empreinte_entrees")))
+        if not empreintes:
+            return {}
+        try:
+            reponse = self.resilience.executer(
+                "documents", self.client.table("documents").select("*").in_("metadata->>empreinte_entrees", empreintes).execute
+            )
+        except Exception as e:
+            print(f"Erreur lors de la recherche des documents déjà publiés: {str(e)}")
+            return {}
+        publies = {}
+        for ligne in reponse.data or []:
+            cle = ((ligne.get("metadata") or {}).get("empreinte_entrees"), ligne.get("session_formation_id"),
+                   ligne.get("participant_id"), ligne.get("mime_type"))
+            publies.setdefault(cle, ligne)
+        return publies
+
+    def contenu_publie(self, empreinte_entrees, session_formation_id=None, participant_id=None,
+                       content_type='application/pdf'):
+        """
+        Document déjà publié avec la même empreinte d'entrées : le rendu peut être évité
+
+        Args:
+            empreinte_entrees (str): Empreinte des entrées du rendu
+            session_formation_id (str): Session du document
+            participant_id (str): Participant du document (None pour un document de session)
+            content_type (str): Type MIME du document
+
+        Returns:
+            tuple: (ligne de la table documents, contenu), ou None si le document doit être rendu
+        """
+        document = {
+            "empreinte_entrees": empreinte_entrees,
+            "content_type": content_type,
+            "metadata": {"session_formation_id": session_formation_id, "participant_id": participant_id}
+        }
+        ligne = self._documents_publies([document]).get(self._cle_publication(document))
+        if ligne is None:
+            return None
+        try:
+            contenu = self.resilience.executer(
+                "storage", lambda: self.client.storage.from_(self.bucket_name).download(ligne["storage_path"])
+            )
+        except Exception as e:
+            print(f"Document publié illisible ({ligne['storage_path']}), nouveau rendu: {str(e)}")
+            return None
+        return ligne, contenu
+
+    @staticmethod
+    def _cle_publication(document):
+        """Clé de recherche d'un document dans _documents_publies"""
+        metadata = document.get("metadata") or {}
+        return (document.get("empreinte_entrees"), metadata.get("session_formation_id"),
+                metadata.get("participant_id"), document.get("content_type", 'application/pdf'))
+
+    def _signer(self, chemins):
+        """
+        Crée les URLs signées de plusieurs fichiers en un seul appel
+
+        Returns:
+            dict: URL signée par chemin (absente si la signature a échoué)
+        """
+        if not chemins or not self.expiration_url:
+            return {}
+        try:
+            reponse = self.resilience.executer("storage", lambda: self.client.storage.from_(self.bucket_name).create_signed_urls(
+                chemins,
+                self.expiration_url
+            ))
+        except Exception as e:
+            print(f"Erreur lors de la création des URLs signées: {str(e)}")
+            return {}
+
+        urls = {}
+        for element in reponse or []:
+            url = element.get("signedURL") or element.get("signedUrl")
+            if url and not element.get("error"):
+                urls[element.get("path")] = url
+        return urls
+
+    def _enregistrer(self, lignes):
+        """
+        Insère les métadonnées de tous les documents en une requête
+
+        Returns:
+            tuple: (lignes insérées, message d'erreur ou None)
+        """
+        if not lignes:
+            return [], None
+        try:
+            # Insertion non idempotente : pas de nouvel essai
+            reponse = self.resilience.executer(
+                "documents", self.client.table("documents").insert(lignes).execute, retry=False
+            )
+            return (reponse.data if hasattr(reponse, 'data') else []), None
+        except Exception as e:
+            print(f"Erreur lors de l'enregistrement des métadonnées des documents: {str(e)}")
+            return [], str(e)
+
+    def publier(self, documents):
+        """
+        Publie un lot de documents
+
+        Args:
+            documents (list): Dictionnaires avec contenu (bytes), content_type (optionnel),
+                metadata (ligne de la table documents, sans storage_path ni taille_fichier),
+                storage_path (optionnel : par défaut, chemin dérivé de l'empreinte) et
+                empreinte_entrees (optionnel : DocumentRendu.metadata['empreinte_entrees'])
+
+        Returns:
+            list: Un résultat par document, dans l'ordre : storage_path, sha256, success,
+                uploaded (fichier présent dans Storage), deduplique (upload évité),
+                inchange (déjà publié avec la même empreinte d'entrées : ni upload ni
+                nouvelle ligne), url, document (ligne insérée ou existante) et error
+        """
+        documents = [dict(document) for document in documents]
+        if not documents:
+            return []
+
+        # 0. Documents déjà publiés avec la même empreinte d'entrées : ligne existante réutilisée
+        publies_avant = self._documents_publies(documents)
+        for document in documents:
+            ligne = publies_avant.get(self._cle_publication(document)) if document.get("empreinte_entrees") else None
+            if ligne is not None:
+                document["existant"] = ligne
+                document["storage_path"] = ligne["storage_path"]
+
+        # 1. Empreintes et chemins de stockage par contenu
+        par_contenu = set()
+        for document in documents:
+            document["sha256"] = empreinte(document["contenu"])
+            if not document.get("storage_path"):
+                nom_fichier = (document.get("metadata") or {}).get("nom_fichier") or ""
+                extension = os.path.splitext(nom_fichier)[1] or ".pdf"
+                document["storage_path"] = chemin_contenu(document["sha256"], extension)
+                par_contenu.add(document["storage_path"])
+
+        # 2. Contenus déjà stockés (une requête), puis un seul upload par chemin
+        existants = self._chemins_existants(par_contenu)
+        a_uploader = {}
+        for document in documents:
+            chemin = document["storage_path"]
+            if document.get("existant") is None and chemin not in existants and chemin not in a_uploader:
+                a_uploader[chemin] = document
+
+        erreurs = {}
+        if a_uploader:
+            with ThreadPoolExecutor(max_workers=min(self.max_workers, len(a_uploader))) as executor:
+                erreurs = dict(zip(a_uploader, executor.map(self._upload, a_uploader.values())))
+
+        publies = [document for document in documents if erreurs.get(document["storage_path"]) is None]
+
+        # 3. URLs signées en un appel
+        urls = self._signer(list(dict.fromkeys(document["storage_path"] for document in publies)))
+
+        # 4. Métadonnées en une insertion (une ligne par document, même si le fichier est partagé)
+        lignes = []
+        for document in publies:
+            if document.get("existant") is not None:
+                continue
+            ligne = dict(document.get("metadata") or {})
+            ligne.setdefault("storage_path", document["storage_path"])
+            ligne.setdefault("taille_fichier", len(document["contenu"]))
+            ligne.setdefault("mime_type", document.get("content_type", 'application/pdf'))
+            ligne["metadata"] = {**(ligne.get("metadata") or {}), "sha256": document["sha256"]}
+            if document.get("empreinte_entrees"):
+                # Empreinte des entrées du rendu (variables et template) : régénération incrémentale
+                ligne["metadata"]["empreinte_entrees"] = document["empreinte_entrees"]
+            lignes.append(ligne)
+        inseres, erreur_metadata = self._enregistrer(lignes)
+        # Les lignes insérées sont renvoyées dans l'ordre d'insertion
+        inseres = iter(inseres)
+
+        resultats = []
+        for document in documents:
+            chemin = document["storage_path"]
+            erreur = erreurs.get(chemin)
+            resultat = {
+                "storage_path": chemin,
+                "sha256": document["sha256"],
+                "success": False,
+                "uploaded": False,
+                "deduplique": a_uploader.get(chemin) is not document,
+                "inchange": document.get("existant") is not None,
+                "url": None,
+                "document": None,
+                "error": erreur
+            }
+            if erreur is None and document.get("existant") is not None:
+                resultat.update({
+                    "success": True,
+                    "uploaded": True,
+                    "url": urls.get(chemin),
+                    "document": document["existant"]
+                })
+            elif erreur is None:
+                resultat.update({
+                    "success": erreur_metadata is None,
+                    "uploaded": True,
+                    "url": urls.get(chemin),
+                    "document": next(inseres, None),
+                    # Le fichier est dans Storage même si les métadonnées n'ont pas été enregistrées
+                    "error": f"Métadonnées non enregistrées: {erreur_metadata}" if erreur_metadata else None
+                })
+            resultats.append(resultat)
+        return resultats
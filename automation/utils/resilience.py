@@ -0,0 +1,266 @@
+"""
+Résilience des appels Supabase
+Nouvelles tentatives avec attente exponentielle (jitter), respect de Retry-After,
+disjoncteur pour échouer vite pendant une panne, et compteurs par opération
+"""
+
+import random
+import threading
+import time
+
+# Codes HTTP pour lesquels une nouvelle tentative a un sens
+STATUTS_TEMPORAIRES = {408, 425, 429, 500, 502, 503, 504}
+
+
+class CircuitOuvert(Exception):
+    """
+    Levée sans appel réseau quand le disjoncteur est ouvert
+    """
+
+
+def statut_http(erreur):
+    """
+    Code HTTP d'une erreur (httpx, postgrest, storage) ou None
+    """
+    reponse = getattr(erreur, "response", None)
+    candidats = (
+        getattr(reponse, "status_code", None),
+        getattr(erreur, "status_code", None),
+        # StorageApiError de storage3 : le code HTTP est dans .status (entier ou texte)
+        getattr(erreur, "status", None),
+        # APIError de postgrest : le code HTTP est parfois dans .code
+        getattr(erreur, "code", None),
+    )
+    for statut in candidats:
+        if isinstance(statut, int) or (isinstance(statut, str) and statut.isdigit()):
+            return int(statut)
+    return None
+
+
+def est_temporaire(erreur):
+    """
+    Indique si l'erreur justifie une nouvelle tentative (réseau, délai, 429, 5xx)
+    """
+    if isinstance(erreur, (ConnectionError, TimeoutError)):
+        return True
+    # Erreurs de transport httpx (connexion, délai) sans dépendre du module
+    noms = {classe.__name__ for classe in type(erreur).__mro__}
+    if noms & {"TransportError", "TimeoutException", "NetworkError", "RemoteProtocolError"}:
+        return True
+    return statut_http(erreur) in STATUTS_TEMPORAIRES
+
+
+def delai_retry_after(erreur):
+    """
+    Délai demandé par le serveur (en-tête Retry-After, en secondes) ou None
+    """
+    reponse = getattr(erreur, "response", None)
+    entetes = getattr(reponse, "headers", None)
+    if not entetes:
+        return None
+    valeur = entetes.get("Retry-After") or entetes.get("retry-after")
+    try:
+        return max(0.0, float(valeur))
+    except (TypeError, ValueError):
+        return None
+
+
+class Disjoncteur:
+    """
+    Disjoncteur : ouvert après seuil_echecs échecs consécutifs, un appel d'essai
+    est autorisé après delai_reouverture secondes (un seul à la fois : les autres
+    appels sont refusés jusqu'à son résultat)
+    """
+
+    FERME = "ferme"
+    OUVERT = "ouvert"
+    SEMI_OUVERT = "semi_ouvert"
+
+    def __init__(self, seuil_echecs=5, delai_reouverture=30):
+        """
+        Args:
+            seuil_echecs (int): Nombre d'échecs consécutifs avant ouverture
+            delai_reouverture (float): Secondes avant d'autoriser un appel d'essai
+        """
+        self.seuil_echecs = seuil_echecs
+        self.delai_reouverture = delai_reouverture
+        self.etat = self.FERME
+        self.echecs = 0
+        self.ouvert_depuis = None
+        # Durée de l'ouverture en cours (plus longue si le serveur l'a demandé)
+        self.delai_ouverture = delai_reouverture
+        # Début de l'appel d'essai en cours (semi-ouvert), None sans essai en cours
+        self.essai_depuis = None
+        self._verrou = threading.Lock()
+
+    def autoriser(self):
+        """
+        Indique si un appel peut partir (passe en semi-ouvert à la fin du délai)
+
+        En semi-ouvert, seul l'appel d'essai part : les appels concurrents sont refusés
+        jusqu'à succes() ou echec(). Un essai sans résultat après delai_reouverture
+        secondes est considéré perdu et un nouvel essai est autorisé.
+        """
+        with self._verrou:
+            maintenant = time.monotonic()
+            if self.etat == self.OUVERT:
+                if maintenant - self.ouvert_depuis < self.delai_ouverture:
+                    return False
+                self.etat = self.SEMI_OUVERT
+            elif self.etat == self.SEMI_OUVERT:
+                if self.essai_depuis is not None and maintenant - self.essai_depuis < self.delai_reouverture:
+                    return False
+            else:
+                return True
+            self.essai_depuis = maintenant
+            return True
+
+    def succes(self):
+        with self._verrou:
+            self.etat = self.FERME
+            self.echecs = 0
+            self.essai_depuis = None
+
+    def echec(self):
+        """
+        Enregistre un échec
+
+        Returns:
+            bool: True si cet échec vient d'ouvrir le disjoncteur
+        """
+        with self._verrou:
+            self.echecs += 1
+            self.essai_depuis = None
+            if self.etat == self.SEMI_OUVERT or (self.etat == self.FERME and self.echecs >= self.seuil_echecs):
+                self.etat = self.OUVERT
+                self.ouvert_depuis = time.monotonic()
+                self.delai_ouverture = self.delai_reouverture
+                return True
+            return False
+
+    def ouvrir(self, duree):
+        """
+        Ouvre le disjoncteur pour au moins duree secondes (Retry-After du serveur)
+
+        Returns:
+            bool: True si le disjoncteur vient d'être ouvert
+        """
+        with self._verrou:
+            maintenant = time.monotonic()
+            deja_ouvert = self.etat == self.OUVERT
+            if not deja_ouvert or maintenant + duree > self.ouvert_depuis + self.delai_ouverture:
+                self.ouvert_depuis = maintenant
+                self.delai_ouverture = duree
+            self.etat = self.OUVERT
+            self.essai_depuis = None
+            return not deja_ouvert
+
+
+class Resilience:
+    """
+    Exécute les appels avec nouvelles tentatives et disjoncteur, et tient les compteurs
+    """
+
+    def __init__(self, tentatives=3, attente_base=0.5, attente_max=8.0,
+                 seuil_echecs=5, delai_reouverture=30):
+        """
+        Args:
+            tentatives (int): Nombre maximum d'essais par appel idempotent
+            attente_base (float): Attente de base en secondes (doublée à chaque essai)
+            attente_max (float): Attente maximale entre deux essais (un Retry-After plus long
+                ouvre le disjoncteur pour la durée demandée au lieu de réessayer plus tôt)
+            seuil_echecs (int): Échecs consécutifs avant ouverture du disjoncteur
+            delai_reouverture (float): Secondes avant un appel d'essai
+        """
+        self.tentatives = tentatives
+        self.attente_base = attente_base
+        self.attente_max = attente_max
+        self.disjoncteur = Disjoncteur(seuil_echecs, delai_reouverture)
+        self.compteurs = {}
+        self._verrou = threading.Lock()
+        self._attendre = time.sleep
+
+    def _compter(self, operation, **valeurs):
+        with self._verrou:
+            compteur = self.compteurs.setdefault(operation, {
+                "appels": 0, "succes": 0, "echecs": 0, "retries": 0,
+                "rejets": 0, "ouvertures": 0, "latence_totale": 0.0, "latence_max": 0.0
+            })
+            for cle, valeur in valeurs.items():
+                if cle == "latence":
+                    compteur["latence_totale"] += valeur
+                    compteur["latence_max"] = max(compteur["latence_max"], valeur)
+                else:
+                    compteur[cle] += valeur
+
+    def attente(self, essai, erreur=None):
+        """
+        Attente avant l'essai suivant : Retry-After s'il est fourni (jamais
+        raccourci), sinon attente exponentielle avec jitter complet
+        """
+        retry_after = delai_retry_after(erreur) if erreur is not None else None
+        if retry_after is not None:
+            return retry_after
+        return random.uniform(0, min(self.attente_max, self.attente_base * (2 ** essai)))
+
+    def executer(self, operation, fonction, retry=True):
+        """
+        Exécute un appel
+
+        Args:
+            operation (str): Nom de l'opération pour les compteurs (table, storage...)
+            fonction (callable): Appel à exécuter
+            retry (bool): Autoriser les nouvelles tentatives (appels idempotents uniquement)
+
+        Returns:
+            Le résultat de fonction()
+
+        Raises:
+            CircuitOuvert: Si le disjoncteur est ouvert
+        """
+        essais = self.tentatives if retry else 1
+
+        for essai in range(essais):
+            if not self.disjoncteur.autoriser():
+                self._compter(operation, rejets=1)
+                raise CircuitOuvert(f"Supabase indisponible, appel {operation} refusé (disjoncteur ouvert)")
+
+            debut = time.monotonic()
+            try:
+                resultat = fonction()
+            except Exception as e:
+                self._compter(operation, appels=1, latence=time.monotonic() - debut)
+                temporaire = est_temporaire(e)
+                if temporaire and self.disjoncteur.echec():
+                    self._compter(operation, ouvertures=1)
+                if not temporaire:
+                    # Erreur applicative (4xx) : Supabase répond, le disjoncteur n'est pas concerné
+                    self.disjoncteur.succes()
+                attente = self.attente(essai, e) if temporaire else None
+                if attente is not None and attente > self.attente_max:
+                    # Retry-After plus long que l'attente autorisée : pas de nouvel essai anticipé,
+                    # les appels suivants sont refusés (CircuitOuvert) jusqu'à la fin du délai
+                    if self.disjoncteur.ouvrir(attente):
+                        self._compter(operation, ouvertures=1)
+                    self._compter(operation, echecs=1)
+                    raise
+                if not temporaire or essai == essais - 1:
+                    self._compter(operation, echecs=1)
+                    raise
+                self._compter(operation, retries=1)
+                self._attendre(attente)
+                continue
+
+            self._compter(operation, appels=1, succes=1, latence=time.monotonic() - debut)
+            self.disjoncteur.succes()
+            return resultat
+
+    def statistiques(self):
+        """
+        Retourne l'état du disjoncteur et les compteurs par opération
+        """
+        with self._verrou:
+            return {
+                "disjoncteur": self.disjoncteur.etat,
+                "operations": {operation: dict(compteur) for operation, compteur in self.compteurs.items()}
+            }
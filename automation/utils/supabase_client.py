@@ -3,6 +3,75 @@ import json
 from dotenv import load_dotenv
 from supabase import create_client, Client
 
+from .cache import CacheLecture
+from .resilience import Resilience
+
+# Nombre maximum de valeurs par filtre in.(...) (longueur d'URL PostgREST)
+TAILLE_LOT_IN = 100
+
+# Nombre de lignes par page pour les parcours complets (sous la limite max-rows de PostgREST)
+TAILLE_PAGE = 500
+
+# Projections nommées : colonnes à lire par table (les tables absentes sont lues en entier).
+# Les vues de session contiennent de longs textes (programme, objectifs...) inutiles hors rendu.
+# Les colonnes du rendu des documents sont définies par services/sessionContext.py.
+PROJECTIONS = {
+    # Planification (cron) : identifiants, statut, dates et champs repris dans les emails
+    "scheduling": {
+        "sessions_formation": "id,statut,date_debut,date_fin,lieu,nombre_participants,entreprise_id,formation_catalogue_id",
+        "vue_sessions_complete": "id,statut,date_debut,date_fin,entreprise_id,formateur_id",
+        "vue_sessions_formation": "id,statut,date_debut,date_fin",
+        "participants": "id,session_formation_id,email",
+        "documents": "id,type,session_formation_id,participant_id",
+    },
+    # Listes et tableaux de bord
+    "listing": {
+        "sessions_formation": "id,statut,date_debut,date_fin,lieu,nombre_participants,prix_total_ht,entreprise_id,formation_catalogue_id",
+        "vue_sessions_complete": "id,statut,date_debut,date_fin,lieu,nombre_participants,prix_total_ht,entreprise_id,entreprise_nom,formation_titre",
+        "formations_catalogue": "id,titre,duree,prix_ht",
+        "entreprises": "id,nom,email_contact,telephone",
+        "participants": "id,session_formation_id,nom,prenom,email",
+        "documents": "id,type,nom_fichier,storage_path,session_formation_id,participant_id,created_at",
+    },
+}
+
+
+def colonnes(table_name, columns=None):
+    """
+    Construit la liste de colonnes d'un select PostgREST
+    
+    Args:
+        table_name (str): Table interrogée
+        columns (str|list): None (toutes), nom de projection, liste ou chaîne de colonnes
+        
+    Returns:
+        str: Colonnes séparées par des virgules ("*" pour toutes)
+    """
+    if not columns:
+        return "*"
+    if isinstance(columns, str) and columns in PROJECTIONS:
+        return PROJECTIONS[columns].get(table_name, "*")
+    if isinstance(columns, (list, tuple)):
+        return ",".join(columns)
+    return columns
+
+
+def avec_colonnes(projection, *requises):
+    """
+    Ajoute à une projection les colonnes nécessaires à la pagination
+    
+    Args:
+        projection (str): Colonnes séparées par des virgules ("*" pour toutes)
+        requises (str): Colonnes à inclure
+        
+    Returns:
+        str: Projection complétée
+    """
+    if projection == "*":
+        return projection
+    presentes = [c.strip() for c in projection.split(",")]
+    return ",".join(presentes + [c for c in requises if c not in presentes])
+
 # Charger les variables d'environnement
 load_dotenv()
 
@@ -11,9 +80,12 @@ class SupabaseClient:
     Client pour interagir avec la base de données Supabase
     """
     
-    def __init__(self):
+    def __init__(self, cache=None):
         """
         Initialise le client Supabase avec les informations d'authentification
+        
+        Args:
+            cache (bool|CacheLecture): Active le cache de lecture (par défaut : variable SUPABASE_CACHE)
         """
         supabase_url = os.getenv("SUPABASE_URL")
         supabase_key = os.getenv("SUPABASE_KEY")
@@ -22,20 +94,119 @@ class SupabaseClient:
             raise ValueError("Les variables d'environnement SUPABASE_URL et SUPABASE_KEY doivent être définies")
         
         self.client = create_client(supabase_url, supabase_key)
+        
+        # Nouvelles tentatives, disjoncteur et compteurs partagés par tous les appels
+        self.resilience = Resilience(
+            tentatives=int(os.getenv("SUPABASE_RETRY_TENTATIVES", "3")),
+            seuil_echecs=int(os.getenv("SUPABASE_DISJONCTEUR_SEUIL", "5"))
+        )
+        
+        if cache is None:
+            cache = os.getenv("SUPABASE_CACHE", "").lower() in ("1", "true", "oui")
+        self.cache = None
+        if isinstance(cache, CacheLecture):
+            self.cache = cache
+        elif cache:
+            self.activer_cache()
+    
+    # Cache de lecture
+    
+    def activer_cache(self, ttl_par_table=None, taille_max=1000):
+        """
+        Active le cache de lecture (catalogue, organisme, entreprises, sessions)
+        
+        Args:
+            ttl_par_table (dict): Durée de vie en secondes par table (voir cache.TTL_PAR_TABLE)
+            taille_max (int): Nombre maximum d'entrées conservées
+            
+        Returns:
+            CacheLecture: Cache utilisé par le client
+        """
+        self.cache = CacheLecture(ttl_par_table, taille_max)
+        return self.cache
+    
+    def invalider_cache(self, *tables):
+        """
+        Supprime les entrées en cache des tables indiquées (tout le cache si aucune table)
+        """
+        if self.cache is not None:
+            self.cache.invalider(*tables)
+    
+    def _executer(self, operation, requete, retry=True):
+        """
+        Exécute une requête PostgREST via la couche de résilience
+        
+        Args:
+            operation (str): Nom de l'opération (table) pour les compteurs
+            requete: Requête construite (select, update...)
+            retry (bool): Nouvelles tentatives autorisées (requêtes idempotentes)
+        """
+        return self.resilience.executer(operation, requete.execute, retry=retry)
+    
+    def statistiques(self):
+        """
+        Retourne les compteurs de résilience (et du cache s'il est activé)
+        
+        Returns:
+            dict: Disjoncteur, compteurs par table, cache
+        """
+        stats = self.resilience.statistiques()
+        if self.cache is not None:
+            stats["cache"] = self.cache.statistiques()
+        return stats
+    
+    def _lire(self, table, cle, charger):
+        """
+        Exécute une lecture en passant par le cache s'il est activé
+        """
+        if self.cache is None:
+            return charger()
+        return self.cache.lire(table, cle, charger)
+    
+    def _lire_par_ids(self, table_name, ids, columns=None):
+        """
+        Lecture groupée par ID en passant par le cache s'il est activé : les IDs
+        en cache (mêmes entrées que get_..._by_id) sont servis sans requête, les
+        autres sont lus par lots puis ajoutés au cache
+        
+        Returns:
+            dict: Lignes par ID (les IDs introuvables sont absents)
+        """
+        if self.cache is None:
+            return {row["id"]: row for row in self.get_rows_by_column(table_name, "id", ids, columns=columns)}
+        
+        projection = colonnes(table_name, columns)
+        lignes, manquants = {}, []
+        for id_ in dict.fromkeys(i for i in ids if i is not None):
+            trouve, ligne = self.cache.consulter(table_name, ("id", id_, projection))
+            if not trouve:
+                manquants.append(id_)
+            elif ligne is not None:
+                lignes[id_] = ligne
+        
+        if manquants:
+            lues = {row["id"]: row for row in self.get_rows_by_column(table_name, "id", manquants, columns=columns)}
+            for id_ in manquants:
+                # Les IDs introuvables sont conservés comme get_..._by_id (None)
+                self.cache.stocker(table_name, ("id", id_, projection), lues.get(id_))
+            lignes.update(lues)
+        return lignes
     
     # Méthodes pour les sessions de formation
     
-    def get_sessions(self, filters=None):
+    def get_sessions(self, filters=None, columns=None):
         """
         Récupère les sessions de formation avec filtres optionnels
         
         Args:
             filters (dict): Filtres à appliquer (statut, entreprise_id, etc.)
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
             
         Returns:
             list: Liste des sessions de formation
         """
-        query = self.client.table("sessions_formation").select("*")
+        projection = colonnes("sessions_formation", columns)
+        query = self.client.table("sessions_formation").select(projection)
         
         if filters:
             if "statut" in filters and filters["statut"]:
@@ -45,39 +216,47 @@ class SupabaseClient:
             if "formation_catalogue_id" in filters and filters["formation_catalogue_id"]:
                 query = query.eq("formation_catalogue_id", filters["formation_catalogue_id"])
         
-        response = query.execute()
+        response = self._executer("sessions_formation", query)
         
         if hasattr(response, 'data'):
             return response.data
         return []
     
-    def get_session_by_id(self, session_id):
+    def get_session_by_id(self, session_id, columns=None):
         """
         Récupère une session de formation par son ID
         
         Args:
             session_id (int): ID de la session
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
             
         Returns:
             dict: Données de la session ou None si non trouvée
         """
-        response = self.client.table("sessions_formation").select("*").eq("id", session_id).execute()
+        projection = colonnes("sessions_formation", columns)
         
-        if hasattr(response, 'data') and len(response.data) > 0:
-            return response.data[0]
-        return None
+        def charger():
+            response = self._executer("sessions_formation", self.client.table("sessions_formation").select(projection).eq("id", session_id))
+            
+            if hasattr(response, 'data') and len(response.data) > 0:
+                return response.data[0]
+            return None
+        
+        return self._lire("sessions_formation", ("id", session_id, projection), charger)
     
-    def get_sessions_with_details(self, filters=None):
+    def get_sessions_with_details(self, filters=None, columns=None):
         """
         Récupère les sessions avec les détails des entreprises et formations
         
         Args:
             filters (dict): Filtres à appliquer
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
             
         Returns:
             list: Liste des sessions avec détails
         """
-        query = self.client.table("vue_sessions_complete").select("*")
+        projection = colonnes("vue_sessions_complete", columns)
+        query = self.client.table("vue_sessions_complete").select(projection)
         
         if filters:
             if "statut" in filters and filters["statut"]:
@@ -87,12 +266,156 @@ class SupabaseClient:
             if "formation_catalogue_id" in filters and filters["formation_catalogue_id"]:
                 query = query.eq("formation_catalogue_id", filters["formation_catalogue_id"])
         
-        response = query.execute()
+        response = self._executer("vue_sessions_complete", query)
         
         if hasattr(response, 'data'):
             return response.data
         return []
     
+    def get_sessions_page(self, filters=None, limit=None, after=None, columns=None,
+                          table_name="sessions_formation", count=True):
+        """
+        Récupère une page de sessions triées par (date_debut, id), filtres appliqués par la base
+        
+        Args:
+            filters (dict): statut, entreprise_id, formation_catalogue_id, date_debut_min (inclus), date_debut_max (exclu)
+            limit (int): Nombre maximum de sessions (None : toutes)
+            after (tuple): (date_debut, id) de la dernière session de la page précédente
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            table_name (str): sessions_formation ou vue_sessions_complete
+            count (bool): Compter le nombre total de sessions (requête plus coûteuse)
+            
+        Returns:
+            tuple: (liste des sessions, nombre total de sessions correspondant aux filtres,
+                    ou None si count est False)
+        """
+        projection = colonnes(table_name, columns)
+        if count:
+            query = self.client.table(table_name).select(projection, count="exact")
+        else:
+            query = self.client.table(table_name).select(projection)
+        
+        if filters:
+            if filters.get("statut"):
+                query = query.eq("statut", filters["statut"])
+            if filters.get("entreprise_id"):
+                query = query.eq("entreprise_id", filters["entreprise_id"])
+            if filters.get("formation_catalogue_id"):
+                query = query.eq("formation_catalogue_id", filters["formation_catalogue_id"])
+            if filters.get("date_debut_min"):
+                query = query.gte("date_debut", filters["date_debut_min"])
+            if filters.get("date_debut_max"):
+                query = query.lt("date_debut", filters["date_debut_max"])
+        
+        # Pagination par curseur : sessions situées après la dernière de la page précédente
+        # (les sessions sans date_debut sont triées en dernier)
+        if after:
+            date_debut, session_id = after
+            if date_debut is None:
+                query = query.is_("date_debut", "null").gt("id", session_id)
+            else:
+                query = query.or_(
+                    f"date_debut.gt.{date_debut},"
+                    f"and(date_debut.eq.{date_debut},id.gt.{session_id}),"
+                    f"date_debut.is.null"
+                )
+        
+        query = query.order("date_debut").order("id")
+        if limit:
+            query = query.limit(limit)
+        
+        response = self._executer(table_name, query)
+        
+        if hasattr(response, 'data'):
+            if not count:
+                return response.data, None
+            total = response.count if getattr(response, 'count', None) is not None else len(response.data)
+            return response.data, total
+        return [], 0 if count else None
+    
+    def iter_sessions_pages(self, filters=None, page_size=TAILLE_PAGE, columns=None,
+                            table_name="sessions_formation"):
+        """
+        Parcourt les sessions page par page (pagination par clé sur (date_debut, id))
+        
+        Les sessions modifiées pendant le parcours (changement de statut) ne décalent
+        pas les pages suivantes, contrairement à une pagination par offset.
+        
+        Args:
+            filters (dict): Filtres de get_sessions_page
+            page_size (int): Nombre de sessions par page
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            table_name (str): sessions_formation ou vue_sessions_complete
+            
+        Yields:
+            list: Sessions d'une page
+        """
+        projection = avec_colonnes(colonnes(table_name, columns), "id", "date_debut")
+        after = None
+        
+        while True:
+            sessions, _ = self.get_sessions_page(
+                filters, limit=page_size, after=after, columns=projection,
+                table_name=table_name, count=False
+            )
+            if sessions:
+                yield sessions
+            if len(sessions) < page_size:
+                return
+            after = (sessions[-1].get("date_debut"), sessions[-1]["id"])
+    
+    def iter_sessions(self, filters=None, page_size=TAILLE_PAGE, columns=None):
+        """
+        Parcourt les sessions de formation une par une, en mémoire constante
+        
+        Args:
+            filters (dict): Filtres de get_sessions_page
+            page_size (int): Nombre de sessions lues par requête
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Yields:
+            dict: Session de formation
+        """
+        for sessions in self.iter_sessions_pages(filters, page_size, columns):
+            yield from sessions
+    
+    def iter_sessions_with_details(self, filters=None, page_size=TAILLE_PAGE, columns=None):
+        """
+        Parcourt les sessions avec les détails des entreprises et formations (vue_sessions_complete)
+        
+        Args:
+            filters (dict): Filtres de get_sessions_page
+            page_size (int): Nombre de sessions lues par requête
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Yields:
+            dict: Session avec détails
+        """
+        for sessions in self.iter_sessions_pages(filters, page_size, columns, "vue_sessions_complete"):
+            yield from sessions
+    
+    def get_session_details_by_id(self, session_id, columns=None):
+        """
+        Récupère une session avec les informations liées (vue_sessions_formation)
+        
+        Args:
+            session_id (str): ID de la session
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            dict: Données de la session ou None si non trouvée
+        """
+        projection = colonnes("vue_sessions_formation", columns)
+        
+        def charger():
+            response = self._executer("vue_sessions_formation", self.client.table("vue_sessions_formation").select(projection).eq("id", session_id))
+            
+            if hasattr(response, 'data') and len(response.data) > 0:
+                return response.data[0]
+            return None
+        
+        return self._lire("vue_sessions_formation", ("id", session_id, projection), charger)
+    
     def update_session_status(self, session_id, new_status):
         """
         Met à jour le statut d'une session
@@ -104,73 +427,239 @@ class SupabaseClient:
         Returns:
             dict: Données mises à jour ou None en cas d'erreur
         """
-        response = self.client.table("sessions_formation").update({"statut": new_status}).eq("id", session_id).execute()
+        response = self._executer("sessions_formation", self.client.table("sessions_formation").update({"statut": new_status}).eq("id", session_id))
+        self.invalider_cache("sessions_formation", "vue_sessions_formation", "vue_sessions_complete")
         
         if hasattr(response, 'data') and len(response.data) > 0:
             return response.data[0]
         return None
     
+    # Méthodes pour les participants
+    
+    def get_participant_by_id(self, participant_id, columns=None):
+        """
+        Récupère un participant par son ID
+        
+        Args:
+            participant_id (str): ID du participant
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            dict: Données du participant ou None si non trouvé
+        """
+        projection = colonnes("participants", columns)
+        
+        def charger():
+            response = self._executer("participants", self.client.table("participants").select(projection).eq("id", participant_id))
+            
+            if hasattr(response, 'data') and len(response.data) > 0:
+                return response.data[0]
+            return None
+        
+        return self._lire("participants", ("id", participant_id, projection), charger)
+    
+    def get_participants_by_session(self, session_id, columns=None):
+        """
+        Récupère les participants d'une session
+        
+        Args:
+            session_id (str): ID de la session
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            list: Liste des participants
+        """
+        projection = colonnes("participants", columns)
+        
+        def charger():
+            response = self._executer("participants", self.client.table("participants").select(projection).eq("session_formation_id", session_id))
+            
+            if hasattr(response, 'data'):
+                return response.data
+            return []
+        
+        return self._lire("participants", ("session_formation_id", session_id, projection), charger)
+    
+    def get_participants_by_sessions(self, session_ids, columns=None):
+        """
+        Récupère les participants de plusieurs sessions en une requête (par lot)
+        
+        Args:
+            session_ids (list): IDs des sessions
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            dict: Listes de participants par ID de session (liste vide si aucun)
+        """
+        participants = {session_id: [] for session_id in session_ids if session_id is not None}
+        for row in self.get_rows_by_column("participants", "session_formation_id", session_ids, columns=columns):
+            participants.setdefault(row["session_formation_id"], []).append(row)
+        return participants
+    
     # Méthodes pour les entreprises
     
-    def get_entreprises(self):
+    def get_entreprises(self, columns=None):
         """
         Récupère toutes les entreprises
         
+        Args:
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
         Returns:
             list: Liste des entreprises
         """
-        response = self.client.table("entreprises").select("*").execute()
+        projection = colonnes("entreprises", columns)
         
-        if hasattr(response, 'data'):
-            return response.data
-        return []
+        def charger():
+            response = self._executer("entreprises", self.client.table("entreprises").select(projection))
+            
+            if hasattr(response, 'data'):
+                return response.data
+            return []
+        
+        return self._lire("entreprises", (projection,), charger)
     
-    def get_entreprise_by_id(self, entreprise_id):
+    def get_entreprise_by_id(self, entreprise_id, columns=None):
         """
         Récupère une entreprise par son ID
         
         Args:
             entreprise_id (int): ID de l'entreprise
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
             
         Returns:
             dict: Données de l'entreprise ou None si non trouvée
         """
-        response = self.client.table("entreprises").select("*").eq("id", entreprise_id).execute()
+        projection = colonnes("entreprises", columns)
         
-        if hasattr(response, 'data') and len(response.data) > 0:
-            return response.data[0]
-        return None
+        def charger():
+            response = self._executer("entreprises", self.client.table("entreprises").select(projection).eq("id", entreprise_id))
+            
+            if hasattr(response, 'data') and len(response.data) > 0:
+                return response.data[0]
+            return None
+        
+        return self._lire("entreprises", ("id", entreprise_id, projection), charger)
+    
+    def get_entreprises_by_ids(self, entreprise_ids, columns=None):
+        """
+        Récupère plusieurs entreprises en une requête (par lot)
+        
+        Args:
+            entreprise_ids (list): IDs des entreprises
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            dict: Entreprises par ID (les IDs introuvables sont absents)
+        """
+        return self._lire_par_ids("entreprises", entreprise_ids, columns)
+    
+    def iter_entreprises(self, page_size=TAILLE_PAGE, columns=None):
+        """
+        Parcourt toutes les entreprises, en mémoire constante
+        
+        Args:
+            page_size (int): Nombre d'entreprises lues par requête
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Yields:
+            dict: Entreprise
+        """
+        return self.iter_table("entreprises", page_size, columns)
     
     # Méthodes pour les formations
     
-    def get_formations(self):
+    def get_formations(self, columns=None):
         """
         Récupère toutes les formations du catalogue
         
+        Args:
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
         Returns:
             list: Liste des formations
         """
-        response = self.client.table("formations_catalogue").select("*").execute()
+        projection = colonnes("formations_catalogue", columns)
         
-        if hasattr(response, 'data'):
-            return response.data
-        return []
+        def charger():
+            response = self._executer("formations_catalogue", self.client.table("formations_catalogue").select(projection))
+            
+            if hasattr(response, 'data'):
+                return response.data
+            return []
+        
+        return self._lire("formations_catalogue", (projection,), charger)
     
-    def get_formation_by_id(self, formation_id):
+    def get_formation_by_id(self, formation_id, columns=None):
         """
         Récupère une formation par son ID
         
         Args:
             formation_id (int): ID de la formation
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
             
         Returns:
             dict: Données de la formation ou None si non trouvée
         """
-        response = self.client.table("formations_catalogue").select("*").eq("id", formation_id).execute()
+        projection = colonnes("formations_catalogue", columns)
         
-        if hasattr(response, 'data') and len(response.data) > 0:
-            return response.data[0]
-        return None
+        def charger():
+            response = self._executer("formations_catalogue", self.client.table("formations_catalogue").select(projection).eq("id", formation_id))
+            
+            if hasattr(response, 'data') and len(response.data) > 0:
+                return response.data[0]
+            return None
+        
+        return self._lire("formations_catalogue", ("id", formation_id, projection), charger)
+    
+    def iter_formations(self, page_size=TAILLE_PAGE, columns=None):
+        """
+        Parcourt toutes les formations du catalogue, en mémoire constante
+        
+        Args:
+            page_size (int): Nombre de formations lues par requête
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Yields:
+            dict: Formation
+        """
+        return self.iter_table("formations_catalogue", page_size, columns)
+    
+    def get_formations_by_ids(self, formation_ids, columns=None):
+        """
+        Récupère plusieurs formations du catalogue en une requête (par lot)
+        
+        Args:
+            formation_ids (list): IDs des formations
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            dict: Formations par ID (les IDs introuvables sont absents)
+        """
+        return self._lire_par_ids("formations_catalogue", formation_ids, columns)
+    
+    # Méthodes pour l'organisme de formation
+    
+    def get_organisme_formation(self, columns=None):
+        """
+        Récupère les informations de l'organisme de formation
+        
+        Args:
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            dict: Données de l'organisme ou None si non renseignées
+        """
+        projection = colonnes("organisme_formation", columns)
+        
+        def charger():
+            response = self._executer("organisme_formation", self.client.table("organisme_formation").select(projection).limit(1))
+            
+            if hasattr(response, 'data') and len(response.data) > 0:
+                return response.data[0]
+            return None
+        
+        return self._lire("organisme_formation", (projection,), charger)
     
     # Méthodes pour les documents
     
@@ -188,14 +677,15 @@ class SupabaseClient:
             dict: Informations sur le fichier uploadé ou None en cas d'erreur
         """
         try:
-            response = self.client.storage.from_(bucket_name).upload(
+            # upsert : un nouvel essai remplace le fichier, l'upload est idempotent
+            response = self.resilience.executer("storage", lambda: self.client.storage.from_(bucket_name).upload(
                 file_path,
                 file_data,
                 {
                     'content-type': content_type,
                     'upsert': 'true'
                 }
-            )
+            ))
             return response
         except Exception as e:
             print(f"Erreur lors de l'upload du document: {str(e)}")
@@ -214,10 +704,10 @@ class SupabaseClient:
         """
         try:
             # Pour un bucket privé, utiliser create_signed_url
-            response = self.client.storage.from_(bucket_name).create_signed_url(
+            response = self.resilience.executer("storage", lambda: self.client.storage.from_(bucket_name).create_signed_url(
                 file_path,
                 60 * 60 * 24 * 7  # URL valide pendant 7 jours
-            )
+            ))
             if response and 'signedURL' in response:
                 return response['signedURL']
             return None
@@ -225,19 +715,33 @@ class SupabaseClient:
             print(f"Erreur lors de la récupération de l'URL du document: {str(e)}")
             return None
     
-    def delete_document(self, bucket_name, file_path):
+    def delete_document(self, bucket_name, file_path, document_id=None):
         """
         Supprime un document de Supabase Storage
         
+        Un fichier stocké par contenu (sha256/...) peut être référencé par
+        plusieurs lignes de la table documents : il n'est supprimé que s'il
+        n'est plus référencé par aucune autre ligne.
+        
         Args:
             bucket_name (str): Nom du bucket de stockage
             file_path (str): Chemin du fichier dans le bucket
+            document_id (str): Ligne de la table documents en cours de suppression
+                (ignorée dans la recherche des références)
             
         Returns:
-            bool: True si la suppression a réussi, False sinon
+            bool: True si le fichier a été supprimé ou reste utilisé par d'autres lignes, False en cas d'erreur
         """
         try:
-            response = self.client.storage.from_(bucket_name).remove([file_path])
+            query = self.client.table("documents").select("id").eq("storage_path", file_path)
+            if document_id is not None:
+                query = query.neq("id", document_id)
+            references = self._executer("documents", query.limit(1))
+            if references.data:
+                # Fichier partagé : les autres lignes pointent toujours dessus
+                return True
+            
+            self.resilience.executer("storage", lambda: self.client.storage.from_(bucket_name).remove([file_path]))
             return True
         except Exception as e:
             print(f"Erreur lors de la suppression du document: {str(e)}")
@@ -254,7 +758,7 @@ class SupabaseClient:
             dict: Données du document sauvegardé ou None en cas d'erreur
         """
         try:
-            response = self.client.table("documents").insert(document_data).execute()
+            response = self._executer("documents", self.client.table("documents").insert(document_data), retry=False)
             
             if hasattr(response, 'data') and len(response.data) > 0:
                 return response.data[0]
@@ -263,18 +767,44 @@ class SupabaseClient:
             print(f"Erreur lors de la sauvegarde des métadonnées du document: {str(e)}")
             return None
     
-    def get_documents_by_session(self, session_id):
+    def get_document_by_id(self, document_id, columns=None):
+        """
+        Récupère un document par son ID
+        
+        Args:
+            document_id (str): ID du document
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            dict: Données du document ou None si non trouvé
+        """
+        projection = colonnes("documents", columns)
+        
+        try:
+            response = self._executer("documents", self.client.table("documents").select(projection).eq("id", document_id))
+            
+            if hasattr(response, 'data') and len(response.data) > 0:
+                return response.data[0]
+            return None
+        except Exception as e:
+            print(f"Erreur lors de la récupération du document: {str(e)}")
+            return None
+    
+    def get_documents_by_session(self, session_id, columns=None):
         """
         Récupère tous les documents d'une session
         
         Args:
             session_id (str): ID de la session
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
             
         Returns:
             list: Liste des documents
         """
+        projection = colonnes("documents", columns)
+        
         try:
-            response = self.client.table("documents").select("*").eq("session_formation_id", session_id).execute()
+            response = self._executer("documents", self.client.table("documents").select(projection).eq("session_formation_id", session_id))
             
             if hasattr(response, 'data'):
                 return response.data
@@ -283,18 +813,21 @@ class SupabaseClient:
             print(f"Erreur lors de la récupération des documents: {str(e)}")
             return []
     
-    def get_documents_by_participant(self, participant_id):
+    def get_documents_by_participant(self, participant_id, columns=None):
         """
         Récupère tous les documents d'un participant
         
         Args:
             participant_id (str): ID du participant
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
             
         Returns:
             list: Liste des documents
         """
+        projection = colonnes("documents", columns)
+        
         try:
-            response = self.client.table("documents").select("*").eq("participant_id", participant_id).execute()
+            response = self._executer("documents", self.client.table("documents").select(projection).eq("participant_id", participant_id))
             
             if hasattr(response, 'data'):
                 return response.data
@@ -303,6 +836,82 @@ class SupabaseClient:
             print(f"Erreur lors de la récupération des documents: {str(e)}")
             return []
 
+    # Méthodes génériques
+    
+    def get_rows_by_column(self, table_name, column, values, chunk_size=TAILLE_LOT_IN, columns=None):
+        """
+        Récupère les lignes dont la colonne vaut l'une des valeurs
+        (une requête in.(...) par lot de chunk_size valeurs)
+        
+        Args:
+            table_name (str): Nom de la table
+            column (str): Colonne filtrée (id, session_formation_id...)
+            values (list): Valeurs recherchées
+            chunk_size (int): Nombre maximum de valeurs par requête
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            list: Lignes trouvées
+        """
+        projection = colonnes(table_name, columns)
+        values = list(dict.fromkeys(v for v in values if v is not None))
+        rows = []
+        
+        for i in range(0, len(values), chunk_size):
+            response = self._executer(table_name, self.client.table(table_name).select(projection).in_(column, values[i:i + chunk_size]))
+            
+            if hasattr(response, 'data'):
+                rows.extend(response.data)
+        
+        return rows
+    
+    def get_table(self, table_name, columns=None):
+        """
+        Récupère les lignes d'une table en un seul select (petites tables de
+        référence : au-delà de la limite max-rows de PostgREST, le résultat est
+        tronqué ; utiliser iter_table)
+        
+        Args:
+            table_name (str): Nom de la table ou de la vue
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Returns:
+            list: Lignes de la table
+        """
+        projection = colonnes(table_name, columns)
+        response = self._executer(table_name, self.client.table(table_name).select(projection))
+        
+        if hasattr(response, 'data'):
+            return response.data
+        return []
+
+    def iter_table(self, table_name, page_size=TAILLE_PAGE, columns=None):
+        """
+        Parcourt toutes les lignes d'une table par pages (pagination par clé sur id)
+        
+        Args:
+            table_name (str): Nom de la table
+            page_size (int): Nombre de lignes lues par requête
+            columns (str|list): Colonnes à récupérer ou nom de projection (défaut : toutes)
+            
+        Yields:
+            dict: Ligne de la table
+        """
+        projection = avec_colonnes(colonnes(table_name, columns), "id")
+        dernier_id = None
+        
+        while True:
+            query = self.client.table(table_name).select(projection)
+            if dernier_id is not None:
+                query = query.gt("id", dernier_id)
+            response = self._executer(table_name, query.order("id").limit(page_size))
+            
+            rows = response.data if hasattr(response, 'data') else []
+            yield from rows
+            if len(rows) < page_size:
+                return
+            dernier_id = rows[-1]["id"]
+
 # Singleton pour réutiliser la même instance
 _supabase_client = None
 
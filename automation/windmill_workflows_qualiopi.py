@@ -8,14 +8,17 @@ Version: 1.0
 
 import os
 import sys
-from datetime import datetime, timedelta
+from datetime import date, datetime, timedelta
 from typing import Dict, List
 import json
 
 # Ajouter le chemin des services
 sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'services'))
+# Ajouter le répertoire automation pour les utilitaires (utils)
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 from documentGeneratorExtended import QualiopisDocumentGeneratorExtended
+from utils.document_publisher import DocumentPublisher
 from supabase import create_client
 
 
@@ -44,7 +47,7 @@ def workflow_nouvelle_demande(session_id: str) -> Dict:
     """
     try:
         # Récupérer les données de la session
-        session = supabase.table('vue_sessions_complete').select('*').eq('id', session_id).execute()
+        session = supabase.table('vue_sessions_complete').select('id, statut').eq('id', session_id).execute()
         if not session.data:
             raise ValueError(f"Session {session_id} non trouvée")
         
@@ -90,42 +93,40 @@ def workflow_generer_proposition(session_id: str) -> Dict:
     4. Envoyer email au client avec les documents
     """
     try:
-        generator = QualiopisDocumentGeneratorExtended(supabase)
+        generator = QualiopisDocumentGeneratorExtended(supabase, output_dir=None)
         
         # Générer les documents
-        proposition_path = generator.generer_proposition_formation(session_id)
-        programme_path = generator.generer_programme_formation(session_id)
+        proposition = generator.generer_proposition_formation(session_id)
+        programme = generator.generer_programme_formation(session_id)
         
-        # Upload vers Supabase Storage
-        with open(proposition_path, 'rb') as f:
-            supabase.storage.from_('documents').upload(
-                f'propositions/proposition_{session_id}.pdf',
-                f.read()
-            )
-        
-        with open(programme_path, 'rb') as f:
-            supabase.storage.from_('documents').upload(
-                f'programmes/programme_{session_id}.pdf',
-                f.read()
-            )
-        
-        # Enregistrer les métadonnées dans la table documents
-        supabase.table('documents').insert([
+        # Upload vers Supabase Storage (uploads simultanés, stockage par contenu)
+        # et enregistrement des métadonnées dans la table documents en une seule insertion
+        publications = DocumentPublisher(supabase, 'documents').publier([
             {
-                'session_formation_id': session_id,
-                'type': 'proposition',
-                'nom_fichier': f'proposition_{session_id}.pdf',
-                'storage_path': f'propositions/proposition_{session_id}.pdf',
-                'statut': 'genere'
+                'contenu': proposition.contenu,
+                'empreinte_entrees': proposition.metadata.get('empreinte_entrees'),
+                'metadata': {
+                    'session_formation_id': session_id,
+                    'type': 'proposition',
+                    'nom_fichier': f'proposition_{session_id}.pdf',
+                    'statut': 'genere'
+                }
             },
             {
-                'session_formation_id': session_id,
-                'type': 'programme',
-                'nom_fichier': f'programme_{session_id}.pdf',
-                'storage_path': f'programmes/programme_{session_id}.pdf',
-                'statut': 'genere'
+                'contenu': programme.contenu,
+                'empreinte_entrees': programme.metadata.get('empreinte_entrees'),
+                'metadata': {
+                    'session_formation_id': session_id,
+                    'type': 'programme',
+                    'nom_fichier': f'programme_{session_id}.pdf',
+                    'statut': 'genere'
+                }
             }
-        ]).execute()
+        ])
+        
+        erreurs = [p['error'] for p in publications if not p['success']]
+        if erreurs:
+            raise Exception('; '.join(erreurs))
         
         # Envoyer email au client
         # (Intégration avec Resend)
@@ -159,29 +160,30 @@ def workflow_signature_convention(session_id: str) -> Dict:
     5. Mettre à jour le statut à 'confirmee'
     """
     try:
-        generator = QualiopisDocumentGeneratorExtended(supabase)
+        generator = QualiopisDocumentGeneratorExtended(supabase, output_dir=None)
         
         # Générer la convention
-        convention_path = generator.generer_convention_formation(session_id)
-        
-        # Upload vers Supabase Storage
-        with open(convention_path, 'rb') as f:
-            supabase.storage.from_('documents').upload(
-                f'conventions/convention_{session_id}.pdf',
-                f.read()
-            )
+        convention = generator.generer_convention_formation(session_id)
         
         # Envoyer via Yousign
         # (Intégration avec Yousign API - voir INTEGRATION-YOUSIGN.md)
         
-        # Enregistrer dans la table documents
-        supabase.table('documents').insert({
-            'session_formation_id': session_id,
-            'type': 'convention',
-            'nom_fichier': f'convention_{session_id}.pdf',
+        # Upload vers Supabase Storage et enregistrement dans la table documents
+        # (convention inchangée depuis le dernier envoi : ni upload ni nouvelle ligne)
+        publications = DocumentPublisher(supabase, 'documents').publier([{
+            'contenu': convention.contenu,
             'storage_path': f'conventions/convention_{session_id}.pdf',
-            'statut': 'envoye'
-        }).execute()
+            'empreinte_entrees': convention.metadata.get('empreinte_entrees'),
+            'metadata': {
+                'session_formation_id': session_id,
+                'type': 'convention',
+                'nom_fichier': f'convention_{session_id}.pdf',
+                'statut': 'envoye'
+            }
+        }])
+        erreurs = [p['error'] for p in publications if not p['success']]
+        if erreurs:
+            raise Exception('; '.join(erreurs))
         
         return {
             'success': True,
@@ -208,31 +210,33 @@ def workflow_questionnaires_prealables(session_id: str) -> Dict:
     2. Envoyer par email à chaque participant
     """
     try:
-        generator = QualiopisDocumentGeneratorExtended(supabase)
+        generator = QualiopisDocumentGeneratorExtended(supabase, output_dir=None)
         
         # Récupérer les participants
-        participants = supabase.table('participants').select('*').eq('session_formation_id', session_id).execute()
+        participants = supabase.table('participants').select('id').eq('session_formation_id', session_id).execute()
         
         questionnaires_generes = []
         
         for participant in participants.data:
             # Générer le questionnaire
-            questionnaire_path = generator.generer_questionnaire_prealable(session_id, participant['id'])
-            
-            # Upload vers Supabase Storage
-            with open(questionnaire_path, 'rb') as f:
-                storage_path = f'questionnaires/prealable_{participant["id"]}.pdf'
-                supabase.storage.from_('documents').upload(storage_path, f.read())
+            questionnaire = generator.generer_questionnaire_prealable(session_id, participant['id'])
             
-            # Enregistrer dans la table
-            supabase.table('documents').insert({
-                'session_formation_id': session_id,
-                'participant_id': participant['id'],
-                'type': 'questionnaire_prealable',
-                'nom_fichier': f'questionnaire_prealable_{participant["id"]}.pdf',
-                'storage_path': storage_path,
-                'statut': 'genere'
-            }).execute()
+            # Upload vers Supabase Storage et enregistrement dans la table
+            # (questionnaire inchangé : ni upload ni nouvelle ligne)
+            publications = DocumentPublisher(supabase, 'documents').publier([{
+                'contenu': questionnaire.contenu,
+                'storage_path': f'questionnaires/prealable_{participant["id"]}.pdf',
+                'empreinte_entrees': questionnaire.metadata.get('empreinte_entrees'),
+                'metadata': {
+                    'session_formation_id': session_id,
+                    'participant_id': participant['id'],
+                    'type': 'questionnaire_prealable',
+                    'nom_fichier': f'questionnaire_prealable_{participant["id"]}.pdf',
+                    'statut': 'genere'
+                }
+            }])
+            if not publications[0]['success']:
+                raise Exception(publications[0]['error'])
             
             # Créer l'entrée dans questionnaires_prealables
             supabase.table('questionnaires_prealables').insert({
@@ -276,39 +280,37 @@ def workflow_envoyer_convocations(session_id: str) -> Dict:
     5. Mettre à jour le statut à 'convoquee'
     """
     try:
-        generator = QualiopisDocumentGeneratorExtended(supabase)
+        generator = QualiopisDocumentGeneratorExtended(supabase, output_dir=None)
         
         # Récupérer les participants
-        participants = supabase.table('participants').select('*').eq('session_formation_id', session_id).execute()
+        participants = supabase.table('participants').select('id').eq('session_formation_id', session_id).execute()
         
         # Générer le règlement intérieur (une seule fois)
-        reglement_path = generator.generer_reglement_interieur()
+        reglement = generator.generer_reglement_interieur()
         
         # Générer les feuilles d'émargement
-        session = supabase.table('sessions_formation').select('*').eq('id', session_id).execute()
-        emargement_path = generator.generer_feuille_emargement(session_id, session.data[0]['date_debut'])
+        session = supabase.table('sessions_formation').select('id, date_debut').eq('id', session_id).execute()
+        emargement = generator.generer_feuille_emargement(session_id, session.data[0]['date_debut'])
         
         convocations_envoyees = []
+        documents = []
         
         for participant in participants.data:
             # Générer la convocation
-            convocation_path = generator.generer_convocation(session_id, participant['id'])
+            convocation = generator.generer_convocation(session_id, participant['id'])
             
-            # Upload vers Supabase Storage
-            with open(convocation_path, 'rb') as f:
-                storage_path = f'convocations/convocation_{participant["id"]}.pdf'
-                supabase.storage.from_('documents').upload(storage_path, f.read())
-            
-            # Enregistrer dans la table
-            supabase.table('documents').insert({
-                'session_formation_id': session_id,
-                'participant_id': participant['id'],
-                'type': 'convocation',
-                'nom_fichier': f'convocation_{participant["id"]}.pdf',
-                'storage_path': storage_path,
-                'statut': 'envoye',
-                'date_envoi': datetime.now().isoformat()
-            }).execute()
+            documents.append({
+                'contenu': convocation.contenu,
+                'empreinte_entrees': convocation.metadata.get('empreinte_entrees'),
+                'metadata': {
+                    'session_formation_id': session_id,
+                    'participant_id': participant['id'],
+                    'type': 'convocation',
+                    'nom_fichier': f'convocation_{participant["id"]}.pdf',
+                    'statut': 'envoye',
+                    'date_envoi': datetime.now().isoformat()
+                }
+            })
             
             convocations_envoyees.append(participant['id'])
             
@@ -318,6 +320,27 @@ def workflow_envoyer_convocations(session_id: str) -> Dict:
             # - Programme de formation
             # (Intégration avec Resend)
         
+        # Le règlement intérieur est identique pour toutes les sessions :
+        # stocké une seule fois, référencé par chaque session
+        documents.append({
+            'contenu': reglement.contenu,
+            'empreinte_entrees': reglement.metadata.get('empreinte_entrees'),
+            'metadata': {
+                'session_formation_id': session_id,
+                'type': 'reglement_interieur',
+                'nom_fichier': reglement.nom_fichier,
+                'statut': 'envoye',
+                'date_envoi': datetime.now().isoformat()
+            }
+        })
+        
+        # Upload vers Supabase Storage et enregistrement dans la table en une insertion
+        publications = DocumentPublisher(supabase, 'documents').publier(documents)
+        
+        erreurs = [p['error'] for p in publications if not p['success']]
+        if erreurs:
+            raise Exception('; '.join(erreurs))
+        
         # Mettre à jour le statut de la session
         supabase.table('sessions_formation').update({
             'statut': 'convoquee',
@@ -350,21 +373,20 @@ def workflow_evaluations_a_chaud(session_id: str) -> Dict:
     2. Envoyer par email immédiatement
     """
     try:
-        generator = QualiopisDocumentGeneratorExtended(supabase)
+        generator = QualiopisDocumentGeneratorExtended(supabase, output_dir=None)
         
         # Récupérer les participants
-        participants = supabase.table('participants').select('*').eq('session_formation_id', session_id).execute()
+        participants = supabase.table('participants').select('id').eq('session_formation_id', session_id).execute()
         
         evaluations_envoyees = []
         
         for participant in participants.data:
             # Générer l'évaluation
-            evaluation_path = generator.generer_evaluation_a_chaud(session_id, participant['id'])
+            evaluation = generator.generer_evaluation_a_chaud(session_id, participant['id'])
             
             # Upload vers Supabase Storage
-            with open(evaluation_path, 'rb') as f:
-                storage_path = f'evaluations/a_chaud_{participant["id"]}.pdf'
-                supabase.storage.from_('documents').upload(storage_path, f.read())
+            storage_path = f'evaluations/a_chaud_{participant["id"]}.pdf'
+            supabase.storage.from_('documents').upload(storage_path, evaluation.contenu)
             
             # Créer l'entrée dans evaluations
             supabase.table('evaluations').insert({
@@ -406,15 +428,14 @@ def workflow_bilan_formateur(session_id: str) -> Dict:
     2. Envoyer par email au formateur
     """
     try:
-        generator = QualiopisDocumentGeneratorExtended(supabase)
+        generator = QualiopisDocumentGeneratorExtended(supabase, output_dir=None)
         
         # Générer le questionnaire formateur
-        questionnaire_path = generator.generer_questionnaire_formateur(session_id)
+        questionnaire = generator.generer_questionnaire_formateur(session_id)
         
         # Upload vers Supabase Storage
-        with open(questionnaire_path, 'rb') as f:
-            storage_path = f'evaluations/formateur_{session_id}.pdf'
-            supabase.storage.from_('documents').upload(storage_path, f.read())
+        storage_path = f'evaluations/formateur_{session_id}.pdf'
+        supabase.storage.from_('documents').upload(storage_path, questionnaire.contenu)
         
         # Créer l'entrée dans evaluations
         supabase.table('evaluations').insert({
@@ -455,32 +476,34 @@ def workflow_cloture_formation(session_id: str) -> Dict:
     5. Mettre à jour le statut à 'terminee'
     """
     try:
-        generator = QualiopisDocumentGeneratorExtended(supabase)
+        generator = QualiopisDocumentGeneratorExtended(supabase, output_dir=None)
         
         # Récupérer les participants
-        participants = supabase.table('participants').select('*').eq('session_formation_id', session_id).execute()
+        participants = supabase.table('participants').select('id').eq('session_formation_id', session_id).execute()
         
         certificats_envoyes = []
         
         for participant in participants.data:
             # Générer le certificat
-            certificat_path = generator.generer_certificat_realisation(session_id, participant['id'])
+            certificat = generator.generer_certificat_realisation(session_id, participant['id'])
             
-            # Upload vers Supabase Storage
-            with open(certificat_path, 'rb') as f:
-                storage_path = f'certificats/certificat_{participant["id"]}.pdf'
-                supabase.storage.from_('documents').upload(storage_path, f.read())
-            
-            # Enregistrer dans la table
-            supabase.table('documents').insert({
-                'session_formation_id': session_id,
-                'participant_id': participant['id'],
-                'type': 'certificat',
-                'nom_fichier': f'certificat_{participant["id"]}.pdf',
-                'storage_path': storage_path,
-                'statut': 'envoye',
-                'date_envoi': datetime.now().isoformat()
-            }).execute()
+            # Upload vers Supabase Storage et enregistrement dans la table
+            # (certificat inchangé : ni upload ni nouvelle ligne)
+            publications = DocumentPublisher(supabase, 'documents').publier([{
+                'contenu': certificat.contenu,
+                'storage_path': f'certificats/certificat_{participant["id"]}.pdf',
+                'empreinte_entrees': certificat.metadata.get('empreinte_entrees'),
+                'metadata': {
+                    'session_formation_id': session_id,
+                    'participant_id': participant['id'],
+                    'type': 'certificat',
+                    'nom_fichier': f'certificat_{participant["id"]}.pdf',
+                    'statut': 'envoye',
+                    'date_envoi': datetime.now().isoformat()
+                }
+            }])
+            if not publications[0]['success']:
+                raise Exception(publications[0]['error'])
             
             certificats_envoyes.append(participant['id'])
             
@@ -488,7 +511,7 @@ def workflow_cloture_formation(session_id: str) -> Dict:
             # (Intégration avec Resend)
         
         # Générer évaluation satisfaction client
-        eval_client_path = generator.generer_evaluation_satisfaction_client(session_id)
+        eval_client = generator.generer_evaluation_satisfaction_client(session_id)
         
         # Créer l'entrée dans evaluations
         supabase.table('evaluations').insert({
@@ -533,21 +556,20 @@ def workflow_evaluations_a_froid(session_id: str) -> Dict:
     2. Envoyer par email
     """
     try:
-        generator = QualiopisDocumentGeneratorExtended(supabase)
+        generator = QualiopisDocumentGeneratorExtended(supabase, output_dir=None)
         
         # Récupérer les participants
-        participants = supabase.table('participants').select('*').eq('session_formation_id', session_id).execute()
+        participants = supabase.table('participants').select('id').eq('session_formation_id', session_id).execute()
         
         evaluations_envoyees = []
         
         for participant in participants.data:
             # Générer l'évaluation
-            evaluation_path = generator.generer_evaluation_a_froid(session_id, participant['id'])
+            evaluation = generator.generer_evaluation_a_froid(session_id, participant['id'])
             
             # Upload vers Supabase Storage
-            with open(evaluation_path, 'rb') as f:
-                storage_path = f'evaluations/a_froid_{participant["id"]}.pdf'
-                supabase.storage.from_('documents').upload(storage_path, f.read())
+            storage_path = f'evaluations/a_froid_{participant["id"]}.pdf'
+            supabase.storage.from_('documents').upload(storage_path, evaluation.contenu)
             
             # Créer l'entrée dans evaluations
             supabase.table('evaluations').insert({
@@ -630,88 +652,197 @@ def workflow_archivage(session_id: str) -> Dict:
 # CRON JOBS - PLANIFICATION
 # ============================================
 
+# Nombre de jours de retard rattrapés (ex: cron indisponible pendant quelques jours)
+JOURS_RATTRAPAGE = 7
+
+
+def _sessions_avec_questionnaires(session_ids: List[str]) -> set:
+    """Sessions dont les questionnaires préalables ont déjà été envoyés"""
+    response = supabase.table('questionnaires_prealables').select('session_formation_id').in_('session_formation_id', session_ids).execute()
+    return {row['session_formation_id'] for row in response.data}
+
+
+def _sessions_avec_evaluation(type_evaluation: str):
+    """Sessions ayant déjà une évaluation du type donné"""
+    def verifier(session_ids: List[str]) -> set:
+        response = supabase.table('evaluations').select('session_formation_id').eq('type', type_evaluation).in_('session_formation_id', session_ids).execute()
+        return {row['session_formation_id'] for row in response.data}
+    return verifier
+
+
+# Échéances du parcours Qualiopi, dans l'ordre d'exécution
+# - statut / colonne / jours : l'action est due quand colonne + jours = aujourd'hui
+# - deja_traitees : sessions déjà traitées, pour les workflows qui ne changent pas
+#   le statut de la session (None : le workflow fait sortir la session du statut)
+ECHEANCES = [
+    {
+        'nom': 'j_moins_7',
+        'statut': 'confirmee',
+        'colonne': 'date_debut',
+        'jours': -7,
+        'workflow': workflow_questionnaires_prealables,
+        'deja_traitees': _sessions_avec_questionnaires
+    },
+    {
+        'nom': 'j_moins_4',
+        'statut': 'confirmee',
+        'colonne': 'date_debut',
+        'jours': -4,
+        'workflow': workflow_envoyer_convocations,
+        'deja_traitees': None
+    },
+    {
+        'nom': 'j_plus_1',
+        'statut': 'convoquee',
+        'colonne': 'date_fin',
+        'jours': 1,
+        'workflow': workflow_bilan_formateur,
+        'deja_traitees': _sessions_avec_evaluation('formateur')
+    },
+    {
+        'nom': 'j_plus_2',
+        'statut': 'convoquee',
+        'colonne': 'date_fin',
+        'jours': 2,
+        'workflow': workflow_cloture_formation,
+        'deja_traitees': None
+    },
+    {
+        'nom': 'j_plus_60',
+        'statut': 'terminee',
+        'colonne': 'date_fin',
+        'jours': 60,
+        'workflow': workflow_evaluations_a_froid,
+        'deja_traitees': _sessions_avec_evaluation('a_froid')
+    },
+    {
+        'nom': 'j_plus_90',
+        'statut': 'terminee',
+        'colonne': 'date_fin',
+        'jours': 90,
+        'workflow': workflow_archivage,
+        'deja_traitees': None
+    },
+]
+
+
+def _parse_date(valeur: str) -> date:
+    """Convertit une date ou un timestamp ISO en date"""
+    return datetime.fromisoformat(valeur.replace('Z', '+00:00')).date()
+
+
+def _plage_echeance(echeance: Dict, aujourd_hui: date, jours_rattrapage: int):
+    """
+    Dates de session pour lesquelles l'échéance est due aujourd'hui ou en retard
+
+    Les actions avant la formation (jours < 0) ne sont pas rattrapées une fois la date passée.
+    """
+    fin = aujourd_hui - timedelta(days=echeance['jours'])
+    debut = fin - timedelta(days=jours_rattrapage)
+    if echeance['jours'] < 0:
+        debut = max(debut, aujourd_hui)
+    return debut, fin
+
+
+def planifier_echeances(echeances: List[str] = None, aujourd_hui: date = None,
+                        jours_rattrapage: int = JOURS_RATTRAPAGE) -> Dict:
+    """
+    Déclenche en une passe toutes les actions planifiées dues (J-7, J-4, J+1, J+2, J+60, J+90)
+
+    Une seule requête par statut, filtrée sur la plage de dates concernée.
+    Les échéances manquées depuis moins de jours_rattrapage jours sont rattrapées.
+
+    Args:
+        echeances: Noms des échéances à traiter (défaut : toutes)
+        aujourd_hui: Date de référence (défaut : aujourd'hui)
+        jours_rattrapage: Nombre de jours de retard rattrapés
+
+    Returns:
+        Dict avec la liste des actions exécutées
+    """
+    aujourd_hui = aujourd_hui or datetime.now().date()
+    selection = [e for e in ECHEANCES if echeances is None or e['nom'] in echeances]
+
+    # Regrouper les échéances par statut et colonne : une requête par groupe
+    groupes = {}
+    for echeance in selection:
+        groupes.setdefault((echeance['statut'], echeance['colonne']), []).append(echeance)
+
+    actions = []
+    for (statut, colonne), echeances_groupe in groupes.items():
+        plages = [_plage_echeance(e, aujourd_hui, jours_rattrapage) for e in echeances_groupe]
+        debut = min(p[0] for p in plages)
+        fin = max(p[1] for p in plages)
+        if debut > fin:
+            continue
+
+        sessions = supabase.table('sessions_formation').select(f'id, {colonne}') \
+            .eq('statut', statut) \
+            .gte(colonne, debut.isoformat()) \
+            .lt(colonne, (fin + timedelta(days=1)).isoformat()) \
+            .order(colonne) \
+            .execute()
+
+        for echeance, (debut_echeance, fin_echeance) in zip(echeances_groupe, plages):
+            dues = [
+                session for session in sessions.data
+                if session.get(colonne) and debut_echeance <= _parse_date(session[colonne]) <= fin_echeance
+            ]
+            if dues and echeance['deja_traitees']:
+                deja_traitees = echeance['deja_traitees']([session['id'] for session in dues])
+                dues = [session for session in dues if session['id'] not in deja_traitees]
+
+            for session in dues:
+                resultat = echeance['workflow'](session['id'])
+                actions.append({
+                    'echeance': echeance['nom'],
+                    'session_id': session['id'],
+                    'date_session': session[colonne],
+                    'en_retard': _parse_date(session[colonne]) < aujourd_hui - timedelta(days=echeance['jours']),
+                    'success': resultat.get('success', False),
+                    'message': resultat.get('message') or resultat.get('error')
+                })
+
+    return {
+        'date': aujourd_hui.isoformat(),
+        'actions': actions,
+        'count': len(actions)
+    }
+
+
+def cron_planification_quotidienne():
+    """Cron unique : traite toutes les échéances du jour et les retards"""
+    return planifier_echeances()
+
+
 def cron_check_sessions_j_moins_7():
     """Vérifie les sessions à J-7 et envoie les questionnaires préalables"""
-    date_cible = (datetime.now() + timedelta(days=7)).date()
-    
-    sessions = supabase.table('sessions_formation').select('id').eq('statut', 'confirmee').execute()
-    
-    for session in sessions.data:
-        session_data = supabase.table('sessions_formation').select('date_debut').eq('id', session['id']).execute()
-        date_debut = datetime.fromisoformat(session_data.data[0]['date_debut']).date()
-        
-        if date_debut == date_cible:
-            workflow_questionnaires_prealables(session['id'])
+    return planifier_echeances(['j_moins_7'])
 
 
 def cron_check_sessions_j_moins_4():
     """Vérifie les sessions à J-4 et envoie les convocations"""
-    date_cible = (datetime.now() + timedelta(days=4)).date()
-    
-    sessions = supabase.table('sessions_formation').select('id').eq('statut', 'confirmee').execute()
-    
-    for session in sessions.data:
-        session_data = supabase.table('sessions_formation').select('date_debut').eq('id', session['id']).execute()
-        date_debut = datetime.fromisoformat(session_data.data[0]['date_debut']).date()
-        
-        if date_debut == date_cible:
-            workflow_envoyer_convocations(session['id'])
+    return planifier_echeances(['j_moins_4'])
 
 
 def cron_check_sessions_j_plus_1():
     """Vérifie les sessions à J+1 et envoie le bilan formateur"""
-    date_cible = (datetime.now() - timedelta(days=1)).date()
-    
-    sessions = supabase.table('sessions_formation').select('id').eq('statut', 'convoquee').execute()
-    
-    for session in sessions.data:
-        session_data = supabase.table('sessions_formation').select('date_fin').eq('id', session['id']).execute()
-        date_fin = datetime.fromisoformat(session_data.data[0]['date_fin']).date()
-        
-        if date_fin == date_cible:
-            workflow_bilan_formateur(session['id'])
+    return planifier_echeances(['j_plus_1'])
 
 
 def cron_check_sessions_j_plus_2():
     """Vérifie les sessions à J+2 et clôture la formation"""
-    date_cible = (datetime.now() - timedelta(days=2)).date()
-    
-    sessions = supabase.table('sessions_formation').select('id').eq('statut', 'convoquee').execute()
-    
-    for session in sessions.data:
-        session_data = supabase.table('sessions_formation').select('date_fin').eq('id', session['id']).execute()
-        date_fin = datetime.fromisoformat(session_data.data[0]['date_fin']).date()
-        
-        if date_fin == date_cible:
-            workflow_cloture_formation(session['id'])
+    return planifier_echeances(['j_plus_2'])
 
 
 def cron_check_sessions_j_plus_60():
     """Vérifie les sessions à J+60 et envoie les évaluations à froid"""
-    date_cible = (datetime.now() - timedelta(days=60)).date()
-    
-    sessions = supabase.table('sessions_formation').select('id').eq('statut', 'terminee').execute()
-    
-    for session in sessions.data:
-        session_data = supabase.table('sessions_formation').select('date_fin').eq('id', session['id']).execute()
-        date_fin = datetime.fromisoformat(session_data.data[0]['date_fin']).date()
-        
-        if date_fin == date_cible:
-            workflow_evaluations_a_froid(session['id'])
+    return planifier_echeances(['j_plus_60'])
 
 
 def cron_check_sessions_j_plus_90():
     """Vérifie les sessions à J+90 et archive"""
-    date_cible = (datetime.now() - timedelta(days=90)).date()
-    
-    sessions = supabase.table('sessions_formation').select('id').eq('statut', 'terminee').execute()
-    
-    for session in sessions.data:
-        session_data = supabase.table('sessions_formation').select('date_fin').eq('id', session['id']).execute()
-        date_fin = datetime.fromisoformat(session_data.data[0]['date_fin']).date()
-        
-        if date_fin == date_cible:
-            workflow_archivage(session['id'])
+    return planifier_echeances(['j_plus_90'])
 
 
 # ============================================
@@ -1,7 +1,12 @@
 #!/usr/bin/env python3
 """
 Script CLI pour générer des documents depuis les templates Word
-Usage: python generate_documents_cli.py <method_name> <session_id> [participant_id]
+Usage: python generate_documents_cli.py <method_name> <session_id> [participant_id] [--parallele]
+       python generate_documents_cli.py --batch [--sequentiel] < taches.json
+
+Mode --batch : lit sur stdin une liste JSON de tâches
+    [{"method": "generer_convocation", "session_id": "...", "participant_id": "..."}, ...]
+(ou [method, session_id, participant_id]) et écrit une ligne JSON par document dès qu'il est généré.
 """
 
 import sys
@@ -14,11 +19,70 @@ from services.templateDocumentGenerator import TemplateDocumentGenerator
 # Charger les variables d'environnement
 load_dotenv()
 
+def creer_client():
+    """Connexion à Supabase"""
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_KEY')
+    
+    if not supabase_url or not supabase_key:
+        raise ValueError('SUPABASE_URL et SUPABASE_KEY doivent être définis dans .env')
+    
+    return create_client(supabase_url, supabase_key)
+
+def lire_taches(entree):
+    """Lit la liste JSON des tâches du mode --batch"""
+    taches = []
+    for tache in json.load(entree):
+        if isinstance(tache, (list, tuple)):
+            tache = {
+                'method': tache[0],
+                'session_id': tache[1],
+                'participant_id': tache[2] if len(tache) > 2 else None
+            }
+        if not tache.get('method') or not tache.get('session_id'):
+            raise ValueError(f'Tâche invalide: {tache}')
+        taches.append(tache)
+    return taches
+
+def main_batch(parallele):
+    """Mode --batch : une ligne JSON par document, écrite dès la fin du rendu"""
+    # stdout est réservé aux résultats : les messages des générateurs partent sur stderr
+    sortie = sys.stdout
+    sys.stdout = sys.stderr
+    
+    try:
+        taches = lire_taches(sys.stdin)
+        generator = TemplateDocumentGenerator(creer_client())
+        
+        for resultat in generator.generer_lot(taches, parallele=parallele):
+            resultat.pop('document', None)
+            if resultat['success']:
+                path = resultat.pop('path')
+                resultat['filePath' if isinstance(path, str) else 'result'] = path
+            sortie.write(json.dumps(resultat, default=str) + '\n')
+            sortie.flush()
+    
+    except Exception as e:
+        sortie.write(json.dumps({
+            'success': False,
+            'error': str(e)
+        }) + '\n')
+        sys.exit(1)
+
 def main():
+    if '--batch' in sys.argv:
+        main_batch(parallele='--sequentiel' not in sys.argv)
+        return
+    
+    # Rendu réparti sur plusieurs processus (generer_tous_documents_session)
+    parallele = '--parallele' in sys.argv
+    if parallele:
+        sys.argv.remove('--parallele')
+    
     if len(sys.argv) < 3:
         print(json.dumps({
             'success': False,
-            'error': 'Usage: python generate_documents_cli.py <method_name> <session_id> [participant_id]'
+            'error': 'Usage: python generate_documents_cli.py <method_name> <session_id> [participant_id] [--parallele]'
         }))
         sys.exit(1)
     
@@ -27,24 +91,16 @@ def main():
     participant_id = sys.argv[3] if len(sys.argv) > 3 else None
     
     try:
-        # Connexion à Supabase
-        supabase_url = os.getenv('SUPABASE_URL')
-        supabase_key = os.getenv('SUPABASE_KEY')
-        
-        if not supabase_url or not supabase_key:
-            raise ValueError('SUPABASE_URL et SUPABASE_KEY doivent être définis dans .env')
-        
-        supabase = create_client(supabase_url, supabase_key)
-        
         # Créer le générateur
-        generator = TemplateDocumentGenerator(supabase)
+        generator = TemplateDocumentGenerator(creer_client())
         
         # Appeler la méthode demandée
         if method_name == 'generer_tous_documents_session':
-            result = generator.generer_tous_documents_session(session_id)
+            result = generator.generer_tous_documents_session(session_id, parallele=parallele)
             print(json.dumps({
                 'success': True,
-                'documents': result
+                'documents': result,
+                'avertissements': generator.avertissements
             }))
         else:
             # Appeler la méthode spécifique
@@ -59,7 +115,8 @@ def main():
                 
                 print(json.dumps({
                     'success': True,
-                    'filePath': file_path
+                    'filePath': file_path,
+                    'avertissements': generator.avertissements
                 }))
             else:
                 raise ValueError(f'Méthode inconnue: {method_name}')
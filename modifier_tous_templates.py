@@ -5,10 +5,15 @@ Ajoute les variables appropriées dans chaque document
 """
 
 import os
+import sys
 from docx import Document
 import shutil
 from datetime import datetime
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'services'))
+
+from templateEngine import verifier_document
+
 TEMPLATES_DIR = "Dossier exemple"
 BACKUP_DIR = os.path.join(TEMPLATES_DIR, "backup_originaux")
 
@@ -86,6 +91,11 @@ def replace_in_document(doc, replacements):
         for table in section.footer.tables:
             replace_in_table(table, replacements)
 
+def afficher_avertissements(doc):
+    """Signale les placeholders que le générateur ne pourra pas remplacer"""
+    for avertissement in verifier_document(doc):
+        print(f"   ⚠️  Placeholder {avertissement['type']} : {avertissement['placeholder']}")
+
 def get_common_replacements():
     """Retourne les remplacements communs à tous les documents"""
     return {
@@ -121,7 +131,9 @@ def modifier_template(template_name, specific_replacements=None):
         
         replace_in_document(doc, replacements)
         doc.save(template_path)
-        print(f"   ✅ Modifié\n")
+        print(f"   ✅ Modifié")
+        afficher_avertissements(doc)
+        print()
         return True
         
     except Exception as e:
@@ -4,10 +4,15 @@ Script pour préparer automatiquement les templates Word avec les variables
 """
 
 import os
+import sys
 from docx import Document
 from pathlib import Path
 import re
 
+sys.path.append(os.path.join(os.path.dirname(os.path.abspath(__file__)), 'services'))
+
+from templateEngine import verifier_document
+
 # Dossier des templates
 TEMPLATES_DIR = "Dossier exemple"
 
@@ -89,7 +94,12 @@ def prepare_template(template_path, output_path=None):
         
         # Sauvegarder
         doc.save(output_path)
-        print(f"   ✅ Template préparé avec succès\n")
+        print(f"   ✅ Template préparé avec succès")
+        
+        # Vérifier la syntaxe des placeholders produits
+        for avertissement in verifier_document(doc):
+            print(f"   ⚠️  Placeholder {avertissement['type']} : {avertissement['placeholder']}")
+        print()
         
     except Exception as e:
         print(f"   ❌ Erreur : {str(e)}\n")
@@ -126,7 +136,12 @@ def prepare_convention_template():
         
         # Sauvegarder
         doc.save(template_path)
-        print(f"   ✅ Convention préparée avec succès\n")
+        print(f"   ✅ Convention préparée avec succès")
+        
+        # Vérifier la syntaxe des placeholders produits
+        for avertissement in verifier_document(doc):
+            print(f"   ⚠️  Placeholder {avertissement['type']} : {avertissement['placeholder']}")
+        print()
         
     except Exception as e:
         print(f"   ❌ Erreur : {str(e)}\n")
@@ -2,7 +2,7 @@ const express = require('express');
 const router = express.Router();
 const documentService = require('../services/documentService');
 const emailService = require('../services/emailService');
-const { spawn } = require('child_process');
+const pythonWorkerPool = require('../services/pythonWorkerPool');
 const path = require('path');
 const fs = require('fs').promises;
 
@@ -191,40 +191,23 @@ router.post('/send-certificate', async (req, res) => {
   }
 });
 
+// Générateur Python correspondant à chaque script
+const pythonGenerators = {
+  'templateDocumentGenerator.py': 'template',
+  'documentGenerator.py': 'qualiopi'
+};
+
 /**
- * Helper function pour appeler le script Python de génération
+ * Helper function pour appeler le générateur Python
+ * Passe par le pool de workers Python (PYTHON_WORKERS=0 : un processus par requête)
  */
 async function callPythonGenerator(scriptName, args) {
-  return new Promise((resolve, reject) => {
-    const pythonPath = process.env.PYTHON_PATH || 'python3';
-    const scriptPath = path.join(__dirname, '..', 'services', scriptName);
-    
-    const pythonProcess = spawn(pythonPath, [scriptPath, ...args]);
-    
-    let stdout = '';
-    let stderr = '';
-    
-    pythonProcess.stdout.on('data', (data) => {
-      stdout += data.toString();
-    });
-    
-    pythonProcess.stderr.on('data', (data) => {
-      stderr += data.toString();
-    });
-    
-    pythonProcess.on('close', (code) => {
-      if (code !== 0) {
-        reject(new Error(`Python script exited with code ${code}: ${stderr}`));
-      } else {
-        try {
-          const result = JSON.parse(stdout);
-          resolve(result);
-        } catch (e) {
-          resolve({ success: true, output: stdout });
-        }
-      }
-    });
-  });
+  const options = {};
+  if (args.includes('--parallele')) {
+    options.parallele = true;
+  }
+  const [methodName, ...methodArgs] = args.filter((arg) => arg !== '--parallele');
+  return pythonWorkerPool.generer(pythonGenerators[scriptName], methodName, methodArgs, options);
 }
 
 /**
@@ -487,7 +470,8 @@ router.post('/phase/preparation/:sessionId', async (req, res) => {
     
     const result = await callPythonGenerator('templateDocumentGenerator.py', [
       'generer_phase_preparation',
-      sessionId
+      sessionId,
+      '--parallele'
     ]);
     
     if (result.success) {
@@ -523,7 +507,8 @@ router.post('/phase/convocation/:sessionId', async (req, res) => {
     
     const result = await callPythonGenerator('templateDocumentGenerator.py', [
       'generer_phase_convocation',
-      sessionId
+      sessionId,
+      '--parallele'
     ]);
     
     if (result.success) {
@@ -559,7 +544,8 @@ router.post('/phase/evaluation-chaud/:sessionId', async (req, res) => {
     
     const result = await callPythonGenerator('templateDocumentGenerator.py', [
       'generer_phase_evaluation_chaud',
-      sessionId
+      sessionId,
+      '--parallele'
     ]);
     
     if (result.success) {
@@ -595,7 +581,8 @@ router.post('/phase/cloture/:sessionId', async (req, res) => {
     
     const result = await callPythonGenerator('templateDocumentGenerator.py', [
       'generer_phase_cloture',
-      sessionId
+      sessionId,
+      '--parallele'
     ]);
     
     if (result.success) {
@@ -631,7 +618,8 @@ router.post('/phase/evaluation-froid/:sessionId', async (req, res) => {
     
     const result = await callPythonGenerator('templateDocumentGenerator.py', [
       'generer_phase_evaluation_froid',
-      sessionId
+      sessionId,
+      '--parallele'
     ]);
     
     if (result.success) {
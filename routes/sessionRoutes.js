@@ -1,6 +1,7 @@
 const express = require('express');
 const router = express.Router();
 const supabaseService = require('../services/supabaseService');
+const pythonWorkerPool = require('../services/pythonWorkerPool');
 // const pdfGenerator = require('../services/pdfGenerator'); // Désactivé - On utilise Python pour générer les documents Word
 
 // ============================================
@@ -149,48 +150,13 @@ router.post('/sessions/:id/generate-and-send-proposition', async (req, res) => {
     }
 
     // Appeler le générateur Python pour créer les PDFs
-    const { spawn } = require('child_process');
-    const path = require('path');
     const fs = require('fs').promises;
     
-    const pythonPath = process.env.PYTHON_PATH || 'python3';
-    const scriptPath = path.join(__dirname, '..', 'services', 'documentGenerator.py');
-    
     console.log('[generate-and-send-proposition] Appel Python pour génération PDFs');
     
-    // Générer les documents via Python
+    // Générer les documents via le pool de workers Python
     const generateDocuments = () => {
-      return new Promise((resolve, reject) => {
-        const pythonProcess = spawn(pythonPath, [
-          scriptPath,
-          'generer_phase_proposition',
-          id
-        ]);
-        
-        let stdout = '';
-        let stderr = '';
-        
-        pythonProcess.stdout.on('data', (data) => {
-          stdout += data.toString();
-        });
-        
-        pythonProcess.stderr.on('data', (data) => {
-          stderr += data.toString();
-        });
-        
-        pythonProcess.on('close', (code) => {
-          if (code !== 0) {
-            reject(new Error(`Erreur Python (code ${code}): ${stderr}`));
-          } else {
-            try {
-              const result = JSON.parse(stdout);
-              resolve(result);
-            } catch (e) {
-              reject(new Error(`Erreur parsing JSON: ${e.message}\nOutput: ${stdout}`));
-            }
-          }
-        });
-      });
+      return pythonWorkerPool.generer('qualiopi', 'generer_phase_proposition', [id]);
     };
 
     let generationResult;
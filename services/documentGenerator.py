@@ -6,37 +6,71 @@ Date: 8 octobre 2025
 Version: 1.0
 """
 
+import io
 import os
 from datetime import datetime, timedelta
 from docx import Document
 from docx.shared import Pt, Inches, RGBColor
 from docx.enum.text import WD_ALIGN_PARAGRAPH
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, PageBreak, Flowable
 import json
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple, Union
+
+from documentRendu import DocumentRendu, TYPE_PDF, document_publie, empreinte_entrees
+from documentStyles import get_styles
+from sessionContext import COLONNES_PARTICIPANT
+
+# Version du rendu, intégrée à l'empreinte des documents : à incrémenter quand
+# la mise en page change, pour forcer la régénération
+VERSION_RENDU = 1
+
+class DebutParticipant(Flowable):
+    """Repère invisible : note la page où commence le contenu d'un participant"""
+
+    def __init__(self, participant_id: str, premieres_pages: Dict[str, int]):
+        super().__init__()
+        self.participant_id = participant_id
+        self.premieres_pages = premieres_pages
+
+    def wrap(self, largeur_dispo, hauteur_dispo):
+        return 0, 0
+
+    def draw(self):
+        self.premieres_pages[self.participant_id] = self.canv.getPageNumber()
+
 
 class QualiopisDocumentGenerator:
     """Générateur de documents Qualiopi"""
     
-    def __init__(self, supabase_client):
+    # Documents par participant disponibles en mode combiné :
+    # type -> (méthode de contenu, nom du fichier individuel)
+    DOCUMENTS_PARTICIPANT = {
+        'convocation': ('_contenu_convocation', 'convocation_{participant_id}.pdf'),
+        'certificat_realisation': ('_contenu_certificat_realisation', 'certificat_realisation_{participant_id}.pdf'),
+    }
+
+    def __init__(self, supabase_client, output_dir: Optional[str] = "generated_documents",
+                 incremental: bool = True):
         """
         Initialise le générateur de documents
         
         Args:
             supabase_client: Client Supabase pour accéder aux données
+            output_dir: Dossier où écrire les documents (None : rendu en mémoire uniquement)
+            incremental: Renvoyer le document déjà publié (table documents) quand ses
+                entrées (lignes session, organisme, participant) n'ont pas changé
         """
         self.supabase = supabase_client
-        self.output_dir = "generated_documents"
+        self.output_dir = output_dir
+        self.incremental = incremental
+        self.inchanges: List[str] = []
         self.ensure_output_dir()
         
     def ensure_output_dir(self):
         """Crée le dossier de sortie s'il n'existe pas"""
-        if not os.path.exists(self.output_dir):
+        if self.output_dir and not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
     
     # ============================================
@@ -59,7 +93,7 @@ class QualiopisDocumentGenerator:
     
     def get_participants(self, session_id: str) -> List[Dict]:
         """Récupère la liste des participants d'une session"""
-        response = self.supabase.table('participants').select('*').eq('session_formation_id', session_id).execute()
+        response = self.supabase.table('participants').select(COLONNES_PARTICIPANT).eq('session_formation_id', session_id).execute()
         return response.data
     
     def format_date(self, date_str: str) -> str:
@@ -73,6 +107,63 @@ class QualiopisDocumentGenerator:
         """Formate un prix en euros"""
         return f"{prix:,.2f} €".replace(',', ' ')
     
+    def _finaliser(self, nom_fichier: str, buffer: io.BytesIO, type_document: str,
+                   **metadata) -> Union[str, DocumentRendu]:
+        """
+        Termine un rendu : écrit le PDF dans le dossier de sortie s'il est défini
+
+        Returns:
+            Chemin du fichier, ou DocumentRendu si aucun dossier de sortie n'est défini
+        """
+        rendu = DocumentRendu(nom_fichier, buffer.getvalue(), TYPE_PDF, type_document, metadata)
+        if self.output_dir:
+            return rendu.enregistrer(self.output_dir)
+        return rendu
+
+    def _deja_publie(self, nom_fichier: str, type_document: str,
+                     *entrees) -> Tuple[str, Union[str, DocumentRendu, None]]:
+        """
+        Empreinte des entrées d'un document et, en mode incrémental, le document
+        déjà publié avec la même empreinte (renvoyé sans nouveau rendu)
+
+        Args:
+            nom_fichier: Nom du fichier à produire
+            type_document: Type de document
+            *entrees: Données lues pour le rendu (session, organisme, participant...)
+
+        Returns:
+            (empreinte, chemin ou DocumentRendu existant, ou None s'il faut rendre le document)
+        """
+        empreinte = empreinte_entrees({'entrees': entrees}, type_document, str(VERSION_RENDU))
+        if not self.incremental or self.supabase is None:
+            return empreinte, None
+        existant = document_publie(self.supabase, empreinte, TYPE_PDF)
+        if existant is None:
+            return empreinte, None
+        existant.nom_fichier = nom_fichier
+        self.inchanges.append(nom_fichier)
+        if self.output_dir:
+            return empreinte, existant.enregistrer(self.output_dir)
+        return empreinte, existant
+
+    def rendre(self, methode: str, *args, **kwargs) -> DocumentRendu:
+        """
+        Génère un document en mémoire, sans l'écrire sur disque
+
+        Args:
+            methode: Nom de la méthode de génération (ex: 'generer_convocation')
+            *args, **kwargs: Arguments de la méthode
+
+        Returns:
+            DocumentRendu (contenu PDF et métadonnées)
+        """
+        output_dir = self.output_dir
+        self.output_dir = None
+        try:
+            return getattr(self, methode)(*args, **kwargs)
+        finally:
+            self.output_dir = output_dir
+
     # ============================================
     # 1. PROPOSITION DE FORMATION (DEVIS)
     # ============================================
@@ -82,20 +173,18 @@ class QualiopisDocumentGenerator:
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        filename = f"{self.output_dir}/proposition_formation_{session_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"proposition_formation_{session_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'proposition_formation', session, organisme)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
         # Style personnalisé
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
+        title_style = styles['Titre']
         
         # En-tête
         story.append(Paragraph(f"<b>{organisme['nom']}</b>", title_style))
@@ -116,15 +205,7 @@ class QualiopisDocumentGenerator:
             ['Téléphone', session.get('entreprise_telephone', 'N/A') or 'N/A']
         ]
         table = Table(entreprise_data, colWidths=[5*cm, 12*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        table.setStyle(styles.tableau('cle_valeur'))
         story.append(table)
         story.append(Spacer(1, 0.5*cm))
         
@@ -139,15 +220,7 @@ class QualiopisDocumentGenerator:
             ['Nombre de participants', str(session.get('nombre_participants', 'N/A'))]
         ]
         table = Table(formation_data, colWidths=[5*cm, 12*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        table.setStyle(styles.tableau('cle_valeur'))
         story.append(table)
         story.append(Spacer(1, 0.5*cm))
         
@@ -174,7 +247,7 @@ class QualiopisDocumentGenerator:
         story.append(Paragraph(f"<i>Proposition valable 30 jours - {organisme['nom']}</i>", styles['Normal']))
         
         doc.build(story)
-        return filename
+        return self._finaliser(nom_fichier, buffer, 'proposition_formation', session_id=session_id, empreinte_entrees=empreinte)
     
     # ============================================
     # 2. CONVENTION DE FORMATION
@@ -185,19 +258,17 @@ class QualiopisDocumentGenerator:
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        filename = f"{self.output_dir}/convention_formation_{session_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"convention_formation_{session_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'convention_formation', session, organisme)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        title_style = styles['TitreMoyen']
         
         # Titre
         story.append(Paragraph("<b>CONVENTION DE FORMATION PROFESSIONNELLE</b>", title_style))
@@ -308,17 +379,11 @@ class QualiopisDocumentGenerator:
             ['', '']
         ]
         table = Table(signatures_data, colWidths=[8.5*cm, 8.5*cm], rowHeights=[0.8*cm, 0.8*cm, 0.8*cm, 2*cm])
-        table.setStyle(TableStyle([
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 2), (-1, -1), 1, colors.black)
-        ]))
+        table.setStyle(styles.tableau('signatures'))
         story.append(table)
         
         doc.build(story)
-        return filename
+        return self._finaliser(nom_fichier, buffer, 'convention_formation', session_id=session_id, empreinte_entrees=empreinte)
     
     # ============================================
     # 3. PROGRAMME DE FORMATION
@@ -329,19 +394,17 @@ class QualiopisDocumentGenerator:
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        filename = f"{self.output_dir}/programme_formation_{session_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"programme_formation_{session_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'programme_formation', session, organisme)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
+        title_style = styles['Titre']
         
         # En-tête
         story.append(Paragraph(f"<b>{organisme['nom']}</b>", title_style))
@@ -364,14 +427,7 @@ class QualiopisDocumentGenerator:
             ['Délai d\'accès', session.get('formation_delai_acces', '2 semaines')]
         ]
         table = Table(infos_data, colWidths=[5*cm, 12*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
-            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black)
-        ]))
+        table.setStyle(styles.tableau('cle_valeur'))
         story.append(table)
         story.append(Spacer(1, 0.5*cm))
         
@@ -414,7 +470,7 @@ class QualiopisDocumentGenerator:
         story.append(Paragraph(f"<b>Contact :</b> {organisme['email']} - {organisme['telephone']}", styles['Normal']))
         
         doc.build(story)
-        return filename
+        return self._finaliser(nom_fichier, buffer, 'programme_formation', session_id=session_id, empreinte_entrees=empreinte)
     
     # ============================================
     # 4. CONVOCATION
@@ -426,24 +482,27 @@ class QualiopisDocumentGenerator:
         organisme = self.get_organisme_data()
         
         # Récupérer les données du participant
-        response = self.supabase.table('participants').select('*').eq('id', participant_id).execute()
+        response = self.supabase.table('participants').select(COLONNES_PARTICIPANT).eq('id', participant_id).execute()
         if not response.data:
             raise ValueError(f"Participant {participant_id} non trouvé")
         participant = response.data[0]
         
-        filename = f"{self.output_dir}/convocation_{participant_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"convocation_{participant_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'convocation', session, organisme, participant)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
+        doc.build(self._contenu_convocation(session, organisme, participant))
+        return self._finaliser(nom_fichier, buffer, 'convocation', session_id=session_id, participant_id=participant_id, empreinte_entrees=empreinte)
+
+    def _contenu_convocation(self, session: Dict, organisme: Dict, participant: Dict) -> List:
+        """Contenu de la convocation d'un participant (document seul ou combiné)"""
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
+        title_style = styles['Titre']
         
         # En-tête
         story.append(Paragraph(f"<b>{organisme['nom']}</b>", title_style))
@@ -486,8 +545,7 @@ class QualiopisDocumentGenerator:
         """
         story.append(Paragraph(corps_text, styles['Normal']))
         
-        doc.build(story)
-        return filename
+        return story
     
     # ============================================
     # 5. FEUILLE D'ÉMARGEMENT
@@ -502,19 +560,17 @@ class QualiopisDocumentGenerator:
         if not date_emargement:
             date_emargement = session['date_debut']
         
-        filename = f"{self.output_dir}/feuille_emargement_{session_id}_{date_emargement}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"feuille_emargement_{session_id}_{date_emargement}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'feuille_emargement', session, organisme, participants, date_emargement)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=14,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        title_style = styles['TitrePetit']
         
         # En-tête
         story.append(Paragraph(f"<b>FEUILLE D'ÉMARGEMENT</b>", title_style))
@@ -554,18 +610,7 @@ class QualiopisDocumentGenerator:
         ])
         
         table = Table(emargement_data, colWidths=[1.5*cm, 5*cm, 5*cm, 4*cm, 4*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#003366')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 9),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('TOPPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
-            ('FONTNAME', (0, -1), (0, -1), 'Helvetica-Bold')
-        ]))
+        table.setStyle(styles.tableau('emargement'))
         story.append(table)
         story.append(Spacer(1, 0.5*cm))
         
@@ -578,7 +623,7 @@ class QualiopisDocumentGenerator:
         story.append(Paragraph(horaires_text, styles['Normal']))
         
         doc.build(story)
-        return filename
+        return self._finaliser(nom_fichier, buffer, 'feuille_emargement', session_id=session_id, empreinte_entrees=empreinte)
     
     # ============================================
     # 6. CERTIFICAT DE RÉALISATION
@@ -590,32 +635,29 @@ class QualiopisDocumentGenerator:
         organisme = self.get_organisme_data()
         
         # Récupérer les données du participant
-        response = self.supabase.table('participants').select('*').eq('id', participant_id).execute()
+        response = self.supabase.table('participants').select(COLONNES_PARTICIPANT).eq('id', participant_id).execute()
         if not response.data:
             raise ValueError(f"Participant {participant_id} non trouvé")
         participant = response.data[0]
         
-        filename = f"{self.output_dir}/certificat_realisation_{participant_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"certificat_realisation_{participant_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'certificat_realisation', session, organisme, participant)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
+        doc.build(self._contenu_certificat_realisation(session, organisme, participant))
+        return self._finaliser(nom_fichier, buffer, 'certificat_realisation', session_id=session_id, participant_id=participant_id, empreinte_entrees=empreinte)
+
+    def _contenu_certificat_realisation(self, session: Dict, organisme: Dict, participant: Dict) -> List:
+        """Contenu du certificat de réalisation d'un participant (document seul ou combiné)"""
         story = []
-        styles = getSampleStyleSheet()
-        
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=20,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
-        
-        subtitle_style = ParagraphStyle(
-            'Subtitle',
-            parent=styles['Normal'],
-            fontSize=14,
-            alignment=TA_CENTER,
-            spaceAfter=20
-        )
+        styles = get_styles()
+
+        title_style = styles['TitreCertificat']
+
+        subtitle_style = styles['SousTitre']
         
         # Espacements
         story.append(Spacer(1, 2*cm))
@@ -658,8 +700,71 @@ class QualiopisDocumentGenerator:
         """
         story.append(Paragraph(corps_text, styles['Normal']))
         
+        return story
+
+    # ============================================
+    # MODE COMBINÉ : UN PDF PAR SESSION
+    # ============================================
+
+    def generer_document_combine(self, type_document: str, session_id: str) -> Dict:
+        """
+        Génère un document par participant dans un seul PDF pour toute la session
+        (une plage de pages par participant) : un rendu et un upload au lieu de N
+
+        Args:
+            type_document: Type de document par participant (clé de DOCUMENTS_PARTICIPANT)
+            session_id: ID de la session
+
+        Returns:
+            Dict avec le chemin du PDF (ou le DocumentRendu en mémoire) et le manifeste
+            des pages par participant, pour extraire les fichiers individuels à la demande
+        """
+        if type_document not in self.DOCUMENTS_PARTICIPANT:
+            raise ValueError(f"Type de document non disponible en mode combiné: {type_document}")
+        methode_contenu, modele_nom = self.DOCUMENTS_PARTICIPANT[type_document]
+        contenu = getattr(self, methode_contenu)
+
+        session = self.get_session_data(session_id)
+        organisme = self.get_organisme_data()
+        participants = self.get_participants(session_id)
+        if not participants:
+            raise ValueError(f"Aucun participant pour la session {session_id}")
+
+        # Une seule story : repère de début puis contenu de chaque participant
+        premieres_pages = {}
+        story = []
+        for index, participant in enumerate(participants):
+            if index:
+                story.append(PageBreak())
+            story.append(DebutParticipant(participant['id'], premieres_pages))
+            story.extend(contenu(session, organisme, participant))
+
+        nom_fichier = f"{type_document}_session_{session_id}.pdf"
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         doc.build(story)
-        return filename
+
+        # Manifeste : chaque participant finit la page avant le début du suivant
+        pages = []
+        for index, participant in enumerate(participants):
+            suivant = participants[index + 1]['id'] if index + 1 < len(participants) else None
+            pages.append({
+                'participant_id': participant['id'],
+                'nom_fichier': modele_nom.format(participant_id=participant['id']),
+                'premiere_page': premieres_pages[participant['id']],
+                'derniere_page': premieres_pages[suivant] - 1 if suivant else doc.page
+            })
+
+        resultat = self._finaliser(nom_fichier, buffer, f"{type_document}_combine",
+                                   session_id=session_id, pages=pages)
+        return {
+            'success': True,
+            'type': type_document,
+            'nom_fichier': nom_fichier,
+            'path': resultat if isinstance(resultat, str) else None,
+            'document': resultat if isinstance(resultat, DocumentRendu) else None,
+            'pages': pages
+        }
     
     # ============================================
     # MÉTHODE PRINCIPALE : GÉNÉRER TOUS LES DOCUMENTS
@@ -821,6 +926,11 @@ if __name__ == "__main__":
             filepath = generator.generer_feuille_emargement(session_id)
             print(json.dumps({'success': True, 'filePath': filepath}))
         
+        elif methode == 'generer_document_combine':
+            # Type de document par participant en troisième argument (convocation par défaut)
+            resultat = generator.generer_document_combine(participant_id or 'convocation', session_id)
+            print(json.dumps({'success': True, 'filePath': resultat['path'], 'pages': resultat['pages']}))
+
         elif methode == 'generer_tous_documents_session':
             documents = generator.generer_tous_documents_session(session_id)
             print(json.dumps({'success': True, 'documents': documents}))
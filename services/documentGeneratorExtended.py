@@ -6,13 +6,14 @@ Date: 8 octobre 2025
 Version: 1.0
 """
 
+import io
+
 from documentGenerator import QualiopisDocumentGenerator
+from documentStyles import get_styles
+from sessionContext import COLONNES_PARTICIPANT
 from reportlab.lib.pagesizes import A4
-from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
 from reportlab.lib.units import cm
-from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, TableStyle, PageBreak, KeepTogether
-from reportlab.lib import colors
-from reportlab.lib.enums import TA_CENTER, TA_LEFT, TA_RIGHT
+from reportlab.platypus import SimpleDocTemplate, Paragraph, Spacer, Table, PageBreak, KeepTogether
 from datetime import datetime, timedelta
 from typing import Dict, List
 
@@ -20,6 +21,13 @@ from typing import Dict, List
 class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
     """Extension du générateur avec les 13 documents complémentaires"""
     
+    DOCUMENTS_PARTICIPANT = {
+        **QualiopisDocumentGenerator.DOCUMENTS_PARTICIPANT,
+        'questionnaire_prealable': ('_contenu_questionnaire_prealable', 'questionnaire_prealable_{participant_id}.pdf'),
+        'evaluation_a_chaud': ('_contenu_evaluation_a_chaud', 'evaluation_a_chaud_{participant_id}.pdf'),
+        'evaluation_a_froid': ('_contenu_evaluation_a_froid', 'evaluation_a_froid_{participant_id}.pdf'),
+    }
+
     # ============================================
     # 7. QUESTIONNAIRE PRÉALABLE
     # ============================================
@@ -29,24 +37,27 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        response = self.supabase.table('participants').select('*').eq('id', participant_id).execute()
+        response = self.supabase.table('participants').select(COLONNES_PARTICIPANT).eq('id', participant_id).execute()
         if not response.data:
             raise ValueError(f"Participant {participant_id} non trouvé")
         participant = response.data[0]
         
-        filename = f"{self.output_dir}/questionnaire_prealable_{participant_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"questionnaire_prealable_{participant_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'questionnaire_prealable', session, organisme, participant)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
+        doc.build(self._contenu_questionnaire_prealable(session, organisme, participant))
+        return self._finaliser(nom_fichier, buffer, 'questionnaire_prealable', session_id=session_id, participant_id=participant_id, empreinte_entrees=empreinte)
+
+    def _contenu_questionnaire_prealable(self, session: Dict, organisme: Dict, participant: Dict) -> List:
+        """Contenu du questionnaire préalable d'un participant (document seul ou combiné)"""
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        title_style = styles['TitreMoyen']
         
         # Titre
         story.append(Paragraph("<b>QUESTIONNAIRE PRÉALABLE À LA FORMATION</b>", title_style))
@@ -113,8 +124,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         story.append(Spacer(1, 1*cm))
         story.append(Paragraph(f"Date : ___/___/______   Signature : ", styles['Normal']))
         
-        doc.build(story)
-        return filename
+        return story
     
     # ============================================
     # 8. ÉVALUATION À CHAUD
@@ -125,24 +135,27 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        response = self.supabase.table('participants').select('*').eq('id', participant_id).execute()
+        response = self.supabase.table('participants').select(COLONNES_PARTICIPANT).eq('id', participant_id).execute()
         if not response.data:
             raise ValueError(f"Participant {participant_id} non trouvé")
         participant = response.data[0]
         
-        filename = f"{self.output_dir}/evaluation_a_chaud_{participant_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"evaluation_a_chaud_{participant_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'evaluation_a_chaud', session, organisme, participant)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
+        doc.build(self._contenu_evaluation_a_chaud(session, organisme, participant))
+        return self._finaliser(nom_fichier, buffer, 'evaluation_a_chaud', session_id=session_id, participant_id=participant_id, empreinte_entrees=empreinte)
+
+    def _contenu_evaluation_a_chaud(self, session: Dict, organisme: Dict, participant: Dict) -> List:
+        """Contenu de l'évaluation à chaud d'un participant (document seul ou combiné)"""
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        title_style = styles['TitreMoyen']
         
         # Titre
         story.append(Paragraph("<b>ÉVALUATION DE LA FORMATION À CHAUD</b>", title_style))
@@ -182,17 +195,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         ]
         
         table = Table(eval_data, colWidths=[8*cm, 1.5*cm, 1.5*cm, 1.5*cm, 1.5*cm, 1.5*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#003366')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey)
-        ]))
+        table.setStyle(styles.tableau('notation'))
         story.append(table)
         story.append(Spacer(1, 0.5*cm))
         
@@ -223,8 +226,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         story.append(Spacer(1, 0.5*cm))
         story.append(Paragraph("<i>Merci pour votre participation !</i>", styles['Normal']))
         
-        doc.build(story)
-        return filename
+        return story
     
     # ============================================
     # 9. ÉVALUATION À FROID
@@ -235,24 +237,27 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        response = self.supabase.table('participants').select('*').eq('id', participant_id).execute()
+        response = self.supabase.table('participants').select(COLONNES_PARTICIPANT).eq('id', participant_id).execute()
         if not response.data:
             raise ValueError(f"Participant {participant_id} non trouvé")
         participant = response.data[0]
         
-        filename = f"{self.output_dir}/evaluation_a_froid_{participant_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"evaluation_a_froid_{participant_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'evaluation_a_froid', session, organisme, participant)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
+        doc.build(self._contenu_evaluation_a_froid(session, organisme, participant))
+        return self._finaliser(nom_fichier, buffer, 'evaluation_a_froid', session_id=session_id, participant_id=participant_id, empreinte_entrees=empreinte)
+
+    def _contenu_evaluation_a_froid(self, session: Dict, organisme: Dict, participant: Dict) -> List:
+        """Contenu de l'évaluation à froid d'un participant (document seul ou combiné)"""
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        title_style = styles['TitreMoyen']
         
         # Titre
         story.append(Paragraph("<b>ÉVALUATION DE LA FORMATION À FROID</b>", title_style))
@@ -314,8 +319,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         story.append(Spacer(1, 0.5*cm))
         story.append(Paragraph("<i>Merci pour votre retour !</i>", styles['Normal']))
         
-        doc.build(story)
-        return filename
+        return story
     
     # ============================================
     # 10. RÈGLEMENT INTÉRIEUR
@@ -325,19 +329,17 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         """Génère le règlement intérieur"""
         organisme = self.get_organisme_data()
         
-        filename = f"{self.output_dir}/reglement_interieur.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = "reglement_interieur.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'reglement_interieur', organisme)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=18,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=30,
-            alignment=TA_CENTER
-        )
+        title_style = styles['Titre']
         
         # Titre
         story.append(Paragraph("<b>RÈGLEMENT INTÉRIEUR</b>", title_style))
@@ -416,7 +418,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         story.append(Paragraph(f"{organisme['representant_legal_fonction']}", styles['Normal']))
         
         doc.build(story)
-        return filename
+        return self._finaliser(nom_fichier, buffer, 'reglement_interieur', empreinte_entrees=empreinte)
     
     # ============================================
     # 11. QUESTIONNAIRE FORMATEUR
@@ -427,19 +429,17 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        filename = f"{self.output_dir}/questionnaire_formateur_{session_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"questionnaire_formateur_{session_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'questionnaire_formateur', session, organisme)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        title_style = styles['TitreMoyen']
         
         # Titre
         story.append(Paragraph("<b>BILAN FORMATEUR</b>", title_style))
@@ -502,7 +502,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         story.append(Paragraph(f"Date : ___/___/______   Signature : ", styles['Normal']))
         
         doc.build(story)
-        return filename
+        return self._finaliser(nom_fichier, buffer, 'questionnaire_formateur', session_id=session_id, empreinte_entrees=empreinte)
     
     # ============================================
     # 12. ÉVALUATION SATISFACTION CLIENT
@@ -513,19 +513,17 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        filename = f"{self.output_dir}/evaluation_satisfaction_client_{session_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"evaluation_satisfaction_client_{session_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'evaluation_satisfaction_client', session, organisme)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        title_style = styles['TitreMoyen']
         
         # Titre
         story.append(Paragraph("<b>ÉVALUATION SATISFACTION CLIENT</b>", title_style))
@@ -565,17 +563,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         ]
         
         table = Table(eval_data, colWidths=[8*cm, 1.5*cm, 1.5*cm, 1.5*cm, 1.5*cm, 1.5*cm])
-        table.setStyle(TableStyle([
-            ('BACKGROUND', (0, 0), (-1, 0), colors.HexColor('#003366')),
-            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
-            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
-            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-            ('FONTSIZE', (0, 0), (-1, -1), 10),
-            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
-            ('GRID', (0, 0), (-1, -1), 1, colors.black),
-            ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey)
-        ]))
+        table.setStyle(styles.tableau('notation'))
         story.append(table)
         story.append(Spacer(1, 0.5*cm))
         
@@ -610,7 +598,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         story.append(Paragraph(f"Date : ___/___/______   Signature : ", styles['Normal']))
         
         doc.build(story)
-        return filename
+        return self._finaliser(nom_fichier, buffer, 'evaluation_satisfaction_client', session_id=session_id, empreinte_entrees=empreinte)
     
     # ============================================
     # 13. ÉVALUATION OPCO
@@ -621,19 +609,17 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         session = self.get_session_data(session_id)
         organisme = self.get_organisme_data()
         
-        filename = f"{self.output_dir}/evaluation_opco_{session_id}.pdf"
-        doc = SimpleDocTemplate(filename, pagesize=A4)
+        nom_fichier = f"evaluation_opco_{session_id}.pdf"
+        empreinte, existant = self._deja_publie(nom_fichier, 'evaluation_opco', session, organisme)
+        if existant is not None:
+            return existant
+
+        buffer = io.BytesIO()
+        doc = SimpleDocTemplate(buffer, pagesize=A4, invariant=1)
         story = []
-        styles = getSampleStyleSheet()
+        styles = get_styles()
         
-        title_style = ParagraphStyle(
-            'CustomTitle',
-            parent=styles['Heading1'],
-            fontSize=16,
-            textColor=colors.HexColor('#003366'),
-            spaceAfter=20,
-            alignment=TA_CENTER
-        )
+        title_style = styles['TitreMoyen']
         
         # Titre
         story.append(Paragraph("<b>ÉVALUATION OPCO</b>", title_style))
@@ -702,7 +688,7 @@ class QualiopisDocumentGeneratorExtended(QualiopisDocumentGenerator):
         story.append(Paragraph(f"Date : ___/___/______   Signature : ", styles['Normal']))
         
         doc.build(story)
-        return filename
+        return self._finaliser(nom_fichier, buffer, 'evaluation_opco', session_id=session_id, empreinte_entrees=empreinte)
     
     # ============================================
     # 14-19. DOCUMENTS COMPLÉMENTAIRES
@@ -0,0 +1,141 @@
+"""
+Document Généré en Mémoire
+==========================
+Résultat d'un rendu (PDF ou Word) : contenu binaire et métadonnées.
+L'écriture dans un dossier de sortie n'est qu'une destination optionnelle.
+Date: 18 octobre 2026
+Version: 1.0
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime
+from typing import Dict, Optional
+
+TYPE_PDF = 'application/pdf'
+TYPE_DOCX = 'application/vnd.openxmlformats-officedocument.wordprocessingml.document'
+
+
+def empreinte_entrees(variables: Dict, *sources: str) -> str:
+    """
+    Empreinte des entrées d'un rendu : variables résolues et sources (hash du template...)
+
+    Deux rendus de même empreinte produisent le même document : le second peut être évité.
+
+    Args:
+        variables: Variables résolues du document
+        *sources: Autres entrées du rendu (empreinte du template, version du générateur)
+
+    Returns:
+        Empreinte SHA-256 hexadécimale
+    """
+    entrees = json.dumps([variables, sources], sort_keys=True, ensure_ascii=False, default=str)
+    return hashlib.sha256(entrees.encode('utf-8')).hexdigest()
+
+
+def document_publie(supabase_client, empreinte: str, type_mime: str,
+                    bucket: str = 'documents') -> Optional['DocumentRendu']:
+    """
+    Document déjà publié pour une empreinte d'entrées (documents.metadata->>empreinte_entrees)
+
+    Args:
+        supabase_client: Client Supabase (create_client)
+        empreinte: Empreinte des entrées du rendu
+        type_mime: Type MIME attendu (un .docx et sa version PDF partagent l'empreinte)
+        bucket: Bucket de stockage des documents
+
+    Returns:
+        DocumentRendu du fichier stocké (metadata : document_id, storage_path, empreinte_entrees),
+        ou None s'il n'existe pas ou ne peut pas être lu (le document sera rendu)
+    """
+    try:
+        reponse = supabase_client.table('documents').select(
+            'id,type,nom_fichier,storage_path,session_formation_id,participant_id'
+        ).eq('metadata->>empreinte_entrees', empreinte).eq('mime_type', type_mime).limit(1).execute()
+        if not reponse.data:
+            return None
+        ligne = reponse.data[0]
+        contenu = supabase_client.storage.from_(bucket).download(ligne['storage_path'])
+    except Exception as e:
+        print(f"Document publié illisible, nouveau rendu: {str(e)}")
+        return None
+    return DocumentRendu(ligne['nom_fichier'], contenu, type_mime, ligne.get('type'), {
+        'session_id': ligne.get('session_formation_id'),
+        'participant_id': ligne.get('participant_id'),
+        'document_id': ligne['id'],
+        'storage_path': ligne['storage_path'],
+        'empreinte_entrees': empreinte
+    })
+
+
+class DocumentRendu:
+    """Document généré, conservé en mémoire"""
+
+    def __init__(self, nom_fichier: str, contenu: bytes, type_mime: str,
+                 type_document: str = None, metadata: Optional[Dict] = None):
+        """
+        Args:
+            nom_fichier: Nom du fichier (ex: convocation_<participant_id>.pdf)
+            contenu: Contenu binaire du document
+            type_mime: Type MIME du contenu (TYPE_PDF, TYPE_DOCX)
+            type_document: Type de document (ex: convocation, certificat_realisation)
+            metadata: Informations complémentaires (session, participant, template...)
+        """
+        self.nom_fichier = nom_fichier
+        self.contenu = contenu
+        self.type_mime = type_mime
+        self.type_document = type_document
+        self.metadata = metadata or {}
+        self.date_generation = datetime.now().isoformat()
+
+        # Renseigné uniquement si le document est écrit sur disque
+        self.chemin: Optional[str] = None
+
+    @property
+    def taille(self) -> int:
+        """Taille du contenu en octets"""
+        return len(self.contenu)
+
+    @property
+    def sha256(self) -> str:
+        """
+        Empreinte SHA-256 du contenu (clé de stockage par contenu)
+
+        Les PDF reportlab sont générés avec invariant=1 : sans date de création
+        ni identifiant aléatoire, un même document donne les mêmes octets.
+        """
+        return hashlib.sha256(self.contenu).hexdigest()
+
+    def enregistrer(self, dossier: str) -> str:
+        """
+        Écrit le document dans un dossier
+
+        Args:
+            dossier: Dossier de destination (créé si nécessaire)
+
+        Returns:
+            Chemin du fichier écrit
+        """
+        os.makedirs(dossier, exist_ok=True)
+        chemin = os.path.join(dossier, self.nom_fichier)
+        with open(chemin, 'wb') as f:
+            f.write(self.contenu)
+        self.chemin = chemin
+        return chemin
+
+    def to_dict(self) -> Dict:
+        """Métadonnées du document, sans le contenu binaire (sérialisable en JSON)"""
+        return {
+            'nom_fichier': self.nom_fichier,
+            'type_mime': self.type_mime,
+            'type_document': self.type_document,
+            'taille': self.taille,
+            'sha256': self.sha256,
+            'date_generation': self.date_generation,
+            'chemin': self.chemin,
+            'metadata': self.metadata
+        }
+
+    def __repr__(self):
+        return f"DocumentRendu({self.nom_fichier}, {self.taille} octets)"
@@ -0,0 +1,138 @@
+"""
+Registre des Styles des Documents PDF
+=====================================
+Styles reportlab (titres, sous-titres, tableaux) construits une seule fois par
+processus et partagés par toutes les méthodes generer_* : un seul endroit pour
+régler l'apparence des documents Qualiopi
+Date: 18 octobre 2026
+Version: 1.0
+"""
+
+from types import MappingProxyType
+from typing import Dict
+
+from reportlab.lib import colors
+from reportlab.lib.enums import TA_CENTER
+from reportlab.lib.styles import ParagraphStyle, getSampleStyleSheet
+from reportlab.platypus import TableStyle
+
+# Couleur principale des documents
+BLEU_QUALIOPI = colors.HexColor('#003366')
+
+
+def _titre(base, taille: int, espace_apres: int) -> ParagraphStyle:
+    """Titre centré en bleu"""
+    return ParagraphStyle(
+        'CustomTitle',
+        parent=base['Heading1'],
+        fontSize=taille,
+        textColor=BLEU_QUALIOPI,
+        spaceAfter=espace_apres,
+        alignment=TA_CENTER
+    )
+
+
+def _styles_paragraphes() -> Dict[str, ParagraphStyle]:
+    """Styles de la feuille reportlab (Normal, Heading2...) et styles des documents"""
+    base = getSampleStyleSheet()
+    styles = {nom: base[nom] for nom in base.byName}
+    styles.update({
+        # Proposition, programme, convocation, règlement intérieur
+        'Titre': _titre(base, 18, 30),
+        # Convention, questionnaires et évaluations
+        'TitreMoyen': _titre(base, 16, 20),
+        # Feuille d'émargement
+        'TitrePetit': _titre(base, 14, 20),
+        # Certificat de réalisation
+        'TitreCertificat': _titre(base, 20, 30),
+        'SousTitre': ParagraphStyle(
+            'Subtitle',
+            parent=base['Normal'],
+            fontSize=14,
+            alignment=TA_CENTER,
+            spaceAfter=20
+        ),
+    })
+    return styles
+
+
+def _styles_tableaux() -> Dict[str, TableStyle]:
+    """Styles des tableaux des documents"""
+    return {
+        # Tableau libellé / valeur (libellés en gras sur fond gris)
+        'cle_valeur': TableStyle([
+            ('BACKGROUND', (0, 0), (0, -1), colors.lightgrey),
+            ('TEXTCOLOR', (0, 0), (-1, -1), colors.black),
+            ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (0, -1), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black)
+        ]),
+        # Bloc de signatures (en-têtes sans bordure)
+        'signatures': TableStyle([
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 2), (-1, -1), 1, colors.black)
+        ]),
+        # Feuille d'émargement (en-tête bleu, ligne formateur en gris)
+        'emargement': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), BLEU_QUALIOPI),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (0, 0), (-1, -1), 'CENTER'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 9),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('TOPPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, -1), (-1, -1), colors.lightgrey),
+            ('FONTNAME', (0, -1), (0, -1), 'Helvetica-Bold')
+        ]),
+        # Grille de notation 1 à 5 des évaluations
+        'notation': TableStyle([
+            ('BACKGROUND', (0, 0), (-1, 0), BLEU_QUALIOPI),
+            ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+            ('ALIGN', (1, 0), (-1, -1), 'CENTER'),
+            ('ALIGN', (0, 0), (0, -1), 'LEFT'),
+            ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+            ('FONTSIZE', (0, 0), (-1, -1), 10),
+            ('BOTTOMPADDING', (0, 0), (-1, -1), 12),
+            ('GRID', (0, 0), (-1, -1), 1, colors.black),
+            ('BACKGROUND', (0, 1), (0, -1), colors.lightgrey)
+        ]),
+    }
+
+
+class RegistreStyles:
+    """Styles de paragraphe et de tableau partagés, en lecture seule"""
+
+    def __init__(self):
+        self.paragraphes = MappingProxyType(_styles_paragraphes())
+        self.tableaux = MappingProxyType(_styles_tableaux())
+
+    def __getitem__(self, nom: str) -> ParagraphStyle:
+        """Style de paragraphe (ex: styles['Normal'], styles['Titre'])"""
+        return self.paragraphes[nom]
+
+    def tableau(self, nom: str) -> TableStyle:
+        """Style de tableau (cle_valeur, signatures, emargement, notation)"""
+        return self.tableaux[nom]
+
+
+# Singleton : les styles sont construits une seule fois par processus
+_registre_styles = None
+
+
+def get_styles() -> RegistreStyles:
+    """
+    Récupère le registre des styles du processus (singleton)
+
+    Returns:
+        RegistreStyles: Instance partagée (ne pas modifier les styles)
+    """
+    global _registre_styles
+    if _registre_styles is None:
+        _registre_styles = RegistreStyles()
+    return _registre_styles
@@ -0,0 +1,224 @@
+"""
+Worker Python de Génération de Documents
+========================================
+Processus longue durée piloté par le serveur Node (services/pythonWorkerPool.js).
+Protocole : JSON-RPC 2.0, un message JSON par ligne sur stdin / stdout.
+Les générateurs, le cache de templates et le client Supabase restent chargés
+entre deux requêtes.
+
+Méthodes :
+    generer  {"generateur": "template" | "qualiopi", "methode": "...", "args": [...], "options": {...},
+              "forcer": false, "pdf": false}
+    ping     Contrôle de santé (pid, nombre de requêtes, cache de templates)
+    arreter  Termine le worker après avoir répondu
+Date: 18 octobre 2026
+Version: 1.0
+"""
+
+import json
+import os
+import sys
+import time
+import traceback
+from typing import Dict
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from dotenv import load_dotenv
+from supabase import create_client
+
+from templateCache import get_template_cache
+
+# Codes d'erreur JSON-RPC
+ERREUR_PARSE = -32700
+ERREUR_REQUETE = -32600
+ERREUR_METHODE = -32601
+ERREUR_PARAMETRES = -32602
+ERREUR_GENERATION = -32000
+
+
+class ErreurRPC(Exception):
+    """Erreur renvoyée au client avec un code JSON-RPC"""
+
+    def __init__(self, code: int, message: str):
+        super().__init__(message)
+        self.code = code
+
+
+class DocumentWorker:
+    """Exécute les requêtes de génération en gardant les générateurs chargés"""
+
+    def __init__(self, supabase_client):
+        """
+        Args:
+            supabase_client: Client Supabase partagé par tous les générateurs
+        """
+        self.supabase = supabase_client
+        self._generateurs = {}
+        self.demarrage = time.time()
+        self.requetes = 0
+        self.erreurs = 0
+        self.arret = False
+
+    def get_generateur(self, nom: str):
+        """Retourne le générateur demandé, créé à la première utilisation"""
+        if nom not in self._generateurs:
+            if nom == 'template':
+                from templateDocumentGenerator import TemplateDocumentGenerator
+                self._generateurs[nom] = TemplateDocumentGenerator(self.supabase)
+            elif nom == 'qualiopi':
+                from documentGeneratorExtended import QualiopisDocumentGeneratorExtended
+                self._generateurs[nom] = QualiopisDocumentGeneratorExtended(self.supabase)
+            else:
+                raise ErreurRPC(ERREUR_PARAMETRES, f'Générateur inconnu: {nom}')
+        return self._generateurs[nom]
+
+    # ============================================
+    # MÉTHODES RPC
+    # ============================================
+
+    def generer(self, params: Dict):
+        """
+        Appelle une méthode de génération
+
+        Le résultat a la même forme que la sortie des scripts en ligne de commande :
+        un chemin est renvoyé dans {'success': True, 'filePath': ...}, un dictionnaire
+        (méthodes par phase, generer_tous_documents_session) est renvoyé tel quel.
+        """
+        generateur = self.get_generateur(params.get('generateur', 'template'))
+        methode = params.get('methode')
+        if not methode or methode.startswith('_') or not hasattr(generateur, methode):
+            raise ErreurRPC(ERREUR_METHODE, f'Méthode {methode} non trouvée')
+
+        args = params.get('args') or []
+        options = params.get('options') or {}
+
+        # Les avertissements ne concernent que la requête en cours
+        if hasattr(generateur, 'avertissements'):
+            generateur.avertissements = []
+
+        # "forcer" : régénérer même les documents dont les entrées n'ont pas changé
+        if hasattr(generateur, 'incremental'):
+            generateur.incremental = not params.get('forcer', False)
+
+        # "pdf" : ajouter la version PDF des documents Word (pool soffice gardé entre deux requêtes)
+        if hasattr(generateur, 'convertisseur_pdf'):
+            from docxPdfConverter import get_convertisseur_pdf
+            generateur.convertisseur_pdf = get_convertisseur_pdf() if params.get('pdf') else None
+
+        try:
+            resultat = getattr(generateur, methode)(*args, **options)
+        except ErreurRPC:
+            raise
+        except Exception as e:
+            raise ErreurRPC(ERREUR_GENERATION, str(e))
+
+        avertissements = getattr(generateur, 'avertissements', [])
+        if isinstance(resultat, str):
+            return {
+                'success': True,
+                'filePath': resultat,
+                'avertissements': avertissements
+            }
+        if methode == 'generer_tous_documents_session':
+            return {
+                'success': True,
+                'documents': resultat,
+                'avertissements': avertissements
+            }
+        return resultat
+
+    def ping(self, params: Dict) -> Dict:
+        """Contrôle de santé"""
+        return {
+            'pid': os.getpid(),
+            'uptime': round(time.time() - self.demarrage, 1),
+            'requetes': self.requetes,
+            'erreurs': self.erreurs,
+            'generateurs': sorted(self._generateurs),
+            'cache_templates': get_template_cache().statistiques()
+        }
+
+    def arreter(self, params: Dict) -> Dict:
+        """Demande l'arrêt du worker après la réponse"""
+        self.arret = True
+        return {'arret': True}
+
+    # ============================================
+    # BOUCLE PRINCIPALE
+    # ============================================
+
+    def traiter(self, ligne: str) -> Dict:
+        """Traite une ligne JSON-RPC et retourne la réponse"""
+        try:
+            requete = json.loads(ligne)
+        except ValueError as e:
+            return {'jsonrpc': '2.0', 'id': None, 'error': {'code': ERREUR_PARSE, 'message': str(e)}}
+
+        id_requete = requete.get('id') if isinstance(requete, dict) else None
+        try:
+            if not isinstance(requete, dict) or not isinstance(requete.get('method'), str):
+                raise ErreurRPC(ERREUR_REQUETE, 'Requête JSON-RPC invalide')
+
+            methodes = {'generer': self.generer, 'ping': self.ping, 'arreter': self.arreter}
+            if requete['method'] not in methodes:
+                raise ErreurRPC(ERREUR_METHODE, f"Méthode RPC inconnue: {requete['method']}")
+
+            self.requetes += 1
+            resultat = methodes[requete['method']](requete.get('params') or {})
+            return {'jsonrpc': '2.0', 'id': id_requete, 'result': resultat}
+
+        except ErreurRPC as e:
+            self.erreurs += 1
+            return {'jsonrpc': '2.0', 'id': id_requete, 'error': {'code': e.code, 'message': str(e)}}
+        except Exception as e:
+            self.erreurs += 1
+            traceback.print_exc(file=sys.stderr)
+            return {'jsonrpc': '2.0', 'id': id_requete, 'error': {'code': ERREUR_GENERATION, 'message': str(e)}}
+
+    def executer(self, entree, sortie):
+        """Lit les requêtes ligne par ligne jusqu'à la fin de l'entrée ou 'arreter'"""
+        for ligne in entree:
+            ligne = ligne.strip()
+            if not ligne:
+                continue
+
+            sortie.write(json.dumps(self.traiter(ligne), default=str) + '\n')
+            sortie.flush()
+
+            if self.arret:
+                break
+
+
+def main():
+    load_dotenv()
+
+    # stdout est réservé au protocole : les print() des générateurs partent sur stderr
+    sortie = sys.stdout
+    sys.stdout = sys.stderr
+
+    supabase_url = os.getenv('SUPABASE_URL')
+    supabase_key = os.getenv('SUPABASE_SERVICE_ROLE_KEY') or os.getenv('SUPABASE_KEY')
+    if not supabase_url or not supabase_key:
+        sortie.write(json.dumps({
+            'jsonrpc': '2.0',
+            'id': None,
+            'error': {
+                'code': ERREUR_GENERATION,
+                'message': 'Variables d\'environnement SUPABASE_URL et SUPABASE_KEY manquantes'
+            }
+        }) + '\n')
+        sortie.flush()
+        sys.exit(1)
+
+    worker = DocumentWorker(create_client(supabase_url, supabase_key))
+
+    # Signale au pool que le worker est prêt (imports et client chargés)
+    sortie.write(json.dumps({'jsonrpc': '2.0', 'method': 'pret', 'params': {'pid': os.getpid()}}) + '\n')
+    sortie.flush()
+
+    worker.executer(sys.stdin, sortie)
+
+
+if __name__ == "__main__":
+    main()
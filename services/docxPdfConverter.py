@@ -0,0 +1,619 @@
+"""
+Conversion des Documents Word en PDF
+====================================
+Pool de processus LibreOffice (soffice) headless gardés démarrés : une file de
+conversions partagée, un délai maximum par conversion (le processus bloqué est
+tué et relancé) et un recyclage périodique des processus. Tout reste local :
+chaque processus écoute sur un pipe nommé et travaille avec son propre profil.
+
+Les conversions passent par l'API UNO de LibreOffice :
+- mode uno : le module uno est importable dans ce processus ;
+- mode pilote : sinon, un client UNO longue durée tourne avec un interpréteur
+  Python qui dispose de uno (SOFFICE_PYTHON, Python fourni avec LibreOffice ou
+  python3 du système avec python3-uno) et reçoit les conversions sur stdin ;
+- mode ligne_commande : dernier recours sans aucun Python UNO, un soffice
+  --convert-to par conversion (profil préparé au démarrage), nettement plus lent.
+Date: 18 octobre 2026
+Version: 1.0
+"""
+
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import uuid
+from concurrent.futures import Future
+from pathlib import Path
+from typing import Dict, Optional, Union
+
+from documentRendu import DocumentRendu, TYPE_PDF
+
+try:
+    import uno
+except ImportError:
+    uno = None
+
+# Emplacements habituels de soffice (en plus du PATH et de SOFFICE_PATH)
+CHEMINS_SOFFICE = (
+    '/usr/bin/soffice',
+    '/usr/lib/libreoffice/program/soffice',
+    '/opt/libreoffice/program/soffice',
+    '/Applications/LibreOffice.app/Contents/MacOS/soffice',
+)
+
+MODE_UNO = 'uno'
+MODE_PILOTE = 'pilote'
+MODE_LIGNE_COMMANDE = 'ligne_commande'
+
+
+class ErreurConversion(Exception):
+    """Échec de la conversion d'un document en PDF"""
+
+
+class DelaiConversionDepasse(ErreurConversion):
+    """Conversion interrompue après le délai maximum (le processus soffice est relancé)"""
+
+
+def trouver_soffice() -> Optional[str]:
+    """
+    Cherche l'exécutable LibreOffice
+
+    Returns:
+        Chemin de soffice, ou None s'il n'est pas installé
+    """
+    candidats = [os.getenv('SOFFICE_PATH'), shutil.which('soffice'), shutil.which('libreoffice')]
+    for chemin in candidats + list(CHEMINS_SOFFICE):
+        if chemin and os.path.isfile(chemin) and os.access(chemin, os.X_OK):
+            return chemin
+    return None
+
+
+def trouver_python_uno(soffice: str) -> Optional[str]:
+    """
+    Cherche un interpréteur Python capable d'importer uno (client UNO du mode pilote)
+
+    Args:
+        soffice: Chemin de soffice (le Python fourni avec LibreOffice est à côté)
+
+    Returns:
+        Chemin de l'interpréteur, ou None
+    """
+    programme = os.path.dirname(os.path.realpath(soffice))
+    candidats = [
+        os.getenv('SOFFICE_PYTHON'),
+        os.path.join(programme, 'python'),
+        os.path.join(programme, '..', 'Resources', 'python'),
+        '/usr/bin/python3',
+        shutil.which('python3'),
+    ]
+    for python in dict.fromkeys(candidats):
+        if not python or not os.path.isfile(python) or not os.access(python, os.X_OK):
+            continue
+        try:
+            subprocess.run([python, '-c', 'import uno'], stdout=subprocess.DEVNULL,
+                           stderr=subprocess.DEVNULL, timeout=30, check=True)
+            return python
+        except (OSError, subprocess.SubprocessError):
+            continue
+    return None
+
+
+def rendu_pdf(rendu: DocumentRendu, contenu: bytes) -> DocumentRendu:
+    """
+    DocumentRendu PDF issu de la conversion d'un document Word
+
+    Args:
+        rendu: Document Word converti
+        contenu: Contenu du PDF
+
+    Returns:
+        DocumentRendu (même nom en .pdf, mêmes type et métadonnées)
+    """
+    nom_fichier = os.path.splitext(rendu.nom_fichier)[0] + '.pdf'
+    return DocumentRendu(nom_fichier, contenu, TYPE_PDF, rendu.type_document, dict(rendu.metadata))
+
+
+# ============================================
+# API UNO (DANS CE PROCESSUS OU DANS LE PILOTE)
+# ============================================
+
+def _proprietes(**valeurs):
+    """Tuple de PropertyValue UNO (options de chargement et d'export)"""
+    proprietes = []
+    for nom, valeur in valeurs.items():
+        propriete = uno.createUnoStruct('com.sun.star.beans.PropertyValue')
+        propriete.Name = nom
+        propriete.Value = valeur
+        proprietes.append(propriete)
+    return tuple(proprietes)
+
+
+def _connecter(pipe: str, delai: float, processus: Optional[subprocess.Popen] = None):
+    """
+    Se connecte au soffice qui écoute sur le pipe
+
+    Returns:
+        Desktop UNO du processus soffice
+    """
+    local = uno.getComponentContext()
+    resolveur = local.ServiceManager.createInstanceWithContext('com.sun.star.bridge.UnoUrlResolver', local)
+    limite = time.monotonic() + delai
+    while True:
+        try:
+            contexte = resolveur.resolve(f'uno:pipe,name={pipe};urp;StarOffice.ComponentContext')
+            break
+        except Exception:
+            # soffice n'écoute pas encore (premier démarrage : création du profil)
+            if (processus is not None and processus.poll() is not None) or time.monotonic() > limite:
+                raise ErreurConversion("Démarrage de LibreOffice impossible")
+            time.sleep(0.2)
+    return contexte.ServiceManager.createInstanceWithContext('com.sun.star.frame.Desktop', contexte)
+
+
+def _exporter_pdf(desktop, entree: str, sortie: str):
+    """Ouvre le document dans soffice et l'exporte en PDF"""
+    document = desktop.loadComponentFromURL(
+        Path(entree).as_uri(), '_blank', 0, _proprietes(Hidden=True, ReadOnly=True)
+    )
+    if document is None:
+        raise ErreurConversion("Document illisible par LibreOffice")
+    try:
+        document.storeToURL(Path(sortie).as_uri(), _proprietes(FilterName='writer_pdf_Export'))
+    finally:
+        document.close(True)
+
+
+def _pilote(pipe: str, delai: float):
+    """
+    Client UNO du mode pilote : une conversion par ligne JSON {"entree", "sortie"} sur stdin,
+    une réponse JSON par ligne sur stdout ; fin de stdin : arrêt de soffice
+    """
+    try:
+        desktop = _connecter(pipe, delai)
+    except ErreurConversion as e:
+        print(json.dumps({'erreur': str(e)}), flush=True)
+        return
+    print(json.dumps({'pret': True}), flush=True)
+
+    for ligne in sys.stdin:
+        tache = json.loads(ligne)
+        try:
+            _exporter_pdf(desktop, tache['entree'], tache['sortie'])
+            reponse = {'ok': True}
+        except ErreurConversion as e:
+            reponse = {'erreur': str(e)}
+        except Exception as e:
+            reponse = {'erreur': f"Erreur LibreOffice: {str(e)}", 'recycler': True}
+        print(json.dumps(reponse), flush=True)
+
+    try:
+        desktop.terminate()
+    except Exception:
+        pass
+
+
+# ============================================
+# TRAVAILLEUR : UN PROCESSUS SOFFICE
+# ============================================
+
+class TravailleurSoffice:
+    """Processus soffice headless avec son profil, relancé après N conversions ou un blocage"""
+
+    def __init__(self, soffice: str, mode: str = MODE_UNO, python_uno: str = None,
+                 delai_demarrage: float = 30, conversions_max: int = 200):
+        """
+        Args:
+            soffice: Chemin de l'exécutable soffice
+            mode: MODE_UNO, MODE_PILOTE ou MODE_LIGNE_COMMANDE
+            python_uno: Interpréteur Python du client UNO (mode pilote)
+            delai_demarrage: Secondes maximum pour que soffice accepte les connexions
+            conversions_max: Nombre de conversions avant recyclage du processus
+        """
+        self.soffice = soffice
+        self.mode = mode
+        self.python_uno = python_uno
+        self.delai_demarrage = delai_demarrage
+        self.conversions_max = conversions_max
+        self.dossier = tempfile.mkdtemp(prefix='soffice_')
+        self.profil = Path(self.dossier, 'profil').as_uri()
+        self.processus: Optional[subprocess.Popen] = None
+        self.pilote: Optional[subprocess.Popen] = None
+        self.desktop = None
+        self.profil_pret = False
+        self.conversions = 0
+        self.recyclages = 0
+
+    @property
+    def actif(self) -> bool:
+        """soffice démarré et toujours vivant (ainsi que son client UNO en mode pilote)"""
+        if self.mode == MODE_LIGNE_COMMANDE:
+            return self.profil_pret
+        if self.processus is None or self.processus.poll() is not None:
+            return False
+        return self.mode != MODE_PILOTE or (self.pilote is not None and self.pilote.poll() is None)
+
+    def demarrer(self):
+        """Démarre soffice et son client UNO (mode ligne_commande : prépare seulement le profil)"""
+        if self.actif:
+            return
+        if self.mode == MODE_LIGNE_COMMANDE:
+            self._preparer_profil()
+            return
+
+        pipe = f"qualiopi_soffice_{uuid.uuid4().hex}"
+        self.processus = subprocess.Popen(
+            [
+                self.soffice, '--headless', '--invisible', '--nologo', '--nodefault',
+                '--norestore', '--nolockcheck', f'-env:UserInstallation={self.profil}',
+                f'--accept=pipe,name={pipe};urp;StarOffice.ComponentContext'
+            ],
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL
+        )
+
+        try:
+            if self.mode == MODE_UNO:
+                self.desktop = _connecter(pipe, self.delai_demarrage, self.processus)
+            else:
+                self.pilote = subprocess.Popen(
+                    [self.python_uno, os.path.abspath(__file__), '--pilote', pipe, str(self.delai_demarrage)],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    text=True
+                )
+                reponse = json.loads(self.pilote.stdout.readline() or '{"erreur": "client UNO arrêté"}')
+                if not reponse.get('pret'):
+                    raise ErreurConversion(reponse.get('erreur', "Démarrage de LibreOffice impossible"))
+        except Exception:
+            self.arreter()
+            raise
+        self.conversions = 0
+
+    def _preparer_profil(self):
+        """Crée le profil LibreOffice une fois pour toutes (mode ligne_commande)"""
+        try:
+            subprocess.run(
+                [self.soffice, '--headless', '--terminate_after_init', f'-env:UserInstallation={self.profil}'],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=self.delai_demarrage
+            )
+        except subprocess.TimeoutExpired:
+            raise ErreurConversion("Préparation du profil LibreOffice trop longue")
+        self.profil_pret = True
+
+    def arreter(self):
+        """Ferme soffice (proprement si possible, sinon en tuant le processus)"""
+        if self.desktop is not None:
+            try:
+                self.desktop.terminate()
+            except Exception:
+                pass
+            self.desktop = None
+        if self.pilote is not None:
+            # Fin de stdin : le client UNO arrête soffice puis se termine
+            try:
+                self.pilote.stdin.close()
+                self.pilote.wait(timeout=5)
+            except (OSError, subprocess.TimeoutExpired):
+                self.pilote.kill()
+                self.pilote.wait()
+            self.pilote.stdout.close()
+            self.pilote = None
+        if self.processus is not None:
+            try:
+                self.processus.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.processus.kill()
+                self.processus.wait()
+            self.processus = None
+
+    def tuer(self):
+        """Tue soffice et son client UNO sans attendre (conversion bloquée)"""
+        for processus in (self.pilote, self.processus):
+            if processus is not None and processus.poll() is None:
+                processus.kill()
+
+    def recycler(self):
+        """Relance soffice (fuites mémoire, processus bloqué ou arrêté)"""
+        self.arreter()
+        self.recyclages += 1
+        self.demarrer()
+
+    def recycler_plus_tard(self):
+        """Tue soffice et le marque à relancer avant la prochaine conversion"""
+        self.tuer()
+        self.conversions = self.conversions_max
+
+    def convertir(self, contenu: bytes, extension: str, timeout: float) -> bytes:
+        """
+        Convertit un document en PDF
+
+        Args:
+            contenu: Contenu du document (.docx)
+            extension: Extension du document source
+            timeout: Secondes maximum pour la conversion
+
+        Returns:
+            Contenu du PDF
+        """
+        entree = os.path.join(self.dossier, f'document{extension}')
+        sortie = os.path.join(self.dossier, 'document.pdf')
+        with open(entree, 'wb') as f:
+            f.write(contenu)
+        if os.path.exists(sortie):
+            os.remove(sortie)
+
+        try:
+            if self.mode == MODE_LIGNE_COMMANDE:
+                self._convertir_ligne_commande(entree, timeout)
+            else:
+                self._convertir_uno(entree, sortie, timeout)
+        finally:
+            self.conversions += 1
+            os.remove(entree)
+
+        if not os.path.exists(sortie):
+            raise ErreurConversion("LibreOffice n'a pas produit de PDF")
+        with open(sortie, 'rb') as f:
+            return f.read()
+
+    def _convertir_uno(self, entree: str, sortie: str, timeout: float):
+        """Conversion par le soffice démarré (soffice et son client sont tués s'ils dépassent le délai)"""
+        if self.conversions >= self.conversions_max:
+            self.recycler()
+        elif not self.actif:
+            self.demarrer()
+
+        delai_depasse = threading.Event()
+
+        def interrompre():
+            delai_depasse.set()
+            self.tuer()
+
+        minuteur = threading.Timer(timeout, interrompre)
+        minuteur.start()
+        try:
+            if self.mode == MODE_UNO:
+                _exporter_pdf(self.desktop, entree, sortie)
+            else:
+                self._convertir_pilote(entree, sortie)
+        except ErreurConversion:
+            raise
+        except Exception as e:
+            # Processus tué ou connexion perdue : il sera relancé à la conversion suivante
+            self.recycler_plus_tard()
+            if delai_depasse.is_set():
+                raise DelaiConversionDepasse(f"Conversion interrompue après {timeout} s")
+            raise ErreurConversion(f"Erreur LibreOffice: {str(e)}")
+        finally:
+            minuteur.cancel()
+
+    def _convertir_pilote(self, entree: str, sortie: str):
+        """Envoie la conversion au client UNO et attend sa réponse"""
+        try:
+            self.pilote.stdin.write(json.dumps({'entree': entree, 'sortie': sortie}) + '\n')
+            self.pilote.stdin.flush()
+            ligne = self.pilote.stdout.readline()
+        except (OSError, ValueError) as e:
+            raise ConnectionError(f"client UNO indisponible ({str(e)})")
+        if not ligne:
+            raise ConnectionError("client UNO arrêté")
+        reponse = json.loads(ligne)
+        if reponse.get('recycler'):
+            raise RuntimeError(reponse['erreur'])
+        if reponse.get('erreur'):
+            raise ErreurConversion(reponse['erreur'])
+
+    def _convertir_ligne_commande(self, entree: str, timeout: float):
+        """Conversion par soffice --convert-to (sans client UNO), avec le profil du travailleur"""
+        try:
+            subprocess.run(
+                [
+                    self.soffice, '--headless', '--invisible', '--nologo', '--norestore',
+                    '--nolockcheck', f'-env:UserInstallation={self.profil}',
+                    '--convert-to', 'pdf', '--outdir', self.dossier, entree
+                ],
+                stdout=subprocess.DEVNULL,
+                stderr=subprocess.DEVNULL,
+                timeout=timeout,
+                check=True
+            )
+        except subprocess.TimeoutExpired:
+            raise DelaiConversionDepasse(f"Conversion interrompue après {timeout} s")
+        except subprocess.CalledProcessError as e:
+            raise ErreurConversion(f"soffice a échoué (code {e.returncode})")
+
+    def fermer(self):
+        """Arrête soffice et supprime le profil"""
+        self.arreter()
+        shutil.rmtree(self.dossier, ignore_errors=True)
+
+
+# ============================================
+# POOL DE CONVERSION
+# ============================================
+
+class ConvertisseurPdf:
+    """Pool de travailleurs soffice alimenté par une file de conversions"""
+
+    def __init__(self, workers: int = 2, timeout: float = 60, conversions_max: int = 200,
+                 soffice: str = None, delai_demarrage: float = 30, python_uno: str = None):
+        """
+        Args:
+            workers: Nombre de processus soffice
+            timeout: Secondes maximum par conversion
+            conversions_max: Conversions avant recyclage d'un processus soffice
+            soffice: Chemin de l'exécutable (par défaut : SOFFICE_PATH, PATH, emplacements habituels)
+            delai_demarrage: Secondes maximum pour le démarrage d'un processus soffice
+            python_uno: Interpréteur Python avec uno pour le client UNO, si uno n'est pas
+                importable ici (par défaut : SOFFICE_PYTHON, Python de LibreOffice, python3)
+        """
+        self.soffice = soffice or trouver_soffice()
+        if not self.soffice:
+            raise FileNotFoundError("LibreOffice (soffice) introuvable : installez-le ou définissez SOFFICE_PATH")
+
+        self.python_uno = None
+        if uno is not None:
+            self.mode = MODE_UNO
+        else:
+            self.python_uno = python_uno or trouver_python_uno(self.soffice)
+            self.mode = MODE_PILOTE if self.python_uno else MODE_LIGNE_COMMANDE
+        if self.mode == MODE_LIGNE_COMMANDE:
+            print(
+                "ATTENTION : aucun Python avec le module uno (python3-uno) n'a été trouvé. "
+                "Conversion PDF en mode dégradé : un processus soffice par document (plusieurs "
+                "secondes chacun). Installez python3-uno ou définissez SOFFICE_PYTHON.",
+                file=sys.stderr
+            )
+
+        self.timeout = timeout
+        self.file = queue.Queue()
+        self.conversions = 0
+        self.echecs = 0
+        self.delais_depasses = 0
+        self._lock = threading.Lock()
+        self._travailleurs = [
+            TravailleurSoffice(self.soffice, self.mode, self.python_uno, delai_demarrage, conversions_max)
+            for _ in range(workers)
+        ]
+        self._threads = [
+            threading.Thread(target=self._boucle, args=(travailleur,), daemon=True)
+            for travailleur in self._travailleurs
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def _boucle(self, travailleur: TravailleurSoffice):
+        """Traite les conversions de la file avec un travailleur (démarré à l'avance)"""
+        try:
+            travailleur.demarrer()
+        except Exception as e:
+            # Nouvel essai au démarrage de la première conversion
+            print(f"Erreur lors du démarrage de LibreOffice: {str(e)}", file=sys.stderr)
+
+        while True:
+            tache = self.file.get()
+            if tache is None:
+                break
+            future, contenu, extension, timeout = tache
+            if not future.set_running_or_notify_cancel():
+                continue
+            try:
+                pdf = travailleur.convertir(contenu, extension, timeout)
+            except Exception as e:
+                with self._lock:
+                    self.echecs += 1
+                    if isinstance(e, DelaiConversionDepasse):
+                        self.delais_depasses += 1
+                future.set_exception(e)
+            else:
+                with self._lock:
+                    self.conversions += 1
+                future.set_result(pdf)
+        travailleur.fermer()
+
+    def soumettre(self, source: Union[bytes, str, DocumentRendu], timeout: float = None) -> Future:
+        """
+        Ajoute une conversion à la file
+
+        Args:
+            source: Contenu .docx, chemin du fichier ou DocumentRendu
+            timeout: Délai maximum de la conversion (par défaut, celui du pool)
+
+        Returns:
+            Future dont le résultat est le contenu du PDF
+        """
+        extension = '.docx'
+        if isinstance(source, DocumentRendu):
+            extension = os.path.splitext(source.nom_fichier)[1] or extension
+            source = source.contenu
+        elif isinstance(source, str):
+            extension = os.path.splitext(source)[1] or extension
+            with open(source, 'rb') as f:
+                source = f.read()
+        future = Future()
+        self.file.put((future, source, extension, timeout or self.timeout))
+        return future
+
+    def convertir(self, source: Union[bytes, str, DocumentRendu], timeout: float = None) -> bytes:
+        """
+        Convertit un document en PDF (attend le résultat)
+
+        Returns:
+            Contenu du PDF
+
+        Raises:
+            ErreurConversion: Si la conversion échoue ou dépasse le délai
+        """
+        return self.soumettre(source, timeout).result()
+
+    def convertir_document(self, rendu: DocumentRendu, timeout: float = None) -> DocumentRendu:
+        """
+        Convertit un DocumentRendu Word en DocumentRendu PDF (mêmes type et métadonnées)
+        """
+        return rendu_pdf(rendu, self.convertir(rendu, timeout))
+
+    def statistiques(self) -> Dict:
+        """Retourne les compteurs du pool"""
+        with self._lock:
+            return {
+                'workers': len(self._travailleurs),
+                'mode': self.mode,
+                'en_attente': self.file.qsize(),
+                'conversions': self.conversions,
+                'echecs': self.echecs,
+                'delais_depasses': self.delais_depasses,
+                'recyclages': sum(travailleur.recyclages for travailleur in self._travailleurs)
+            }
+
+    def fermer(self):
+        """Termine les conversions en cours puis arrête les processus soffice"""
+        for _ in self._threads:
+            self.file.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.fermer()
+
+
+# Singleton : un seul pool soffice par processus
+_convertisseur_pdf = None
+_convertisseur_lock = threading.Lock()
+
+
+def get_convertisseur_pdf() -> ConvertisseurPdf:
+    """
+    Récupère le pool de conversion du processus (singleton, démarré au premier appel)
+
+    Le nombre de processus soffice et le délai maximum se règlent avec
+    SOFFICE_WORKERS et SOFFICE_TIMEOUT.
+
+    Returns:
+        ConvertisseurPdf: Instance partagée
+    """
+    global _convertisseur_pdf
+    with _convertisseur_lock:
+        if _convertisseur_pdf is None:
+            _convertisseur_pdf = ConvertisseurPdf(
+                workers=int(os.getenv('SOFFICE_WORKERS', '2')),
+                timeout=float(os.getenv('SOFFICE_TIMEOUT', '60'))
+            )
+            atexit.register(_convertisseur_pdf.fermer)
+        return _convertisseur_pdf
+
+
+if __name__ == "__main__":
+    # Client UNO du mode pilote, lancé par TravailleurSoffice avec un Python qui dispose de uno
+    if len(sys.argv) == 4 and sys.argv[1] == '--pilote':
+        _pilote(sys.argv[2], float(sys.argv[3]))
@@ -0,0 +1,200 @@
+"""
+Assemblage des Documents PDF
+============================
+Fusion de PDF déjà rendus (dossier de session pour l'audit) et découpage d'un
+PDF combiné selon son manifeste de pages (un fichier par participant pour les
+emails). Les pages sont copiées telles quelles : aucun nouveau rendu reportlab.
+Date: 18 octobre 2026
+Version: 1.0
+"""
+
+import io
+import os
+from typing import BinaryIO, Dict, Iterable, Iterator, List, Optional, Union
+
+from pypdf import PdfReader, PdfWriter
+
+from documentRendu import DocumentRendu, TYPE_PDF
+
+# Source acceptée : contenu, chemin de fichier ou document rendu
+SourcePdf = Union[bytes, str, DocumentRendu]
+# Destination : None (octets), chemin de fichier ou flux binaire ouvert
+DestinationPdf = Union[None, str, BinaryIO]
+
+# Suffixe du type des documents combinés (generer_document_combine)
+SUFFIXE_COMBINE = '_combine'
+
+
+def _lecteur(source: SourcePdf) -> PdfReader:
+    """Ouvre une source PDF sans copie inutile du contenu"""
+    if isinstance(source, DocumentRendu):
+        source = source.contenu
+    if isinstance(source, (bytes, bytearray)):
+        return PdfReader(io.BytesIO(source))
+    return PdfReader(source)
+
+
+def _ecrire(writer: PdfWriter, destination: DestinationPdf) -> Union[bytes, str, BinaryIO]:
+    """
+    Écrit le PDF assemblé
+
+    Returns:
+        Octets si destination est None, sinon la destination (chemin ou flux)
+    """
+    if destination is None:
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+    if isinstance(destination, str):
+        dossier = os.path.dirname(destination)
+        if dossier:
+            os.makedirs(dossier, exist_ok=True)
+        with open(destination, 'wb') as f:
+            writer.write(f)
+        return destination
+    writer.write(destination)
+    return destination
+
+
+# ============================================
+# FUSION
+# ============================================
+
+def fusionner_pdf(sources: Iterable[SourcePdf],
+                  destination: DestinationPdf = None) -> Union[bytes, str, BinaryIO]:
+    """
+    Fusionne des PDF dans l'ordre (ex: dossier de session pour les auditeurs)
+
+    Args:
+        sources: PDF à fusionner (octets, chemins ou DocumentRendu)
+        destination: None pour obtenir les octets, chemin de fichier ou flux binaire
+
+    Returns:
+        Octets du PDF fusionné, ou la destination
+    """
+    writer = PdfWriter()
+    for source in sources:
+        writer.append(_lecteur(source))
+    if not writer.pages:
+        raise ValueError("Aucune page à fusionner")
+    return _ecrire(writer, destination)
+
+
+def fusionner_documents(documents: List[DocumentRendu], nom_fichier: str,
+                        type_document: str = 'dossier_session', **metadata) -> DocumentRendu:
+    """
+    Fusionne des documents rendus en un seul DocumentRendu
+
+    Le manifeste des pages (nom_fichier, premiere_page, derniere_page de chaque
+    document source) est ajouté aux métadonnées.
+
+    Args:
+        documents: Documents PDF à fusionner, dans l'ordre
+        nom_fichier: Nom du PDF fusionné
+        type_document: Type du document fusionné
+        **metadata: Métadonnées complémentaires (session_id...)
+
+    Returns:
+        DocumentRendu du PDF fusionné
+    """
+    writer = PdfWriter()
+    pages = []
+    for document in documents:
+        premiere_page = len(writer.pages) + 1
+        writer.append(_lecteur(document))
+        pages.append({
+            'nom_fichier': document.nom_fichier,
+            'premiere_page': premiere_page,
+            'derniere_page': len(writer.pages)
+        })
+    if not writer.pages:
+        raise ValueError("Aucune page à fusionner")
+    return DocumentRendu(nom_fichier, _ecrire(writer, None), TYPE_PDF, type_document,
+                         {**metadata, 'pages': pages})
+
+
+# ============================================
+# DÉCOUPAGE SELON UN MANIFESTE DE PAGES
+# ============================================
+
+def extraire_pages(source: Union[SourcePdf, PdfReader], premiere_page: int, derniere_page: int,
+                   destination: DestinationPdf = None) -> Union[bytes, str, BinaryIO]:
+    """
+    Extrait une plage de pages (numérotées à partir de 1, bornes incluses)
+
+    Args:
+        source: PDF source, ou PdfReader déjà ouvert (découpages successifs)
+        premiere_page: Première page de la plage
+        derniere_page: Dernière page de la plage
+        destination: None pour obtenir les octets, chemin de fichier ou flux binaire
+
+    Returns:
+        Octets du PDF extrait, ou la destination
+    """
+    lecteur = source if isinstance(source, PdfReader) else _lecteur(source)
+    if not 1 <= premiere_page <= derniere_page <= len(lecteur.pages):
+        raise ValueError(
+            f"Plage de pages invalide: {premiere_page}-{derniere_page} "
+            f"(le document compte {len(lecteur.pages)} pages)"
+        )
+    writer = PdfWriter()
+    writer.append(lecteur, pages=(premiere_page - 1, derniere_page))
+    return _ecrire(writer, destination)
+
+
+def decouper_pdf(source: SourcePdf, pages: Optional[List[Dict]] = None,
+                 type_document: Optional[str] = None,
+                 participant_ids: Optional[Iterable[str]] = None) -> Iterator[DocumentRendu]:
+    """
+    Découpe un PDF combiné en un document par participant, à la demande
+
+    Le PDF source est lu une seule fois ; chaque fichier n'est produit qu'au
+    moment où il est demandé (générateur).
+
+    Args:
+        source: PDF combiné (DocumentRendu de generer_document_combine, octets ou chemin)
+        pages: Manifeste des pages (par défaut, celui des métadonnées du DocumentRendu)
+        type_document: Type des documents extraits (par défaut, déduit du document combiné)
+        participant_ids: Participants à extraire (par défaut, tous)
+
+    Yields:
+        DocumentRendu d'un participant
+    """
+    metadata = source.metadata if isinstance(source, DocumentRendu) else {}
+    if pages is None:
+        pages = metadata.get('pages')
+    if not pages:
+        raise ValueError("Manifeste des pages manquant pour le découpage")
+    if type_document is None and isinstance(source, DocumentRendu) and source.type_document:
+        type_document = source.type_document
+        if type_document.endswith(SUFFIXE_COMBINE):
+            type_document = type_document[:-len(SUFFIXE_COMBINE)]
+    selection = set(participant_ids) if participant_ids is not None else None
+
+    lecteur = _lecteur(source)
+    for plage in pages:
+        if selection is not None and plage.get('participant_id') not in selection:
+            continue
+        contenu = extraire_pages(lecteur, plage['premiere_page'], plage['derniere_page'])
+        yield DocumentRendu(plage['nom_fichier'], contenu, TYPE_PDF, type_document, {
+            'session_id': metadata.get('session_id'),
+            'participant_id': plage.get('participant_id')
+        })
+
+
+def extraire_participant(source: SourcePdf, participant_id: str,
+                         pages: Optional[List[Dict]] = None) -> DocumentRendu:
+    """
+    Extrait le document d'un seul participant d'un PDF combiné
+
+    Args:
+        source: PDF combiné
+        participant_id: ID du participant
+        pages: Manifeste des pages (par défaut, celui du DocumentRendu)
+
+    Returns:
+        DocumentRendu du participant
+    """
+    for document in decouper_pdf(source, pages, participant_ids=[participant_id]):
+        return document
+    raise ValueError(f"Participant {participant_id} absent du manifeste des pages")
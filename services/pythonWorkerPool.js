@@ -0,0 +1,407 @@
+const { spawn } = require('child_process');
+const path = require('path');
+const readline = require('readline');
+
+// Code d'erreur renvoyé par le worker quand la génération elle-même échoue
+const ERREUR_GENERATION = -32000;
+
+// Script en ligne de commande de chaque générateur (PYTHON_WORKERS=0 : un processus par requête)
+const SCRIPTS = {
+  template: 'templateDocumentGenerator.py',
+  qualiopi: 'documentGenerator.py'
+};
+
+/**
+ * Worker Python longue durée (services/documentWorker.py)
+ * Une seule requête à la fois : le pool choisit un worker libre.
+ */
+class PythonWorker {
+  constructor(pool, numero) {
+    this.pool = pool;
+    this.numero = numero;
+    this.process = null;
+    this.pret = false;
+    this.demarre = false;
+    this.occupe = false;
+    this.requetesTraitees = 0;
+    this.enAttente = new Map();
+    this.prochainId = 1;
+  }
+
+  /**
+   * Démarre le processus Python et attend le message 'pret'
+   * @returns {Promise<void>}
+   */
+  demarrer() {
+    return new Promise((resolve, reject) => {
+      const { pythonPath, scriptPath, cwd, timeoutDemarrage } = this.pool.options;
+
+      const processus = spawn(pythonPath, [scriptPath], { cwd, stdio: ['pipe', 'pipe', 'pipe'] });
+      this.process = processus;
+      this.pret = false;
+      this.occupe = false;
+      this.requetesTraitees = 0;
+
+      const timer = setTimeout(() => {
+        reject(new Error(`Worker Python ${this.numero} : démarrage trop long`));
+        this.arreter();
+      }, timeoutDemarrage);
+
+      readline.createInterface({ input: this.process.stdout }).on('line', (ligne) => {
+        let message;
+        try {
+          message = JSON.parse(ligne);
+        } catch (e) {
+          console.warn(`[pythonWorkerPool] Worker ${this.numero} : sortie ignorée: ${ligne}`);
+          return;
+        }
+
+        if (message.method === 'pret') {
+          clearTimeout(timer);
+          this.pret = true;
+          this.demarre = true;
+          resolve();
+          this.pool.distribuer();
+          return;
+        }
+
+        if (message.id === null && message.error) {
+          clearTimeout(timer);
+          reject(new Error(message.error.message));
+          return;
+        }
+
+        this.recevoir(message);
+      });
+
+      // Worker mort entre la distribution et l'écriture (EPIPE) : sans ce listener,
+      // l'erreur non gérée arrêterait tout le serveur
+      processus.stdin.on('error', (error) => {
+        if (this.process !== processus) {
+          return;
+        }
+        this.rejeterTout(new Error(`Worker Python ${this.numero} : écriture impossible (${error.code || error.message})`));
+        // L'arrêt déclenche 'exit', qui relance le worker
+        this.arreter();
+      });
+
+      // Les print() des générateurs sont redirigés sur stderr
+      this.process.stderr.on('data', (data) => {
+        if (this.pool.options.afficherStderr) {
+          process.stderr.write(`[python ${this.numero}] ${data}`);
+        }
+      });
+
+      this.process.on('exit', (code) => {
+        clearTimeout(timer);
+        // pret est déjà faux si l'arrêt a été demandé (délai dépassé, recyclage)
+        const etaitDemarre = this.demarre;
+        this.pret = false;
+        this.demarre = false;
+        this.process = null;
+        const error = new Error(`Worker Python ${this.numero} arrêté (code ${code})`);
+        this.rejeterTout(error);
+        // Sans effet si le worker avait déjà signalé qu'il était prêt
+        reject(error);
+        if (etaitDemarre) {
+          this.pool.remplacer(this);
+        }
+      });
+
+      this.process.on('error', (error) => {
+        clearTimeout(timer);
+        reject(error);
+      });
+    });
+  }
+
+  /**
+   * Envoie une requête JSON-RPC au worker
+   * @param {string} method - Méthode RPC ('generer', 'ping')
+   * @param {Object} params - Paramètres
+   * @param {number} timeout - Délai maximum en millisecondes
+   * @returns {Promise<Object>} - Résultat de la requête
+   */
+  envoyer(method, params, timeout) {
+    return new Promise((resolve, reject) => {
+      // Processus déjà arrêté ('exit' reçu) : il sera relancé par le pool
+      if (!this.process || !this.process.stdin.writable) {
+        reject(new Error(`Worker Python ${this.numero} arrêté`));
+        return;
+      }
+      const id = this.prochainId++;
+      const timer = setTimeout(() => {
+        this.enAttente.delete(id);
+        reject(new Error(`Worker Python ${this.numero} : délai dépassé pour ${method}`));
+        // Un worker bloqué est remplacé
+        this.arreter();
+      }, timeout);
+
+      this.enAttente.set(id, { resolve, reject, timer });
+      this.process.stdin.write(JSON.stringify({ jsonrpc: '2.0', id, method, params }) + '\n');
+    });
+  }
+
+  recevoir(message) {
+    const requete = this.enAttente.get(message.id);
+    if (!requete) {
+      return;
+    }
+    this.enAttente.delete(message.id);
+    clearTimeout(requete.timer);
+
+    if (message.error) {
+      const error = new Error(message.error.message);
+      error.code = message.error.code;
+      requete.reject(error);
+    } else {
+      requete.resolve(message.result);
+    }
+  }
+
+  rejeterTout(error) {
+    for (const requete of this.enAttente.values()) {
+      clearTimeout(requete.timer);
+      requete.reject(error);
+    }
+    this.enAttente.clear();
+  }
+
+  arreter() {
+    // Plus aucune requête ne doit lui être confiée pendant qu'il s'arrête
+    this.pret = false;
+    if (this.process) {
+      this.process.kill();
+    }
+  }
+}
+
+/**
+ * Pool de workers Python de génération de documents
+ * Évite de relancer python (imports reportlab, python-docx, supabase) à chaque requête.
+ */
+class PythonWorkerPool {
+  constructor(options = {}) {
+    this.options = {
+      taille: parseInt(process.env.PYTHON_WORKERS || '2', 10),
+      pythonPath: process.env.PYTHON_PATH || 'python3',
+      scriptPath: path.join(__dirname, 'documentWorker.py'),
+      cwd: process.cwd(),
+      timeoutDemarrage: 30000,
+      timeoutRequete: 120000,
+      timeoutPing: 5000,
+      intervalleSante: 30000,
+      maxRequetesParWorker: 500,
+      afficherStderr: true,
+      ...options
+    };
+    this.workers = [];
+    this.file = [];
+    this.demarrage = null;
+    this.timerSante = null;
+  }
+
+  /**
+   * Démarre les workers (appelé automatiquement à la première requête)
+   * @returns {Promise<void>}
+   */
+  demarrer() {
+    if (!this.demarrage) {
+      this.workers = Array.from({ length: this.options.taille }, (_, i) => new PythonWorker(this, i + 1));
+      this.demarrage = Promise.all(this.workers.map((worker) => worker.demarrer()))
+        .then(() => {
+          this.timerSante = setInterval(() => this.verifierSante(), this.options.intervalleSante);
+          this.timerSante.unref();
+        })
+        .catch((error) => {
+          this.arreter();
+          throw error;
+        });
+    }
+    return this.demarrage;
+  }
+
+  /**
+   * Exécute une requête sur le premier worker libre
+   * @param {string} method - Méthode RPC
+   * @param {Object} params - Paramètres
+   * @returns {Promise<Object>}
+   */
+  async appeler(method, params = {}) {
+    if (this.options.taille <= 0) {
+      throw new Error('Pool de workers Python désactivé (PYTHON_WORKERS=0)');
+    }
+    await this.demarrer();
+    return new Promise((resolve, reject) => {
+      this.file.push({ method, params, resolve, reject });
+      this.distribuer();
+    });
+  }
+
+  /**
+   * Génère un document via un worker
+   * @param {string} generateur - 'template' (TemplateDocumentGenerator) ou 'qualiopi' (QualiopisDocumentGenerator)
+   * @param {string} methode - Méthode de génération (ex: 'generer_convocation')
+   * @param {Array} args - Arguments positionnels
+   * @param {Object} options - Arguments nommés (ex: { parallele: true })
+   * @returns {Promise<Object>} - Même forme que la sortie JSON des scripts Python
+   */
+  async generer(generateur, methode, args = [], options = {}) {
+    if (this.options.taille <= 0) {
+      return this.lancerScript(generateur, methode, args, options);
+    }
+    try {
+      return await this.appeler('generer', { generateur, methode, args, options });
+    } catch (error) {
+      // Erreur de génération : même réponse que les scripts en ligne de commande
+      if (error.code === ERREUR_GENERATION) {
+        return { success: false, error: error.message };
+      }
+      throw error;
+    }
+  }
+
+  /**
+   * Génère un document dans un nouveau processus Python (pool désactivé)
+   * @returns {Promise<Object>} - Sortie JSON du script
+   */
+  lancerScript(generateur, methode, args = [], options = {}) {
+    return new Promise((resolve, reject) => {
+      const script = SCRIPTS[generateur];
+      if (!script) {
+        reject(new Error(`Générateur inconnu: ${generateur}`));
+        return;
+      }
+      const scriptPath = path.join(path.dirname(this.options.scriptPath), script);
+      const argsScript = [scriptPath, methode, ...args];
+      if (options.parallele) {
+        argsScript.push('--parallele');
+      }
+
+      const pythonProcess = spawn(this.options.pythonPath, argsScript, { cwd: this.options.cwd });
+
+      let stdout = '';
+      let stderr = '';
+
+      pythonProcess.stdout.on('data', (data) => {
+        stdout += data.toString();
+      });
+
+      pythonProcess.stderr.on('data', (data) => {
+        stderr += data.toString();
+      });
+
+      pythonProcess.on('error', reject);
+
+      pythonProcess.on('close', (code) => {
+        if (code !== 0) {
+          reject(new Error(`Python script exited with code ${code}: ${stderr}`));
+        } else {
+          try {
+            resolve(JSON.parse(stdout));
+          } catch (e) {
+            resolve({ success: true, output: stdout });
+          }
+        }
+      });
+    });
+  }
+
+  distribuer() {
+    while (this.file.length > 0) {
+      const worker = this.workers.find((w) => w.pret && !w.occupe);
+      if (!worker) {
+        return;
+      }
+      const tache = this.file.shift();
+      this.executer(worker, tache);
+    }
+  }
+
+  async executer(worker, tache) {
+    worker.occupe = true;
+    try {
+      tache.resolve(await worker.envoyer(tache.method, tache.params, this.options.timeoutRequete));
+    } catch (error) {
+      tache.reject(error);
+    } finally {
+      worker.occupe = false;
+      worker.requetesTraitees += 1;
+      // Recyclage préventif (fuites mémoire des bibliothèques de rendu)
+      if (worker.pret && worker.requetesTraitees >= this.options.maxRequetesParWorker) {
+        worker.arreter();
+      } else {
+        this.distribuer();
+      }
+    }
+  }
+
+  /**
+   * Relance un worker arrêté (plantage, délai dépassé, recyclage)
+   */
+  remplacer(worker) {
+    if (!this.demarrage) {
+      return;
+    }
+    worker.demarrer().catch((error) => {
+      console.error(`[pythonWorkerPool] Impossible de relancer le worker ${worker.numero}:`, error.message);
+      setTimeout(() => this.remplacer(worker), this.options.intervalleSante).unref();
+    });
+  }
+
+  /**
+   * Contrôle de santé : ping des workers libres, arrêt de ceux qui ne répondent pas
+   */
+  async verifierSante() {
+    await Promise.all(this.workers
+      .filter((worker) => worker.pret && !worker.occupe)
+      .map(async (worker) => {
+        worker.occupe = true;
+        try {
+          await worker.envoyer('ping', {}, this.options.timeoutPing);
+        } catch (error) {
+          console.warn(`[pythonWorkerPool] Worker ${worker.numero} ne répond pas, redémarrage`);
+        } finally {
+          worker.occupe = false;
+        }
+      }));
+    this.distribuer();
+  }
+
+  /**
+   * État du pool (pour les routes de monitoring)
+   * @returns {Promise<Array>}
+   */
+  async etat() {
+    await this.demarrer();
+    return Promise.all(this.workers.map(async (worker) => {
+      if (!worker.pret) {
+        return { numero: worker.numero, pret: false };
+      }
+      if (worker.occupe) {
+        return { numero: worker.numero, pret: true, occupe: true };
+      }
+      try {
+        return { numero: worker.numero, pret: true, ...(await worker.envoyer('ping', {}, this.options.timeoutPing)) };
+      } catch (error) {
+        return { numero: worker.numero, pret: false, erreur: error.message };
+      }
+    }));
+  }
+
+  arreter() {
+    clearInterval(this.timerSante);
+    this.demarrage = null;
+    for (const worker of this.workers) {
+      worker.pret = false;
+      worker.arreter();
+    }
+    for (const tache of this.file) {
+      tache.reject(new Error('Pool de workers Python arrêté'));
+    }
+    this.file = [];
+  }
+}
+
+module.exports = new PythonWorkerPool();
+module.exports.PythonWorkerPool = PythonWorkerPool;
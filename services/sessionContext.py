@@ -0,0 +1,91 @@
+"""
+Contexte de Session pour la Génération de Documents
+===================================================
+Charge en une fois toutes les données Supabase d'une session
+(session, organisme, formateur, participants) pour tout un lot de documents
+Date: 18 octobre 2026
+Version: 1.0
+"""
+
+from typing import Dict, List, Optional
+
+# Colonnes lues pour le rendu : la vue de session est lue en entier (programme, objectifs...),
+# les autres tables seulement pour les champs utilisés par les documents
+COLONNES_PARTICIPANT = 'id,session_formation_id,nom,prenom,email,telephone,fonction'
+COLONNES_FORMATEUR = 'id,nom,prenom,email,telephone'
+
+
+def charger_organisme(supabase_client) -> Dict:
+    """Charge l'organisme de formation (commun à toutes les sessions)"""
+    response = supabase_client.table('organisme_formation').select('*').limit(1).execute()
+    if not response.data:
+        raise ValueError("Aucun organisme de formation configuré")
+    return response.data[0]
+
+
+class SessionContext:
+    """Données d'une session chargées une seule fois pour tout un lot de documents"""
+
+    def __init__(
+        self,
+        session_id: str,
+        session: Dict,
+        organisme: Dict,
+        formateur: Optional[Dict] = None,
+        participants: Optional[List[Dict]] = None
+    ):
+        """
+        Args:
+            session_id: ID de la session
+            session: Ligne de la vue session (vue_sessions_complete)
+            organisme: Ligne de organisme_formation
+            formateur: Ligne de formateurs (vide si aucun formateur)
+            participants: Participants de la session
+        """
+        self.session_id = session_id
+        self.session = session
+        self.organisme = organisme
+        self.formateur = formateur or {}
+        self.participants = participants or []
+        self._participants_par_id = {p['id']: p for p in self.participants}
+
+        # Variables communes à tous les documents, calculées à la première utilisation
+        self.variables_base: Optional[Dict] = None
+
+    @classmethod
+    def charger(cls, supabase_client, session_id: str, vue_session: str = 'vue_sessions_complete',
+                organisme: Optional[Dict] = None):
+        """
+        Charge le contexte avec une requête par table
+
+        Args:
+            supabase_client: Client Supabase
+            session_id: ID de la session
+            vue_session: Vue contenant les données complètes de la session
+            organisme: Organisme de formation déjà chargé (partagé entre plusieurs sessions)
+
+        Returns:
+            SessionContext
+        """
+        response = supabase_client.table(vue_session).select('*').eq('id', session_id).execute()
+        if not response.data:
+            raise ValueError(f"Session {session_id} non trouvée")
+        session = response.data[0]
+
+        if organisme is None:
+            organisme = charger_organisme(supabase_client)
+
+        formateur = {}
+        if session.get('formateur_id'):
+            response = supabase_client.table('formateurs').select(COLONNES_FORMATEUR).eq('id', session['formateur_id']).execute()
+            if response.data:
+                formateur = response.data[0]
+
+        response = supabase_client.table('participants').select(COLONNES_PARTICIPANT).eq('session_formation_id', session_id).execute()
+        participants = response.data or []
+
+        return cls(session_id, session, organisme, formateur, participants)
+
+    def get_participant(self, participant_id: str) -> Optional[Dict]:
+        """Retourne un participant de la session (None s'il n'en fait pas partie)"""
+        return self._participants_par_id.get(participant_id)
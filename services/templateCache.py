@@ -0,0 +1,248 @@
+"""
+Cache des Templates Word
+========================
+Parse chaque template .docx une seule fois par processus et distribue
+des copies profondes prêtes à être remplies
+Date: 18 octobre 2026
+Version: 1.0
+"""
+
+import copy
+import hashlib
+import io
+import os
+import threading
+from typing import Dict, List, Optional, Tuple
+
+from docx import Document
+from docx.oxml.ns import qn
+from docx.parts.document import DocumentPart
+from docx.parts.hdrftr import FooterPart, HeaderPart
+
+from templateEngine import PLACEHOLDER_PATTERN, normaliser_placeholders, placeholder
+
+
+class EmplacementPlaceholder:
+    """Position d'un run contenant au moins un placeholder dans le template"""
+
+    __slots__ = ('partie', 'chemin_paragraphe', 'chemin_run', 'placeholders')
+
+    def __init__(self, partie: str, chemin_paragraphe: Tuple[int, ...],
+                 chemin_run: Tuple[int, ...], placeholders: Tuple[str, ...]):
+        """
+        Args:
+            partie: Nom de la partie du package (ex: /word/document.xml, /word/header1.xml)
+            chemin_paragraphe: Indices des enfants successifs de la racine jusqu'au w:p
+            chemin_run: Indices des enfants successifs du w:p jusqu'au w:r
+            placeholders: Placeholders présents dans le run (ex: '{{participant_nom}}')
+        """
+        self.partie = partie
+        self.chemin_paragraphe = chemin_paragraphe
+        self.chemin_run = chemin_run
+        self.placeholders = placeholders
+
+    def __repr__(self):
+        return (f"EmplacementPlaceholder({self.partie}, {self.chemin_paragraphe}, "
+                f"{self.chemin_run}, {self.placeholders})")
+
+
+def parties_texte(document) -> Dict[str, object]:
+    """Retourne les parties XML du document contenant du texte (corps, en-têtes, pieds de page)"""
+    return {
+        str(part.partname): part
+        for part in document.part.package.iter_parts()
+        if isinstance(part, (DocumentPart, HeaderPart, FooterPart))
+    }
+
+
+def _chemin(element, racine) -> Tuple[int, ...]:
+    """Calcule les indices d'enfants menant de la racine à l'élément"""
+    indices = []
+    while element is not racine:
+        parent = element.getparent()
+        indices.append(parent.index(element))
+        element = parent
+    return tuple(reversed(indices))
+
+
+def resoudre_chemin(racine, chemin: Tuple[int, ...]):
+    """Retrouve un élément à partir de ses indices d'enfants"""
+    element = racine
+    for index in chemin:
+        element = element[index]
+    return element
+
+
+def indexer_placeholders(document) -> List[EmplacementPlaceholder]:
+    """
+    Recense tous les runs du document contenant un placeholder
+
+    Args:
+        document: Document Word
+
+    Returns:
+        Liste des emplacements, dans l'ordre du document
+    """
+    emplacements = []
+    for nom_partie, part in parties_texte(document).items():
+        racine = part.element
+        for run in racine.iter(qn('w:r')):
+            texte = ''.join(t.text or '' for t in run.iter(qn('w:t')))
+            if '{{' not in texte:
+                continue
+            placeholders = tuple(dict.fromkeys(
+                placeholder(nom) for nom in PLACEHOLDER_PATTERN.findall(texte)
+            ))
+            if not placeholders:
+                continue
+
+            paragraphe = run.getparent()
+            while paragraphe is not None and paragraphe.tag != qn('w:p'):
+                paragraphe = paragraphe.getparent()
+            if paragraphe is None:
+                continue
+
+            emplacements.append(EmplacementPlaceholder(
+                nom_partie,
+                _chemin(paragraphe, racine),
+                _chemin(run, paragraphe),
+                placeholders
+            ))
+    return emplacements
+
+
+class TemplateCompile:
+    """Template chargé une fois, conservé intact et cloné à la demande"""
+
+    def __init__(self, template_path: str, mtime_ns: int, taille: int):
+        """
+        Charge et parse le template
+
+        Args:
+            template_path: Chemin absolu du fichier .docx
+            mtime_ns: Date de modification du fichier au moment du chargement
+            taille: Taille du fichier au moment du chargement
+        """
+        self.template_path = template_path
+        self.mtime_ns = mtime_ns
+        self.taille = taille
+
+        with open(template_path, 'rb') as f:
+            self.source = f.read()
+
+        # Empreinte du fichier, intégrée à l'empreinte des documents générés
+        self.sha256 = hashlib.sha256(self.source).hexdigest()
+
+        self.document = Document(io.BytesIO(self.source))
+
+        # Placeholders coupés par Word sur plusieurs runs : regroupés une fois pour toutes
+        self.placeholders_fusionnes = sum(
+            normaliser_placeholders(part.element)
+            for part in parties_texte(self.document).values()
+        )
+
+        # Index des placeholders, calculé une seule fois
+        self.emplacements = indexer_placeholders(self.document)
+
+    @property
+    def placeholders(self) -> List[str]:
+        """Liste des placeholders distincts utilisés par le template"""
+        vus = {}
+        for emplacement in self.emplacements:
+            for placeholder in emplacement.placeholders:
+                vus[placeholder] = True
+        return list(vus)
+
+    def est_a_jour(self, mtime_ns: int, taille: int) -> bool:
+        """Indique si le template correspond toujours au fichier sur disque"""
+        return self.mtime_ns == mtime_ns and self.taille == taille
+
+    def cloner(self):
+        """
+        Retourne une copie profonde indépendante du document
+
+        self.document n'est jamais modifié après la compilation : il sert de
+        référence intacte à toutes les copies
+        """
+        return copy.deepcopy(self.document)
+
+
+class TemplateCache:
+    """Cache des templates compilés, indexé par chemin et date de modification"""
+
+    def __init__(self):
+        self._templates: Dict[str, TemplateCompile] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, template_path: str) -> TemplateCompile:
+        """
+        Retourne le template compilé, en le (re)chargeant si nécessaire
+
+        Args:
+            template_path: Chemin du fichier .docx
+
+        Returns:
+            TemplateCompile à jour avec le fichier sur disque
+        """
+        chemin = os.path.abspath(template_path)
+        if not os.path.exists(chemin):
+            raise FileNotFoundError(f"Template non trouvé: {template_path}")
+
+        stat = os.stat(chemin)
+
+        with self._lock:
+            template = self._templates.get(chemin)
+            if template and template.est_a_jour(stat.st_mtime_ns, stat.st_size):
+                self.hits += 1
+                return template
+
+            if template:
+                self.invalidations += 1
+            self.misses += 1
+
+            template = TemplateCompile(chemin, stat.st_mtime_ns, stat.st_size)
+            self._templates[chemin] = template
+            return template
+
+    def charger_document(self, template_path: str):
+        """Retourne une copie du template prête à être modifiée"""
+        return self.get(template_path).cloner()
+
+    def invalider(self, template_path: Optional[str] = None):
+        """Supprime un template du cache (ou tout le cache)"""
+        with self._lock:
+            if template_path is None:
+                self.invalidations += len(self._templates)
+                self._templates.clear()
+            elif self._templates.pop(os.path.abspath(template_path), None):
+                self.invalidations += 1
+
+    def statistiques(self) -> Dict:
+        """Retourne les compteurs du cache"""
+        with self._lock:
+            return {
+                'templates': len(self._templates),
+                'hits': self.hits,
+                'misses': self.misses,
+                'invalidations': self.invalidations
+            }
+
+
+# Singleton pour partager le cache dans tout le processus
+_template_cache = None
+
+
+def get_template_cache() -> TemplateCache:
+    """
+    Récupère le cache de templates du processus (singleton)
+
+    Returns:
+        TemplateCache: Instance partagée du cache
+    """
+    global _template_cache
+    if _template_cache is None:
+        _template_cache = TemplateCache()
+    return _template_cache
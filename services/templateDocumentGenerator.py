@@ -6,33 +6,76 @@ Date: 27 octobre 2025
 Version: 1.0
 """
 
+import io
 import os
+import sys
+from concurrent.futures import ProcessPoolExecutor, as_completed
 from datetime import datetime
 from docx import Document
-from typing import Dict, List, Optional
+from docx.text.run import Run
+from typing import Dict, Iterator, List, Optional, Tuple, Union
 import re
+import zipfile
 from pathlib import Path
 
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from templateCache import get_template_cache, parties_texte, resoudre_chemin
+from templateEngine import substituer
+from sessionContext import SessionContext, charger_organisme, COLONNES_PARTICIPANT, COLONNES_FORMATEUR
+from documentRendu import DocumentRendu, TYPE_DOCX, document_publie, empreinte_entrees
+from docxPdfConverter import get_convertisseur_pdf, rendu_pdf
+
+# Version du rendu, intégrée à l'empreinte des documents : à incrémenter quand
+# le remplacement des variables change, pour forcer la régénération
+VERSION_RENDU = 1
+
+# Variables du jour, hors empreinte : sans elles, tous les documents seraient
+# régénérés chaque jour (un document inchangé garde la date de son premier rendu)
+VARIABLES_DU_JOUR = ('{{date_aujourd_hui}}', '{{date_proposition}}', '{{annee}}')
+
+
+def empreinte_variables(variables: Dict, template_sha256: str) -> str:
+    """Empreinte des entrées d'un rendu de template, hors variables du jour"""
+    entrees = {cle: valeur for cle, valeur in variables.items() if cle not in VARIABLES_DU_JOUR}
+    return empreinte_entrees(entrees, template_sha256, str(VERSION_RENDU))
+
 
 class TemplateDocumentGenerator:
     """Générateur de documents à partir de templates Word"""
     
-    def __init__(self, supabase_client, templates_dir: str = None):
+    def __init__(self, supabase_client, templates_dir: str = None, template_cache=None, max_workers: int = None,
+                 output_dir: Optional[str] = "generated_documents", incremental: bool = True,
+                 convertisseur_pdf=None):
         """
         Initialise le générateur de documents
         
         Args:
             supabase_client: Client Supabase pour accéder aux données
             templates_dir: Chemin vers le dossier des templates
+            template_cache: Cache de templates (par défaut, celui du processus)
+            max_workers: Nombre de processus pour le rendu parallèle (défaut : nombre de CPU)
+            output_dir: Dossier où écrire les documents (None : rendu en mémoire uniquement)
+            incremental: Ne pas régénérer un document dont les entrées (variables et template)
+                n'ont pas changé : fichier du dossier de sortie ou document déjà publié
+                (table documents)
+            convertisseur_pdf: Pool de conversion (ConvertisseurPdf) : les méthodes par phase
+                ajoutent la version PDF de chaque document (None : .docx uniquement)
         """
         self.supabase = supabase_client
         self.templates_dir = templates_dir or "Dossier exemple"
-        self.output_dir = "generated_documents"
+        self.template_cache = template_cache or get_template_cache()
+        self.output_dir = output_dir
+        self.avertissements: List[Dict] = []
+        self.inchanges: List[str] = []
+        self.max_workers = max_workers
+        self.incremental = incremental
+        self.convertisseur_pdf = convertisseur_pdf
         self.ensure_output_dir()
         
     def ensure_output_dir(self):
         """Crée le dossier de sortie s'il n'existe pas"""
-        if not os.path.exists(self.output_dir):
+        if self.output_dir and not os.path.exists(self.output_dir):
             os.makedirs(self.output_dir)
     
     # ============================================
@@ -55,18 +98,49 @@ class TemplateDocumentGenerator:
     
     def get_participants(self, session_id: str) -> List[Dict]:
         """Récupère la liste des participants d'une session"""
-        response = self.supabase.table('participants').select('*').eq('session_formation_id', session_id).execute()
+        response = self.supabase.table('participants').select(COLONNES_PARTICIPANT).eq('session_formation_id', session_id).execute()
         return response.data
     
     def get_formateur_data(self, formateur_id: str) -> Dict:
         """Récupère les données d'un formateur"""
         if not formateur_id:
             return {}
-        response = self.supabase.table('formateurs').select('*').eq('id', formateur_id).execute()
+        response = self.supabase.table('formateurs').select(COLONNES_FORMATEUR).eq('id', formateur_id).execute()
         if not response.data:
             return {}
         return response.data[0]
     
+    def charger_contexte(self, session_id: str) -> SessionContext:
+        """
+        Charge en une fois toutes les données nécessaires aux documents d'une session
+        
+        Args:
+            session_id: ID de la session
+            
+        Returns:
+            SessionContext à transmettre aux méthodes generer_*
+        """
+        return SessionContext.charger(self.supabase, session_id)
+    
+    def charger_contextes(self, session_ids: List[str]) -> Dict[str, object]:
+        """
+        Charge le contexte de plusieurs sessions, l'organisme n'étant lu qu'une fois
+        
+        Args:
+            session_ids: IDs des sessions (les doublons sont ignorés)
+            
+        Returns:
+            Dict session_id -> SessionContext, ou l'exception si le chargement a échoué
+        """
+        organisme = charger_organisme(self.supabase)
+        contextes = {}
+        for session_id in dict.fromkeys(session_ids):
+            try:
+                contextes[session_id] = SessionContext.charger(self.supabase, session_id, organisme=organisme)
+            except Exception as e:
+                contextes[session_id] = e
+        return contextes
+    
     def format_date(self, date_str: str, format: str = "%d/%m/%Y") -> str:
         """Formate une date au format français"""
         if not date_str:
@@ -83,19 +157,42 @@ class TemplateDocumentGenerator:
             return "0,00 €"
         return f"{prix:,.2f} €".replace(',', ' ').replace('.', ',')
     
-    def prepare_variables(self, session_id: str, participant_id: str = None) -> Dict:
+    def prepare_variables(self, session_id: str, participant_id: str = None, contexte: SessionContext = None) -> Dict:
         """
         Prépare toutes les variables pour le remplacement dans les templates
         
         Args:
             session_id: ID de la session
             participant_id: ID du participant (optionnel)
+            contexte: Données de la session déjà chargées (optionnel)
             
         Returns:
             Dictionnaire de variables {nom_variable: valeur}
         """
-        session = self.get_session_data(session_id)
-        organisme = self.get_organisme_data()
+        if contexte is None:
+            contexte = self.charger_contexte(session_id)
+        
+        # Variables communes, calculées une seule fois par contexte
+        if contexte.variables_base is None:
+            contexte.variables_base = self.prepare_variables_base(contexte)
+        
+        variables = dict(contexte.variables_base)
+        
+        # Participant si fourni
+        if participant_id:
+            participant = contexte.get_participant(participant_id)
+            if participant is None:
+                response = self.supabase.table('participants').select(COLONNES_PARTICIPANT).eq('id', participant_id).execute()
+                participant = response.data[0] if response.data else None
+            if participant:
+                variables.update(self.prepare_variables_participant(participant))
+        
+        return variables
+    
+    def prepare_variables_base(self, contexte: SessionContext) -> Dict:
+        """Prépare les variables communes à tous les documents d'une session"""
+        session = contexte.session
+        organisme = contexte.organisme
         
         # Variables de base
         variables = {
@@ -167,7 +264,7 @@ class TemplateDocumentGenerator:
         
         # Formateur si disponible
         if session.get('formateur_id'):
-            formateur = self.get_formateur_data(session['formateur_id'])
+            formateur = contexte.formateur
             variables.update({
                 '{{formateur_nom}}': formateur.get('nom', ''),
                 '{{formateur_prenom}}': formateur.get('prenom', ''),
@@ -184,67 +281,97 @@ class TemplateDocumentGenerator:
                 '{{formateur_telephone}}': '',
             })
         
-        # Participant si fourni
-        if participant_id:
-            response = self.supabase.table('participants').select('*').eq('id', participant_id).execute()
-            if response.data:
-                participant = response.data[0]
-                variables.update({
-                    '{{participant_nom}}': participant.get('nom', ''),
-                    '{{participant_prenom}}': participant.get('prenom', ''),
-                    '{{participant_nom_complet}}': f"{participant.get('prenom', '')} {participant.get('nom', '')}",
-                    '{{participant_email}}': participant.get('email', ''),
-                    '{{participant_telephone}}': participant.get('telephone', ''),
-                    '{{participant_fonction}}': participant.get('fonction', ''),
-                })
-        
         return variables
     
-    def replace_text_in_paragraph(self, paragraph, variables: Dict):
-        """Remplace les variables dans un paragraphe"""
+    def prepare_variables_participant(self, participant: Dict) -> Dict:
+        """Prépare les variables propres à un participant"""
+        return {
+            '{{participant_nom}}': participant.get('nom', ''),
+            '{{participant_prenom}}': participant.get('prenom', ''),
+            '{{participant_nom_complet}}': f"{participant.get('prenom', '')} {participant.get('nom', '')}",
+            '{{participant_email}}': participant.get('email', ''),
+            '{{participant_telephone}}': participant.get('telephone', ''),
+            '{{participant_fonction}}': participant.get('fonction', ''),
+        }
+    
+    def replace_text_in_paragraph(self, paragraph, variables: Dict) -> List[str]:
+        """
+        Remplace les variables dans un paragraphe
+        
+        Returns:
+            Noms des placeholders sans valeur, laissés en place
+        """
+        inconnus = []
         for run in paragraph.runs:
-            for var, value in variables.items():
-                if var in run.text:
-                    run.text = run.text.replace(var, str(value))
+            if '{{' in run.text:
+                run.text, manquants = substituer(run.text, variables)
+                inconnus.extend(manquants)
+        return inconnus
     
-    def replace_text_in_table(self, table, variables: Dict):
+    def replace_text_in_table(self, table, variables: Dict) -> List[str]:
         """Remplace les variables dans un tableau"""
+        inconnus = []
         for row in table.rows:
             for cell in row.cells:
                 for paragraph in cell.paragraphs:
-                    self.replace_text_in_paragraph(paragraph, variables)
+                    inconnus.extend(self.replace_text_in_paragraph(paragraph, variables))
+        return inconnus
     
-    def replace_variables_in_document(self, doc: Document, variables: Dict):
+    def replace_variables_in_document(self, doc: Document, variables: Dict) -> List[Dict]:
         """
         Remplace toutes les variables dans un document Word
         
         Args:
             doc: Document Word
             variables: Dictionnaire des variables à remplacer
+            
+        Returns:
+            Avertissements pour les placeholders inconnus [{'placeholder', 'partie'}]
         """
-        # Remplacer dans les paragraphes
-        for paragraph in doc.paragraphs:
-            self.replace_text_in_paragraph(paragraph, variables)
+        inconnus = []
         
-        # Remplacer dans les tableaux
+        # Remplacer dans les paragraphes et les tableaux
+        for paragraph in doc.paragraphs:
+            inconnus.extend(('corps', nom) for nom in self.replace_text_in_paragraph(paragraph, variables))
         for table in doc.tables:
-            self.replace_text_in_table(table, variables)
+            inconnus.extend(('corps', nom) for nom in self.replace_text_in_table(table, variables))
         
-        # Remplacer dans les en-têtes
+        # Remplacer dans les en-têtes et pieds de page
         for section in doc.sections:
-            header = section.header
-            for paragraph in header.paragraphs:
-                self.replace_text_in_paragraph(paragraph, variables)
-            for table in header.tables:
-                self.replace_text_in_table(table, variables)
+            for partie, conteneur in (('en-tete', section.header), ('pied de page', section.footer)):
+                for paragraph in conteneur.paragraphs:
+                    inconnus.extend((partie, nom) for nom in self.replace_text_in_paragraph(paragraph, variables))
+                for table in conteneur.tables:
+                    inconnus.extend((partie, nom) for nom in self.replace_text_in_table(table, variables))
         
-        # Remplacer dans les pieds de page
-        for section in doc.sections:
-            footer = section.footer
-            for paragraph in footer.paragraphs:
-                self.replace_text_in_paragraph(paragraph, variables)
-            for table in footer.tables:
-                self.replace_text_in_table(table, variables)
+        return [{'placeholder': nom, 'partie': partie} for partie, nom in inconnus]
+    
+    def replace_variables_indexees(self, doc: Document, emplacements: List, variables: Dict) -> List[Dict]:
+        """
+        Remplace les variables uniquement aux emplacements recensés à la compilation du template
+        
+        Args:
+            doc: Copie du template compilé
+            emplacements: Index des placeholders du template (TemplateCompile.emplacements)
+            variables: Dictionnaire des variables à remplacer
+            
+        Returns:
+            Avertissements pour les placeholders inconnus [{'placeholder', 'partie', 'paragraphe'}]
+        """
+        avertissements = []
+        parties = parties_texte(doc)
+        for emplacement in emplacements:
+            paragraphe = resoudre_chemin(parties[emplacement.partie].element, emplacement.chemin_paragraphe)
+            run = Run(resoudre_chemin(paragraphe, emplacement.chemin_run), None)
+            
+            run.text, inconnus = substituer(run.text, variables)
+            for nom in inconnus:
+                avertissements.append({
+                    'placeholder': nom,
+                    'partie': emplacement.partie,
+                    'paragraphe': list(emplacement.chemin_paragraphe)
+                })
+        return avertissements
     
     # ============================================
     # GÉNÉRATION DE DOCUMENTS
@@ -255,8 +382,9 @@ class TemplateDocumentGenerator:
         template_name: str, 
         session_id: str, 
         participant_id: str = None,
-        output_filename: str = None
-    ) -> str:
+        output_filename: str = None,
+        contexte: SessionContext = None
+    ) -> Union[str, DocumentRendu]:
         """
         Génère un document à partir d'un template
         
@@ -265,9 +393,10 @@ class TemplateDocumentGenerator:
             session_id: ID de la session
             participant_id: ID du participant (optionnel)
             output_filename: Nom du fichier de sortie (optionnel)
+            contexte: Données de la session déjà chargées (optionnel)
             
         Returns:
-            Chemin du fichier généré
+            Chemin du fichier généré, ou DocumentRendu si aucun dossier de sortie n'est défini
         """
         # Chemin du template
         template_path = os.path.join(self.templates_dir, template_name)
@@ -275,14 +404,11 @@ class TemplateDocumentGenerator:
         if not os.path.exists(template_path):
             raise FileNotFoundError(f"Template non trouvé: {template_path}")
         
-        # Charger le template
-        doc = Document(template_path)
+        # Charger le template mis en cache
+        template = self.template_cache.get(template_path)
         
         # Préparer les variables
-        variables = self.prepare_variables(session_id, participant_id)
-        
-        # Remplacer les variables
-        self.replace_variables_in_document(doc, variables)
+        variables = self.prepare_variables(session_id, participant_id, contexte)
         
         # Nom du fichier de sortie
         if not output_filename:
@@ -290,185 +416,431 @@ class TemplateDocumentGenerator:
             suffix = f"_{participant_id}" if participant_id else ""
             output_filename = f"{base_name}_{session_id}{suffix}.docx"
         
-        output_path = os.path.join(self.output_dir, output_filename)
+        # Document déjà généré avec les mêmes entrées : le fichier existant est conservé
+        empreinte = empreinte_variables(variables, template.sha256)
+        if self.incremental:
+            existant = self.document_existant(output_filename, empreinte)
+            if existant is not None:
+                return existant
+        
+        # Remplacer les variables aux emplacements indexés
+        doc = template.cloner()
+        avertissements = self.replace_variables_indexees(doc, template.emplacements, variables)
+        for avertissement in avertissements:
+            avertissement['template'] = template_name
+        self.avertissements.extend(avertissements)
         
-        # Sauvegarder le document
-        doc.save(output_path)
+        # Empreinte des entrées dans les propriétés du document
+        doc.core_properties.identifier = empreinte
         
-        return output_path
+        # Sauvegarder le document en mémoire
+        buffer = io.BytesIO()
+        doc.save(buffer)
+        rendu = DocumentRendu(
+            output_filename,
+            buffer.getvalue(),
+            TYPE_DOCX,
+            os.path.splitext(template_name)[0],
+            {
+                'template': template_name,
+                'session_id': session_id,
+                'participant_id': participant_id,
+                'empreinte_entrees': empreinte
+            }
+        )
+        
+        # Écrire dans le dossier de sortie s'il est défini
+        if self.output_dir:
+            return rendu.enregistrer(self.output_dir)
+        return rendu
+    
+    def document_existant(self, output_filename: str, empreinte: str) -> Union[str, DocumentRendu, None]:
+        """
+        Document déjà généré avec la même empreinte d'entrées
+
+        Cherche d'abord le fichier du dossier de sortie, puis un document publié
+        (documents.metadata->>empreinte_entrees) dont le fichier est téléchargé.
+        Sans client Supabase (processus du pool), seul le dossier de sortie est consulté.
+
+        Returns:
+            Chemin ou DocumentRendu existant, ou None s'il faut rendre le document
+        """
+        if self.output_dir:
+            chemin = os.path.join(self.output_dir, output_filename)
+            if lire_empreinte_docx(chemin) == empreinte:
+                self.inchanges.append(chemin)
+                return chemin
+
+        if self.supabase is None:
+            return None
+        existant = document_publie(self.supabase, empreinte, TYPE_DOCX)
+        if existant is None:
+            return None
+        existant.nom_fichier = output_filename
+        self.inchanges.append(output_filename)
+        if self.output_dir:
+            return existant.enregistrer(self.output_dir)
+        return existant
+
+    def rendre(self, methode: str, *args, **kwargs) -> DocumentRendu:
+        """
+        Génère un document en mémoire, sans l'écrire sur disque
+        
+        Args:
+            methode: Nom de la méthode de génération (ex: 'generer_convocation')
+            *args, **kwargs: Arguments de la méthode
+            
+        Returns:
+            DocumentRendu (contenu .docx et métadonnées)
+        """
+        output_dir = self.output_dir
+        self.output_dir = None
+        try:
+            return getattr(self, methode)(*args, **kwargs)
+        finally:
+            self.output_dir = output_dir
     
     # ============================================
     # MÉTHODES SPÉCIFIQUES PAR TYPE DE DOCUMENT
     # ============================================
     
-    def generer_convention(self, session_id: str) -> str:
+    def generer_convention(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère la convention de formation"""
         return self.generer_document_from_template(
             "Modèle de convention simplifiée de formation 2020.docx",
             session_id,
-            output_filename=f"convention_formation_{session_id}.docx"
+            output_filename=f"convention_formation_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_programme(self, session_id: str) -> str:
+    def generer_programme(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère le programme de formation"""
         return self.generer_document_from_template(
             "Modèle Programme de formation 2020.docx",
             session_id,
-            output_filename=f"programme_formation_{session_id}.docx"
+            output_filename=f"programme_formation_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_proposition(self, session_id: str) -> str:
+    def generer_proposition(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère la proposition de formation"""
         return self.generer_document_from_template(
             "Modèle Proposition de Formation_2.docx",
             session_id,
-            output_filename=f"proposition_formation_{session_id}.docx"
+            output_filename=f"proposition_formation_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_convocation(self, session_id: str, participant_id: str) -> str:
+    def generer_convocation(self, session_id: str, participant_id: str, contexte: SessionContext = None) -> str:
         """Génère une convocation pour un participant"""
         return self.generer_document_from_template(
             "Modele Convocation formation 2020.docx",
             session_id,
             participant_id,
-            output_filename=f"convocation_{participant_id}.docx"
+            output_filename=f"convocation_{participant_id}.docx",
+            contexte=contexte
         )
     
-    def generer_certificat(self, session_id: str, participant_id: str) -> str:
+    def generer_certificat(self, session_id: str, participant_id: str, contexte: SessionContext = None) -> str:
         """Génère un certificat de réalisation pour un participant"""
         return self.generer_document_from_template(
             "Modèle Certificat de réalisation.docx",
             session_id,
             participant_id,
-            output_filename=f"certificat_{participant_id}.docx"
+            output_filename=f"certificat_{participant_id}.docx",
+            contexte=contexte
         )
     
-    def generer_feuille_emargement_entreprise(self, session_id: str) -> str:
+    def generer_feuille_emargement_entreprise(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère la feuille d'émargement entreprise"""
         return self.generer_document_from_template(
             "Modèle Feuille d émargement entreprise.docx",
             session_id,
-            output_filename=f"emargement_entreprise_{session_id}.docx"
+            output_filename=f"emargement_entreprise_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_feuille_emargement_individuelle(self, session_id: str, participant_id: str) -> str:
+    def generer_feuille_emargement_individuelle(self, session_id: str, participant_id: str, contexte: SessionContext = None) -> str:
         """Génère la feuille d'émargement individuelle pour un participant"""
         return self.generer_document_from_template(
             "Modèle Feuille d émargement individuelle.docx",
             session_id,
             participant_id,
-            output_filename=f"emargement_individuel_{participant_id}.docx"
+            output_filename=f"emargement_individuel_{participant_id}.docx",
+            contexte=contexte
         )
     
-    def generer_questionnaire_prealable(self, session_id: str, participant_id: str) -> str:
+    def generer_questionnaire_prealable(self, session_id: str, participant_id: str, contexte: SessionContext = None) -> str:
         """Génère le questionnaire préalable pour un participant"""
         return self.generer_document_from_template(
             "Modèle Questionnaire préalable à la formation.docx",
             session_id,
             participant_id,
-            output_filename=f"questionnaire_prealable_{participant_id}.docx"
+            output_filename=f"questionnaire_prealable_{participant_id}.docx",
+            contexte=contexte
         )
     
-    def generer_evaluation_chaud(self, session_id: str, participant_id: str) -> str:
+    def generer_evaluation_chaud(self, session_id: str, participant_id: str, contexte: SessionContext = None) -> str:
         """Génère l'évaluation à chaud pour un participant"""
         return self.generer_document_from_template(
             "Modèle évaluation à chaud.docx",
             session_id,
             participant_id,
-            output_filename=f"evaluation_chaud_{participant_id}.docx"
+            output_filename=f"evaluation_chaud_{participant_id}.docx",
+            contexte=contexte
         )
     
-    def generer_evaluation_froid(self, session_id: str, participant_id: str) -> str:
+    def generer_evaluation_froid(self, session_id: str, participant_id: str, contexte: SessionContext = None) -> str:
         """Génère l'évaluation à froid pour un participant"""
         return self.generer_document_from_template(
             "Modèle évaluation à froid.docx",
             session_id,
             participant_id,
-            output_filename=f"evaluation_froid_{participant_id}.docx"
+            output_filename=f"evaluation_froid_{participant_id}.docx",
+            contexte=contexte
         )
     
-    def generer_evaluation_client(self, session_id: str) -> str:
+    def generer_evaluation_client(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère l'évaluation de satisfaction client"""
         return self.generer_document_from_template(
             "Modèle Évaluation de la satisfaction du client.docx",
             session_id,
-            output_filename=f"evaluation_client_{session_id}.docx"
+            output_filename=f"evaluation_client_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_reglement_interieur(self, session_id: str) -> str:
+    def generer_reglement_interieur(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère le règlement intérieur"""
         return self.generer_document_from_template(
             "Règlement Intérieur.docx",
             session_id,
-            output_filename=f"reglement_interieur_{session_id}.docx"
+            output_filename=f"reglement_interieur_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_bulletin_inscription(self, session_id: str, participant_id: str) -> str:
+    def generer_bulletin_inscription(self, session_id: str, participant_id: str, contexte: SessionContext = None) -> str:
         """Génère le bulletin d'inscription pour un participant"""
         return self.generer_document_from_template(
             "Modele bulletin d'inscription formation INTER 2020.docx",
             session_id,
             participant_id,
-            output_filename=f"bulletin_inscription_{participant_id}.docx"
+            output_filename=f"bulletin_inscription_{participant_id}.docx",
+            contexte=contexte
         )
     
-    def generer_grille_competences(self, session_id: str, participant_id: str) -> str:
+    def generer_grille_competences(self, session_id: str, participant_id: str, contexte: SessionContext = None) -> str:
         """Génère la grille de mise à jour des compétences"""
         return self.generer_document_from_template(
             "Modèle Grille de MAJ des compétences.docx",
             session_id,
             participant_id,
-            output_filename=f"grille_competences_{participant_id}.docx"
+            output_filename=f"grille_competences_{participant_id}.docx",
+            contexte=contexte
         )
     
-    def generer_contrat_formateur(self, session_id: str) -> str:
+    def generer_contrat_formateur(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère le contrat formateur"""
         return self.generer_document_from_template(
             "Modèle Contrat Formateur.docx",
             session_id,
-            output_filename=f"contrat_formateur_{session_id}.docx"
+            output_filename=f"contrat_formateur_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_deroule_pedagogique(self, session_id: str) -> str:
+    def generer_deroule_pedagogique(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère le déroulé pédagogique"""
         return self.generer_document_from_template(
             "Modèle Déroulé Pédagogique.docx",
             session_id,
-            output_filename=f"deroule_pedagogique_{session_id}.docx"
+            output_filename=f"deroule_pedagogique_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_questionnaire_formateur(self, session_id: str) -> str:
+    def generer_questionnaire_formateur(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère le questionnaire formateur"""
         return self.generer_document_from_template(
             "Modèle Questionnaire Formateur.docx",
             session_id,
-            output_filename=f"questionnaire_formateur_{session_id}.docx"
+            output_filename=f"questionnaire_formateur_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_evaluation_opco(self, session_id: str) -> str:
+    def generer_evaluation_opco(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère l'évaluation OPCO"""
         return self.generer_document_from_template(
             "Modèle Évaluation OPCO.docx",
             session_id,
-            output_filename=f"evaluation_opco_{session_id}.docx"
+            output_filename=f"evaluation_opco_{session_id}.docx",
+            contexte=contexte
         )
     
-    def generer_traitement_reclamations(self, session_id: str) -> str:
+    def generer_traitement_reclamations(self, session_id: str, contexte: SessionContext = None) -> str:
         """Génère le document de traitement des réclamations"""
         return self.generer_document_from_template(
             "Modèle Traitement des réclamations majeures.docx",
             session_id,
-            output_filename=f"traitement_reclamations_{session_id}.docx"
+            output_filename=f"traitement_reclamations_{session_id}.docx",
+            contexte=contexte
+        )
+    
+    # ============================================
+    # CONVERSION EN PDF
+    # ============================================
+    
+    def convertir_pdf(self, documents: List[Dict]) -> List[Dict]:
+        """
+        Ajoute la version PDF des documents générés (conversions réparties sur le pool soffice)
+        
+        Args:
+            documents: Documents d'une phase ({'type', 'path', 'name', 'document', 'inchange'})
+            
+        Returns:
+            Les mêmes documents, complétés par 'pdf' (chemin du PDF), 'document_pdf'
+            (DocumentRendu en mémoire) ou 'erreur_pdf' si la conversion a échoué
+        """
+        convertisseur = self.convertisseur_pdf or get_convertisseur_pdf()
+        
+        conversions = []
+        for document in documents:
+            rendu = document.get('document')
+            if rendu is None:
+                # .docx conservé (entrées inchangées) et déjà converti : le PDF est à jour
+                chemin_pdf = os.path.splitext(document['path'])[0] + '.pdf'
+                if (document.get('inchange') and os.path.exists(chemin_pdf)
+                        and os.path.getmtime(chemin_pdf) >= os.path.getmtime(document['path'])):
+                    document['pdf'] = chemin_pdf
+                    continue
+            conversions.append((document, convertisseur.soumettre(rendu or document['path'])))
+        
+        for document, conversion in conversions:
+            try:
+                contenu = conversion.result()
+            except Exception as e:
+                print(f"Erreur lors de la conversion en PDF de {document['name']}: {str(e)}")
+                document['erreur_pdf'] = str(e)
+                continue
+            if document.get('document') is not None:
+                document['document_pdf'] = rendu_pdf(document['document'], contenu)
+            else:
+                chemin_pdf = os.path.splitext(document['path'])[0] + '.pdf'
+                with open(chemin_pdf, 'wb') as f:
+                    f.write(contenu)
+                document['pdf'] = chemin_pdf
+        return documents
+    
+    # ============================================
+    # RENDU PAR LOT (SÉRIE OU PARALLÈLE)
+    # ============================================
+    
+    def executer_taches(
+        self,
+        session_id: str,
+        taches: List[Tuple[str, Optional[str]]],
+        contexte: SessionContext,
+        parallele: bool = False
+    ) -> List[Dict]:
+        """
+        Génère une liste de documents, en série ou dans un pool de processus
+        
+        Args:
+            session_id: ID de la session
+            taches: Liste de (méthode generer_*, participant_id ou None)
+            contexte: Données de la session déjà chargées
+            parallele: Répartir le rendu sur plusieurs processus
+            
+        Returns:
+            Un résultat par tâche, dans l'ordre des tâches :
+            {'success': True, 'path': ...} ou {'success': False, 'error': ...}
+            ('document' contient le DocumentRendu en l'absence de dossier de sortie,
+            'inchange' indique un fichier existant conservé car ses entrées n'ont pas changé)
+        """
+        if parallele and len(taches) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_initialiser_processus,
+                initargs=(self.templates_dir, self.output_dir, contexte, self.incremental)
+            ) as executor:
+                resultats = list(executor.map(
+                    _rendre_tache_processus,
+                    [(methode, session_id, participant_id) for methode, participant_id in taches]
+                ))
+        else:
+            resultats = [
+                _rendre_tache(self, methode, session_id, participant_id, contexte)
+                for methode, participant_id in taches
+            ]
+        
+        for resultat in resultats:
+            self.avertissements.extend(resultat.pop('avertissements', []))
+        return resultats
+    
+    def _generer_phase(self, phase: str, session_id: str, elements: List[Dict],
+                       contexte: SessionContext, parallele: bool) -> Dict:
+        """
+        Génère les documents d'une phase en isolant les erreurs document par document
+        
+        Args:
+            phase: Nom de la phase
+            session_id: ID de la session
+            elements: Liste de {'methode', 'participant_id', 'type', 'name', 'erreur'}
+            contexte: Données de la session déjà chargées
+            parallele: Répartir le rendu sur plusieurs processus
+        """
+        debut_avertissements = len(self.avertissements)
+        resultats = self.executer_taches(
+            session_id,
+            [(element['methode'], element.get('participant_id')) for element in elements],
+            contexte,
+            parallele
         )
+        
+        documents = []
+        for element, resultat in zip(elements, resultats):
+            if resultat['success']:
+                document = {
+                    'type': element['type'],
+                    'path': resultat['path'],
+                    'name': element['name']
+                }
+                if 'document' in resultat:
+                    document['document'] = resultat['document']
+                if resultat.get('inchange'):
+                    document['inchange'] = True
+                documents.append(document)
+            else:
+                print(f"{element['erreur']}: {resultat['error']}")
+        
+        # Version PDF des documents (le rendu en processus séparés est déjà terminé)
+        if self.convertisseur_pdf is not None:
+            self.convertir_pdf(documents)
+        
+        return {
+            'success': True,
+            'documents': documents,
+            'phase': phase,
+            'count': len(documents),
+            'inchanges': sum(1 for document in documents if document.get('inchange')),
+            'avertissements': self.avertissements[debut_avertissements:]
+        }
     
     # ============================================
     # GÉNÉRATION COMPLÈTE
     # ============================================
     
-    def generer_tous_documents_session(self, session_id: str) -> Dict[str, List[str]]:
+    def generer_tous_documents_session(
+        self,
+        session_id: str,
+        contexte: SessionContext = None,
+        parallele: bool = False
+    ) -> Dict[str, List[str]]:
         """
         Génère tous les documents pour une session
         
+        Args:
+            session_id: ID de la session
+            contexte: Données de la session déjà chargées (optionnel)
+            parallele: Répartir le rendu sur plusieurs processus
+        
         Returns:
             Dict avec les chemins des fichiers générés par type
         """
@@ -484,49 +856,47 @@ class TemplateDocumentGenerator:
         }
         
         try:
+            # Charger une seule fois les données de la session
+            contexte = contexte or self.charger_contexte(session_id)
+            
             # Documents session
-            documents_generes['proposition'].append(self.generer_proposition(session_id))
-            documents_generes['convention'].append(self.generer_convention(session_id))
-            documents_generes['programme'].append(self.generer_programme(session_id))
-            documents_generes['autres'].append(self.generer_reglement_interieur(session_id))
-            documents_generes['emargements'].append(self.generer_feuille_emargement_entreprise(session_id))
+            taches = [
+                ('proposition', 'generer_proposition', None),
+                ('convention', 'generer_convention', None),
+                ('programme', 'generer_programme', None),
+                ('autres', 'generer_reglement_interieur', None),
+                ('emargements', 'generer_feuille_emargement_entreprise', None),
+            ]
             
             # Documents par participant
-            participants = self.get_participants(session_id)
-            for participant in participants:
+            for participant in contexte.participants:
                 participant_id = participant['id']
-                
-                # Convocations
-                documents_generes['convocations'].append(
-                    self.generer_convocation(session_id, participant_id)
-                )
-                
-                # Émargements individuels
-                documents_generes['emargements'].append(
-                    self.generer_feuille_emargement_individuelle(session_id, participant_id)
-                )
-                
-                # Questionnaires et évaluations
-                documents_generes['evaluations'].append(
-                    self.generer_questionnaire_prealable(session_id, participant_id)
-                )
-                documents_generes['evaluations'].append(
-                    self.generer_evaluation_chaud(session_id, participant_id)
-                )
-                documents_generes['evaluations'].append(
-                    self.generer_evaluation_froid(session_id, participant_id)
-                )
+                taches += [
+                    ('convocations', 'generer_convocation', participant_id),
+                    ('emargements', 'generer_feuille_emargement_individuelle', participant_id),
+                    ('evaluations', 'generer_questionnaire_prealable', participant_id),
+                    ('evaluations', 'generer_evaluation_chaud', participant_id),
+                    ('evaluations', 'generer_evaluation_froid', participant_id),
+                ]
                 
                 # Certificats (à générer après la formation)
-                # documents_generes['certificats'].append(
-                #     self.generer_certificat(session_id, participant_id)
-                # )
+                # taches.append(('certificats', 'generer_certificat', participant_id))
             
             # Évaluation client
-            documents_generes['evaluations'].append(
-                self.generer_evaluation_client(session_id)
+            taches.append(('evaluations', 'generer_evaluation_client', None))
+            
+            resultats = self.executer_taches(
+                session_id,
+                [(methode, participant_id) for _, methode, participant_id in taches],
+                contexte,
+                parallele
             )
             
+            for (categorie, _, _), resultat in zip(taches, resultats):
+                if not resultat['success']:
+                    raise RuntimeError(resultat['error'])
+                documents_generes[categorie].append(resultat.get('document') or resultat['path'])
+            
             return documents_generes
             
         except Exception as e:
@@ -537,222 +907,304 @@ class TemplateDocumentGenerator:
     # MÉTHODES DE GÉNÉRATION PAR PHASE
     # ============================================
     
-    def generer_phase_proposition(self, session_id):
+    def generer_phase_proposition(self, session_id, contexte: SessionContext = None, parallele: bool = False):
         """
         PHASE 2 : Génère la proposition et le programme (J+1)
         """
-        documents = []
+        # Charger une seule fois les données de la session
+        contexte = contexte or self.charger_contexte(session_id)
         
-        # Proposition de formation
-        try:
-            proposition = self.generer_proposition(session_id)
-            documents.append({
+        return self._generer_phase('proposition', session_id, [
+            {
+                'methode': 'generer_proposition',
                 'type': 'proposition',
-                'path': proposition,
-                'name': 'Proposition de formation'
-            })
-        except Exception as e:
-            print(f"Erreur génération proposition: {e}")
-        
-        # Programme de formation
-        try:
-            programme = self.generer_programme(session_id)
-            documents.append({
+                'name': 'Proposition de formation',
+                'erreur': 'Erreur génération proposition'
+            },
+            {
+                'methode': 'generer_programme',
                 'type': 'programme',
-                'path': programme,
-                'name': 'Programme de formation'
-            })
-        except Exception as e:
-            print(f"Erreur génération programme: {e}")
-        
-        return {
-            'success': True,
-            'documents': documents,
-            'phase': 'proposition',
-            'count': len(documents)
-        }
+                'name': 'Programme de formation',
+                'erreur': 'Erreur génération programme'
+            },
+        ], contexte, parallele)
     
-    def generer_phase_preparation(self, session_id):
+    def generer_phase_preparation(self, session_id, contexte: SessionContext = None, parallele: bool = False):
         """
         PHASE 4 : Génère les questionnaires préalables (J-7)
         """
-        documents = []
-        
-        # Récupérer les participants
-        participants = self.get_participants_data(session_id)
-        
-        for participant in participants:
-            try:
-                questionnaire = self.generer_questionnaire_prealable(session_id, participant['id'])
-                documents.append({
-                    'type': 'questionnaire_prealable',
-                    'path': questionnaire,
-                    'name': f"Questionnaire préalable - {participant['prenom']} {participant['nom']}"
-                })
-            except Exception as e:
-                print(f"Erreur génération questionnaire pour {participant['nom']}: {e}")
+        # Charger une seule fois les données de la session et les participants
+        contexte = contexte or self.charger_contexte(session_id)
         
-        return {
-            'success': True,
-            'documents': documents,
-            'phase': 'preparation',
-            'count': len(documents)
-        }
+        return self._generer_phase('preparation', session_id, [
+            {
+                'methode': 'generer_questionnaire_prealable',
+                'participant_id': participant['id'],
+                'type': 'questionnaire_prealable',
+                'name': f"Questionnaire préalable - {participant['prenom']} {participant['nom']}",
+                'erreur': f"Erreur génération questionnaire pour {participant['nom']}"
+            }
+            for participant in contexte.participants
+        ], contexte, parallele)
     
-    def generer_phase_convocation(self, session_id):
+    def generer_phase_convocation(self, session_id, contexte: SessionContext = None, parallele: bool = False):
         """
         PHASE 5 : Génère les convocations et feuilles d'émargement (J-4)
         """
-        documents = []
-        
-        # Récupérer les participants
-        participants = self.get_participants_data(session_id)
+        # Charger une seule fois les données de la session et les participants
+        contexte = contexte or self.charger_contexte(session_id)
+        participants = contexte.participants
         
         # Convocations individuelles
-        for participant in participants:
-            try:
-                convocation = self.generer_convocation(session_id, participant['id'])
-                documents.append({
-                    'type': 'convocation',
-                    'path': convocation,
-                    'name': f"Convocation - {participant['prenom']} {participant['nom']}"
-                })
-            except Exception as e:
-                print(f"Erreur génération convocation pour {participant['nom']}: {e}")
+        elements = [
+            {
+                'methode': 'generer_convocation',
+                'participant_id': participant['id'],
+                'type': 'convocation',
+                'name': f"Convocation - {participant['prenom']} {participant['nom']}",
+                'erreur': f"Erreur génération convocation pour {participant['nom']}"
+            }
+            for participant in participants
+        ]
         
-        # Règlement intérieur (commun)
-        try:
-            reglement = self.generer_reglement_interieur(session_id)
-            documents.append({
+        # Règlement intérieur (commun) et feuille d'émargement entreprise
+        elements += [
+            {
+                'methode': 'generer_reglement_interieur',
                 'type': 'reglement_interieur',
-                'path': reglement,
-                'name': 'Règlement intérieur'
-            })
-        except Exception as e:
-            print(f"Erreur génération règlement: {e}")
-        
-        # Feuille d'émargement entreprise
-        try:
-            emargement_entreprise = self.generer_feuille_emargement_entreprise(session_id)
-            documents.append({
+                'name': 'Règlement intérieur',
+                'erreur': 'Erreur génération règlement'
+            },
+            {
+                'methode': 'generer_feuille_emargement_entreprise',
                 'type': 'emargement_entreprise',
-                'path': emargement_entreprise,
-                'name': 'Feuille d\'émargement entreprise'
-            })
-        except Exception as e:
-            print(f"Erreur génération émargement entreprise: {e}")
+                'name': 'Feuille d\'émargement entreprise',
+                'erreur': 'Erreur génération émargement entreprise'
+            },
+        ]
         
         # Feuilles d'émargement individuelles
-        for participant in participants:
-            try:
-                emargement = self.generer_feuille_emargement_individuelle(session_id, participant['id'])
-                documents.append({
-                    'type': 'emargement_individuel',
-                    'path': emargement,
-                    'name': f"Feuille d\'émargement - {participant['prenom']} {participant['nom']}"
-                })
-            except Exception as e:
-                print(f"Erreur génération émargement pour {participant['nom']}: {e}")
+        elements += [
+            {
+                'methode': 'generer_feuille_emargement_individuelle',
+                'participant_id': participant['id'],
+                'type': 'emargement_individuel',
+                'name': f"Feuille d\'émargement - {participant['prenom']} {participant['nom']}",
+                'erreur': f"Erreur génération émargement pour {participant['nom']}"
+            }
+            for participant in participants
+        ]
         
-        return {
-            'success': True,
-            'documents': documents,
-            'phase': 'convocation',
-            'count': len(documents)
-        }
+        return self._generer_phase('convocation', session_id, elements, contexte, parallele)
     
-    def generer_phase_evaluation_chaud(self, session_id):
+    def generer_phase_evaluation_chaud(self, session_id, contexte: SessionContext = None, parallele: bool = False):
         """
         PHASE 7 : Génère les évaluations à chaud (Fin formation)
         """
-        documents = []
-        
-        # Récupérer les participants
-        participants = self.get_participants_data(session_id)
-        
-        for participant in participants:
-            try:
-                evaluation = self.generer_evaluation_chaud(session_id, participant['id'])
-                documents.append({
-                    'type': 'evaluation_chaud',
-                    'path': evaluation,
-                    'name': f"Évaluation à chaud - {participant['prenom']} {participant['nom']}"
-                })
-            except Exception as e:
-                print(f"Erreur génération évaluation chaud pour {participant['nom']}: {e}")
+        # Charger une seule fois les données de la session et les participants
+        contexte = contexte or self.charger_contexte(session_id)
         
-        return {
-            'success': True,
-            'documents': documents,
-            'phase': 'evaluation_chaud',
-            'count': len(documents)
-        }
+        return self._generer_phase('evaluation_chaud', session_id, [
+            {
+                'methode': 'generer_evaluation_chaud',
+                'participant_id': participant['id'],
+                'type': 'evaluation_chaud',
+                'name': f"Évaluation à chaud - {participant['prenom']} {participant['nom']}",
+                'erreur': f"Erreur génération évaluation chaud pour {participant['nom']}"
+            }
+            for participant in contexte.participants
+        ], contexte, parallele)
     
-    def generer_phase_cloture(self, session_id):
+    def generer_phase_cloture(self, session_id, contexte: SessionContext = None, parallele: bool = False):
         """
         PHASE 9 : Génère les certificats et l'évaluation client (J+2)
         """
-        documents = []
-        
-        # Récupérer les participants
-        participants = self.get_participants_data(session_id)
+        # Charger une seule fois les données de la session et les participants
+        contexte = contexte or self.charger_contexte(session_id)
         
         # Certificats individuels
-        for participant in participants:
-            try:
-                certificat = self.generer_certificat(session_id, participant['id'])
-                documents.append({
-                    'type': 'certificat',
-                    'path': certificat,
-                    'name': f"Certificat - {participant['prenom']} {participant['nom']}"
-                })
-            except Exception as e:
-                print(f"Erreur génération certificat pour {participant['nom']}: {e}")
+        elements = [
+            {
+                'methode': 'generer_certificat',
+                'participant_id': participant['id'],
+                'type': 'certificat',
+                'name': f"Certificat - {participant['prenom']} {participant['nom']}",
+                'erreur': f"Erreur génération certificat pour {participant['nom']}"
+            }
+            for participant in contexte.participants
+        ]
         
         # Évaluation satisfaction client
-        try:
-            evaluation_client = self.generer_evaluation_client(session_id)
-            documents.append({
-                'type': 'evaluation_client',
-                'path': evaluation_client,
-                'name': 'Évaluation satisfaction client'
-            })
-        except Exception as e:
-            print(f"Erreur génération évaluation client: {e}")
+        elements.append({
+            'methode': 'generer_evaluation_client',
+            'type': 'evaluation_client',
+            'name': 'Évaluation satisfaction client',
+            'erreur': 'Erreur génération évaluation client'
+        })
         
-        return {
-            'success': True,
-            'documents': documents,
-            'phase': 'cloture',
-            'count': len(documents)
-        }
+        return self._generer_phase('cloture', session_id, elements, contexte, parallele)
     
-    def generer_phase_evaluation_froid(self, session_id):
+    def generer_phase_evaluation_froid(self, session_id, contexte: SessionContext = None, parallele: bool = False):
         """
         PHASE 10 : Génère les évaluations à froid (J+60)
         """
-        documents = []
+        # Charger une seule fois les données de la session et les participants
+        contexte = contexte or self.charger_contexte(session_id)
         
-        # Récupérer les participants
-        participants = self.get_participants_data(session_id)
+        return self._generer_phase('evaluation_froid', session_id, [
+            {
+                'methode': 'generer_evaluation_froid',
+                'participant_id': participant['id'],
+                'type': 'evaluation_froid',
+                'name': f"Évaluation à froid - {participant['prenom']} {participant['nom']}",
+                'erreur': f"Erreur génération évaluation froid pour {participant['nom']}"
+            }
+            for participant in contexte.participants
+        ], contexte, parallele)
+
+    
+    # ============================================
+    # GÉNÉRATION PAR LOT (PLUSIEURS SESSIONS)
+    # ============================================
+    
+    def generer_lot(self, taches: List[Dict], parallele: bool = True) -> Iterator[Dict]:
+        """
+        Génère une liste de documents portant sur plusieurs sessions
         
-        for participant in participants:
-            try:
-                evaluation = self.generer_evaluation_froid(session_id, participant['id'])
-                documents.append({
-                    'type': 'evaluation_froid',
-                    'path': evaluation,
-                    'name': f"Évaluation à froid - {participant['prenom']} {participant['nom']}"
-                })
-            except Exception as e:
-                print(f"Erreur génération évaluation froid pour {participant['nom']}: {e}")
+        Les données de chaque session sont chargées une seule fois pour tout le lot.
+        En mode parallèle, les résultats sont produits au fur et à mesure de la
+        fin des rendus (le champ 'index' donne la position de la tâche).
         
-        return {
-            'success': True,
-            'documents': documents,
-            'phase': 'evaluation_froid',
-            'count': len(documents)
-        }
+        Args:
+            taches: Liste de {'method', 'session_id', 'participant_id' (optionnel)}
+            parallele: Répartir le rendu sur plusieurs processus
+            
+        Yields:
+            {'index', 'method', 'session_id', 'participant_id', 'success', 'path' ou 'error', 'avertissements'}
+        """
+        contextes = self.charger_contextes([tache['session_id'] for tache in taches])
+        
+        a_rendre = []
+        for index, tache in enumerate(taches):
+            resultat = {
+                'index': index,
+                'method': tache['method'],
+                'session_id': tache['session_id'],
+                'participant_id': tache.get('participant_id')
+            }
+            contexte = contextes[tache['session_id']]
+            if isinstance(contexte, Exception):
+                resultat.update({'success': False, 'error': str(contexte), 'avertissements': []})
+                yield resultat
+            elif tache['method'].startswith('_') or not tache['method'].startswith('generer_') \
+                    or not hasattr(self, tache['method']):
+                resultat.update({'success': False, 'error': f"Méthode {tache['method']} non trouvée", 'avertissements': []})
+                yield resultat
+            else:
+                a_rendre.append((resultat, contexte))
+        
+        if parallele and len(a_rendre) > 1:
+            with ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                initializer=_initialiser_processus,
+                initargs=(self.templates_dir, self.output_dir, None, self.incremental)
+            ) as executor:
+                futures = {
+                    executor.submit(
+                        _rendre_tache_lot,
+                        (resultat['method'], resultat['session_id'], resultat['participant_id'], contexte)
+                    ): resultat
+                    for resultat, contexte in a_rendre
+                }
+                for future in as_completed(futures):
+                    resultat = futures[future]
+                    resultat.update(future.result())
+                    self.avertissements.extend(resultat['avertissements'])
+                    yield resultat
+        else:
+            for resultat, contexte in a_rendre:
+                resultat.update(_rendre_tache(
+                    self, resultat['method'], resultat['session_id'], resultat['participant_id'], contexte
+                ))
+                self.avertissements.extend(resultat['avertissements'])
+                yield resultat
+
+
+# ============================================
+# EMPREINTE DES DOCUMENTS GÉNÉRÉS
+# ============================================
+
+_IDENTIFIANT_DOCX = re.compile(r'<dc:identifier>([0-9a-f]{64})</dc:identifier>')
+
+
+def lire_empreinte_docx(chemin: str) -> Optional[str]:
+    """
+    Lit l'empreinte des entrées enregistrée dans un .docx généré
+    (propriétés du document uniquement, sans charger le contenu)
+    
+    Returns:
+        Empreinte, ou None si le fichier n'existe pas ou n'en contient pas
+    """
+    try:
+        with zipfile.ZipFile(chemin) as archive:
+            proprietes = archive.read('docProps/core.xml').decode('utf-8')
+    except (OSError, KeyError, zipfile.BadZipFile):
+        return None
+    trouve = _IDENTIFIANT_DOCX.search(proprietes)
+    return trouve.group(1) if trouve else None
+
+
+# ============================================
+# RENDU DANS LES PROCESSUS DU POOL
+# ============================================
+
+# Générateur propre à chaque processus du pool (templates gardés en cache entre deux tâches)
+_generateur_processus = None
+_contexte_processus = None
+
+
+def _initialiser_processus(templates_dir: str, output_dir: str, contexte: SessionContext,
+                           incremental: bool = True):
+    """Crée le générateur du processus, sans client Supabase : les données viennent du contexte"""
+    global _generateur_processus, _contexte_processus
+    _generateur_processus = TemplateDocumentGenerator(None, templates_dir, output_dir=output_dir,
+                                                      incremental=incremental)
+    _contexte_processus = contexte
+
+
+def _rendre_tache(generateur, methode: str, session_id: str, participant_id: Optional[str],
+                  contexte: SessionContext) -> Dict:
+    """Génère un document et capture l'erreur éventuelle pour ne pas interrompre le lot"""
+    debut_avertissements = len(generateur.avertissements)
+    debut_inchanges = len(generateur.inchanges)
+    try:
+        args = (session_id, participant_id) if participant_id else (session_id,)
+        document = getattr(generateur, methode)(*args, contexte=contexte)
+        if isinstance(document, DocumentRendu):
+            resultat = {'success': True, 'path': document.chemin, 'document': document}
+        else:
+            resultat = {'success': True, 'path': document}
+    except Exception as e:
+        resultat = {'success': False, 'error': str(e)}
+    resultat['avertissements'] = generateur.avertissements[debut_avertissements:]
+    del generateur.avertissements[debut_avertissements:]
+    if len(generateur.inchanges) > debut_inchanges:
+        resultat['inchange'] = True
+    del generateur.inchanges[debut_inchanges:]
+    return resultat
+
+
+def _rendre_tache_processus(tache: Tuple[str, str, Optional[str]]) -> Dict:
+    """Point d'entrée d'une tâche dans un processus du pool"""
+    methode, session_id, participant_id = tache
+    return _rendre_tache(_generateur_processus, methode, session_id, participant_id, _contexte_processus)
+
+
+def _rendre_tache_lot(tache: Tuple[str, str, Optional[str], SessionContext]) -> Dict:
+    """Point d'entrée d'une tâche d'un lot multi-sessions (le contexte accompagne la tâche)"""
+    methode, session_id, participant_id, contexte = tache
+    return _rendre_tache(_generateur_processus, methode, session_id, participant_id, contexte)
+
 
 if __name__ == "__main__":
     from supabase import create_client
@@ -772,6 +1224,21 @@ if __name__ == "__main__":
     # Créer le générateur
     generator = TemplateDocumentGenerator(supabase)
     
+    # Rendu réparti sur plusieurs processus pour les méthodes par phase
+    parallele = '--parallele' in sys.argv
+    if parallele:
+        sys.argv.remove('--parallele')
+    
+    # Régénérer même les documents dont les entrées n'ont pas changé
+    if '--forcer' in sys.argv:
+        sys.argv.remove('--forcer')
+        generator.incremental = False
+    
+    # Ajouter la version PDF des documents (pool LibreOffice)
+    if '--pdf' in sys.argv:
+        sys.argv.remove('--pdf')
+        generator.convertisseur_pdf = get_convertisseur_pdf()
+    
     # Gestion des arguments en ligne de commande
     if len(sys.argv) > 1:
         method_name = sys.argv[1]
@@ -783,7 +1250,9 @@ if __name__ == "__main__":
             method = getattr(generator, method_name)
             
             try:
-                if participant_id:
+                if parallele:
+                    result = method(session_id, parallele=True)
+                elif participant_id:
                     result = method(session_id, participant_id)
                 elif session_id:
                     result = method(session_id)
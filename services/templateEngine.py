@@ -0,0 +1,195 @@
+"""
+Moteur de Substitution des Placeholders
+=======================================
+Syntaxe commune aux templates Word : {{nom_variable}}
+Utilisé par TemplateDocumentGenerator et par les scripts de préparation des templates
+Date: 18 octobre 2026
+Version: 1.0
+"""
+
+import re
+from typing import Dict, List, Tuple
+
+from docx.oxml.ns import qn
+
+# Placeholder valide : {{nom_variable}}
+PLACEHOLDER_PATTERN = re.compile(r'\{\{(\w+)\}\}')
+
+# Tout ce qui ressemble à un placeholder, valide ou non (ex: {{ nom }}, {{date-debut}})
+CANDIDAT_PATTERN = re.compile(r'\{\{[^{}]*\}\}')
+
+
+def placeholder(nom: str) -> str:
+    """Construit le placeholder correspondant à un nom de variable"""
+    return '{{' + nom + '}}'
+
+
+def substituer(texte: str, variables: Dict) -> Tuple[str, List[str]]:
+    """
+    Remplace tous les placeholders d'un texte en une seule passe
+
+    Args:
+        texte: Texte contenant des placeholders
+        variables: Valeurs indexées par placeholder ('{{nom}}') ou par nom ('nom')
+
+    Returns:
+        Tuple (texte remplacé, noms des placeholders inconnus laissés en place)
+    """
+    inconnus = []
+
+    def remplacer(match):
+        if match.group(0) in variables:
+            return str(variables[match.group(0)])
+        if match.group(1) in variables:
+            return str(variables[match.group(1)])
+        inconnus.append(match.group(1))
+        return match.group(0)
+
+    return PLACEHOLDER_PATTERN.sub(remplacer, texte), inconnus
+
+
+def extraire_placeholders(texte: str) -> List[str]:
+    """Retourne les noms des placeholders valides présents dans un texte"""
+    return PLACEHOLDER_PATTERN.findall(texte)
+
+
+def placeholders_malformes(texte: str) -> List[str]:
+    """Retourne les placeholders qui ne respectent pas la syntaxe {{nom_variable}}"""
+    return [c for c in CANDIDAT_PATTERN.findall(texte) if not PLACEHOLDER_PATTERN.fullmatch(c)]
+
+
+# Éléments d'un run qui produisent du texte sans être des w:t : ils interrompent un placeholder
+SEPARATEUR = '\x00'
+
+
+def _paragraphe_parent(element):
+    """Retourne le w:p le plus proche contenant l'élément"""
+    parent = element.getparent()
+    while parent is not None and parent.tag != qn('w:p'):
+        parent = parent.getparent()
+    return parent
+
+
+def fusionner_placeholders_coupes(paragraphe) -> int:
+    """
+    Regroupe dans un seul w:t les placeholders que Word a répartis sur plusieurs runs
+
+    Le texte du placeholder est déplacé dans le premier w:t concerné ; les w:t
+    suivants ne gardent que le texte situé hors du placeholder, avec leur mise en forme.
+
+    Args:
+        paragraphe: Élément XML w:p
+
+    Returns:
+        Nombre de placeholders fusionnés
+    """
+    segments = []
+    for element in paragraphe.iter(qn('w:t'), qn('w:tab'), qn('w:br'), qn('w:cr')):
+        if _paragraphe_parent(element) is not paragraphe:
+            continue
+        if element.tag == qn('w:t'):
+            segments.append((element, element.text or ''))
+        else:
+            segments.append((None, SEPARATEUR))
+
+    texte = ''.join(contenu for _, contenu in segments)
+    if '{{' not in texte:
+        return 0
+
+    # Position de début de chaque segment dans le texte du paragraphe
+    debuts = []
+    position = 0
+    for _, contenu in segments:
+        debuts.append(position)
+        position += len(contenu)
+
+    def segment_a(position):
+        index = 0
+        while index + 1 < len(debuts) and debuts[index + 1] <= position:
+            index += 1
+        return index
+
+    fusions = 0
+    # Traitement de la fin vers le début pour conserver les positions déjà calculées
+    for match in reversed(list(PLACEHOLDER_PATTERN.finditer(texte))):
+        premier = segment_a(match.start())
+        dernier = segment_a(match.end() - 1)
+        if premier == dernier:
+            continue
+
+        t_premier = segments[premier][0]
+        t_dernier = segments[dernier][0]
+        t_premier.text = (t_premier.text or '')[:match.start() - debuts[premier]] + match.group(0)
+        for t_milieu, _ in segments[premier + 1:dernier]:
+            t_milieu.text = ''
+        t_dernier.text = (t_dernier.text or '')[match.end() - debuts[dernier]:]
+
+        for t in (t_premier, t_dernier):
+            t.set(qn('xml:space'), 'preserve')
+        fusions += 1
+
+    return fusions
+
+
+def normaliser_placeholders(racine) -> int:
+    """Fusionne les placeholders coupés dans tous les paragraphes d'une partie XML"""
+    return sum(fusionner_placeholders_coupes(p) for p in racine.iter(qn('w:p')))
+
+
+def _paragraphes(doc):
+    """Parcourt tous les paragraphes du document (corps, tableaux, en-têtes, pieds de page)"""
+    def paragraphes_conteneur(conteneur):
+        for paragraph in conteneur.paragraphs:
+            yield paragraph
+        for table in conteneur.tables:
+            for row in table.rows:
+                for cell in row.cells:
+                    yield from paragraphes_conteneur(cell)
+
+    yield from paragraphes_conteneur(doc)
+    for section in doc.sections:
+        yield from paragraphes_conteneur(section.header)
+        yield from paragraphes_conteneur(section.footer)
+
+
+def verifier_document(doc, variables_connues=None) -> List[Dict]:
+    """
+    Vérifie la syntaxe des placeholders d'un document Word
+
+    Args:
+        doc: Document Word
+        variables_connues: Noms de variables attendus (optionnel)
+
+    Returns:
+        Liste d'avertissements {'type', 'placeholder', 'texte'}
+    """
+    avertissements = []
+    for paragraph in _paragraphes(doc):
+        texte = paragraph.text
+        if '{{' not in texte:
+            continue
+        for candidat in placeholders_malformes(texte):
+            avertissements.append({
+                'type': 'malforme',
+                'placeholder': candidat,
+                'texte': texte
+            })
+        if variables_connues is not None:
+            for nom in extraire_placeholders(texte):
+                if nom not in variables_connues and placeholder(nom) not in variables_connues:
+                    avertissements.append({
+                        'type': 'inconnu',
+                        'placeholder': nom,
+                        'texte': texte
+                    })
+        dans_un_run = set()
+        for run in paragraph.runs:
+            dans_un_run.update(extraire_placeholders(run.text))
+        for nom in extraire_placeholders(texte):
+            if nom not in dans_un_run:
+                avertissements.append({
+                    'type': 'coupe',
+                    'placeholder': nom,
+                    'texte': texte
+                })
+    return avertissements
@@ -0,0 +1,14 @@
+"""
+Configuration des tests : les services Python et les utilitaires d'automatisation
+sont importés comme dans leurs scripts (dossiers ajoutés au chemin d'import)
+"""
+
+import os
+import sys
+
+RACINE = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+for dossier in ('services', 'automation'):
+    chemin = os.path.join(RACINE, dossier)
+    if chemin not in sys.path:
+        sys.path.insert(0, chemin)
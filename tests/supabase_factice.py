@@ -0,0 +1,185 @@
+"""
+Client Supabase factice pour les tests : tables en mémoire et requêtes
+PostgREST interprétées (filtres, or_ imbriqués, tri NULLS LAST, limit,
+colonnes JSON metadata->>cle) et buckets Storage en mémoire
+"""
+
+
+def _valeur(ligne, colonne):
+    """Valeur d'une colonne, ou d'une clé d'une colonne JSON (metadata->>cle)"""
+    if '->>' in colonne:
+        colonne, cle = colonne.split('->>', 1)
+        return (ligne.get(colonne) or {}).get(cle)
+    return ligne.get(colonne)
+
+
+def _separer(expression):
+    """Découpe une liste de conditions PostgREST au premier niveau de parenthèses"""
+    termes, profondeur, debut = [], 0, 0
+    for index, caractere in enumerate(expression):
+        if caractere == '(':
+            profondeur += 1
+        elif caractere == ')':
+            profondeur -= 1
+        elif caractere == ',' and profondeur == 0:
+            termes.append(expression[debut:index])
+            debut = index + 1
+    termes.append(expression[debut:])
+    return termes
+
+
+def _condition(terme):
+    """Condition PostgREST (col.op.valeur, and(...), or(...)) en fonction de ligne"""
+    for operateur, combiner in (('and(', all), ('or(', any)):
+        if terme.startswith(operateur):
+            conditions = [_condition(t) for t in _separer(terme[len(operateur):-1])]
+            return lambda ligne: combiner(c(ligne) for c in conditions)
+
+    colonne, operateur, valeur = terme.split('.', 2)
+    if operateur == 'is':
+        assert valeur == 'null'
+        return lambda ligne: _valeur(ligne, colonne) is None
+    comparaisons = {
+        'eq': lambda a, b: a == b,
+        'neq': lambda a, b: a != b,
+        'gt': lambda a, b: a > b,
+        'gte': lambda a, b: a >= b,
+        'lt': lambda a, b: a < b,
+        'lte': lambda a, b: a <= b,
+    }
+    comparer = comparaisons[operateur]
+    # Comparaison SQL : NULL ne satisfait aucune comparaison
+    return lambda ligne: _valeur(ligne, colonne) is not None and comparer(str(_valeur(ligne, colonne)), valeur)
+
+
+class Reponse:
+    def __init__(self, data, count=None):
+        self.data = data
+        self.count = count
+
+
+class RequeteFactice:
+    """Sous-ensemble du query builder postgrest-py utilisé par les utilitaires"""
+
+    def __init__(self, base, table):
+        self.base = base
+        self.table = table
+        self.filtres = []
+        self.tris = []
+        self.limite = None
+        self.compter = False
+        self.insertion = None
+        self.colonnes = '*'
+
+    def select(self, colonnes='*', count=None):
+        self.colonnes = colonnes
+        self.compter = count == 'exact'
+        return self
+
+    def _filtre(self, terme):
+        self.filtres.append(_condition(terme))
+        return self
+
+    def insert(self, lignes):
+        self.insertion = [dict(l) for l in (lignes if isinstance(lignes, list) else [lignes])]
+        return self
+
+    def eq(self, colonne, valeur):
+        return self._filtre(f'{colonne}.eq.{valeur}')
+
+    def neq(self, colonne, valeur):
+        return self._filtre(f'{colonne}.neq.{valeur}')
+
+    def in_(self, colonne, valeurs):
+        valeurs = {str(v) for v in valeurs}
+        self.filtres.append(lambda ligne: _valeur(ligne, colonne) is not None and str(_valeur(ligne, colonne)) in valeurs)
+        return self
+
+    def gt(self, colonne, valeur):
+        return self._filtre(f'{colonne}.gt.{valeur}')
+
+    def gte(self, colonne, valeur):
+        return self._filtre(f'{colonne}.gte.{valeur}')
+
+    def lt(self, colonne, valeur):
+        return self._filtre(f'{colonne}.lt.{valeur}')
+
+    def is_(self, colonne, valeur):
+        return self._filtre(f'{colonne}.is.{valeur}')
+
+    def or_(self, expression):
+        return self._filtre(f'or({expression})')
+
+    def order(self, colonne, desc=False):
+        self.tris.append((colonne, desc))
+        return self
+
+    def limit(self, nombre):
+        self.limite = nombre
+        return self
+
+    def execute(self):
+        self.base.requetes.append(self)
+        if self.insertion is not None:
+            table = self.base.tables.setdefault(self.table, [])
+            for ligne in self.insertion:
+                ligne.setdefault('id', f'{self.table}-{len(table) + 1}')
+                table.append(ligne)
+            return Reponse([dict(l) for l in self.insertion])
+        lignes = [dict(l) for l in self.base.tables.get(self.table, []) if all(f(l) for f in self.filtres)]
+        total = len(lignes)
+        # Tri stable de la dernière clé vers la première ; NULLS LAST en ordre croissant
+        for colonne, desc in reversed(self.tris):
+            lignes.sort(key=lambda l: (l.get(colonne) is None, str(l.get(colonne))), reverse=desc)
+        # limit(), puis limite max-rows de PostgREST (select trop large tronqué sans erreur)
+        for limite in (self.limite, self.base.max_lignes):
+            if limite:
+                lignes = lignes[:limite]
+        resultat = Reponse(lignes, total if self.compter else None)
+        if self.base.apres_requete:
+            self.base.apres_requete(self)
+        return resultat
+
+
+class BucketFactice:
+    """Bucket Storage en mémoire (chemin -> contenu)"""
+
+    def __init__(self, fichiers):
+        self.fichiers = fichiers
+
+    def upload(self, chemin, contenu, options=None):
+        self.fichiers[chemin] = contenu
+        return {'Key': chemin}
+
+    def download(self, chemin):
+        return self.fichiers[chemin]
+
+    def create_signed_urls(self, chemins, expiration):
+        return [{'path': chemin, 'signedURL': f'/signe/{chemin}'} for chemin in chemins]
+
+    def remove(self, chemins):
+        for chemin in chemins:
+            self.fichiers.pop(chemin, None)
+        return [{'name': chemin} for chemin in chemins]
+
+
+class StockageFactice:
+    def __init__(self):
+        self.buckets = {}
+
+    def from_(self, bucket):
+        return BucketFactice(self.buckets.setdefault(bucket, {}))
+
+
+class SupabaseFactice:
+    """Client avec table(nom) et storage ; apres_requete permet de modifier les données entre deux pages"""
+
+    def __init__(self, tables, max_lignes=None):
+        self.tables = tables
+        self.max_lignes = max_lignes
+        self.requetes = []
+        self.apres_requete = None
+        self.storage = StockageFactice()
+
+    def table(self, nom):
+        return RequeteFactice(self, nom)
@@ -0,0 +1,57 @@
+"""
+Tests des index en mémoire de DataAccess sur des tables plus grandes que max-rows
+"""
+
+import pytest
+
+from utils import supabase_client
+from utils.data_access import DataAccess
+from utils.supabase_client import SupabaseClient
+
+from supabase_factice import SupabaseFactice
+
+NOMBRE_PARTICIPANTS = 2500
+
+
+@pytest.fixture
+def base():
+    participants = [
+        {'id': f'p{i:05d}', 'session_formation_id': f's{i % 50:02d}', 'nom': f'Nom {i}'}
+        for i in range(NOMBRE_PARTICIPANTS)
+    ]
+    # Limite max-rows de PostgREST (1000 par défaut sur Supabase)
+    return SupabaseFactice({'participants': participants}, max_lignes=1000)
+
+
+@pytest.fixture
+def acces(base, monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', 'http://localhost')
+    monkeypatch.setenv('SUPABASE_KEY', 'cle')
+    monkeypatch.setenv('SUPABASE_CACHE', '')
+    monkeypatch.setattr(supabase_client, 'create_client', lambda url, cle: base)
+    return DataAccess(SupabaseClient())
+
+
+def test_index_complet_au_dela_de_max_rows(acces):
+    index = acces.index_table('participants')
+
+    assert len(index) == NOMBRE_PARTICIPANTS
+    assert index.get('p02499')['nom'] == 'Nom 2499'
+    assert len(index.get_by_session('s49')) == NOMBRE_PARTICIPANTS // 50
+
+
+def test_index_charge_une_seule_fois(acces, base):
+    acces.index_table('participants')
+    nombre = len(base.requetes)
+
+    assert acces.get_participant('p01234')['nom'] == 'Nom 1234'
+    assert len(acces.get_session_participants('s07')) == NOMBRE_PARTICIPANTS // 50
+    assert len(base.requetes) == nombre
+
+
+def test_invalider_recharge_l_index(acces, base):
+    acces.index_table('participants')
+    base.tables['participants'].append({'id': 'p99999', 'session_formation_id': 's00', 'nom': 'Nouveau'})
+    acces.invalider('participants')
+
+    assert acces.get_participant('p99999')['nom'] == 'Nouveau'
@@ -0,0 +1,190 @@
+"""
+Tests du pool soffice (docxPdfConverter) avec un faux soffice et un faux module uno
+
+Le faux uno n'est importable que par l'interpréteur du client UNO (mode pilote) :
+les tests vérifient que soffice reste démarré entre les conversions même quand
+uno n'est pas importable dans le processus principal.
+"""
+
+import os
+import stat
+import sys
+import textwrap
+
+import pytest
+
+import docxPdfConverter
+from docxPdfConverter import ConvertisseurPdf, DelaiConversionDepasse, ErreurConversion
+
+FAUX_SOFFICE = '''\
+#!{python}
+import os, sys, time
+dossier = os.environ['FAUX_SOFFICE_DIR']
+with open(os.path.join(dossier, 'lancements.log'), 'a') as f:
+    f.write(' '.join(sys.argv[1:]) + '\\n')
+accept = [a for a in sys.argv if a.startswith('--accept=')]
+if accept:
+    pipe = accept[0].split('name=')[1].split(';')[0]
+    arret = os.path.join(dossier, 'arret_' + pipe)
+    while not os.path.exists(arret):
+        time.sleep(0.02)
+elif '--convert-to' in sys.argv:
+    sortie, source = sys.argv[sys.argv.index('--outdir') + 1], sys.argv[-1]
+    nom = os.path.splitext(os.path.basename(source))[0] + '.pdf'
+    with open(source, 'rb') as f, open(os.path.join(sortie, nom), 'wb') as pdf:
+        pdf.write(b'%PDF ligne ' + f.read())
+'''
+
+FAUX_UNO = '''\
+import os, time
+from urllib.parse import unquote, urlparse
+
+DOSSIER = os.environ['FAUX_SOFFICE_DIR']
+
+def _chemin(url):
+    return unquote(urlparse(url).path)
+
+class Propriete:
+    pass
+
+def createUnoStruct(nom):
+    return Propriete()
+
+class Document:
+    def __init__(self, source):
+        self.source = source
+    def storeToURL(self, url, proprietes):
+        with open(self.source, 'rb') as f:
+            contenu = f.read()
+        if contenu == b'bloque':
+            time.sleep(60)
+        with open(_chemin(url), 'wb') as f:
+            f.write(b'%PDF uno ' + contenu)
+    def close(self, forcer):
+        pass
+
+class Desktop:
+    def __init__(self, pipe):
+        self.pipe = pipe
+    def loadComponentFromURL(self, url, cadre, options, proprietes):
+        source = _chemin(url)
+        with open(source, 'rb') as f:
+            if f.read() == b'illisible':
+                return None
+        return Document(source)
+    def terminate(self):
+        open(os.path.join(DOSSIER, 'arret_' + self.pipe), 'w').close()
+
+class Resolveur:
+    def resolve(self, url):
+        return Contexte(url.split('name=')[1].split(';')[0])
+
+class Gestionnaire:
+    def __init__(self, pipe=None):
+        self.pipe = pipe
+    def createInstanceWithContext(self, nom, contexte):
+        return Resolveur() if 'Resolver' in nom else Desktop(self.pipe)
+
+class Contexte:
+    def __init__(self, pipe=None):
+        self.ServiceManager = Gestionnaire(pipe)
+
+def getComponentContext():
+    return Contexte()
+'''
+
+
+def _executable(chemin, contenu):
+    chemin.write_text(contenu)
+    chemin.chmod(chemin.stat().st_mode | stat.S_IXUSR)
+    return str(chemin)
+
+
+@pytest.fixture
+def faux_soffice(tmp_path, monkeypatch):
+    """Faux soffice (journal des lancements) et Python du client UNO avec un faux uno"""
+    monkeypatch.setenv('FAUX_SOFFICE_DIR', str(tmp_path))
+    monkeypatch.setattr(docxPdfConverter, 'uno', None)
+    (tmp_path / 'uno_factice').mkdir()
+    (tmp_path / 'uno_factice' / 'uno.py').write_text(FAUX_UNO)
+    python_uno = _executable(tmp_path / 'python_uno', textwrap.dedent(f'''\
+        #!/bin/sh
+        PYTHONPATH={tmp_path / 'uno_factice'} exec {sys.executable} "$@"
+        '''))
+    soffice = _executable(tmp_path / 'soffice', FAUX_SOFFICE.format(python=sys.executable))
+
+    def lancements(option):
+        journal = tmp_path / 'lancements.log'
+        lignes = journal.read_text().splitlines() if journal.exists() else []
+        return [ligne for ligne in lignes if option in ligne]
+
+    return soffice, python_uno, lancements
+
+
+def test_mode_pilote_garde_soffice_demarre(faux_soffice):
+    soffice, python_uno, lancements = faux_soffice
+    with ConvertisseurPdf(workers=1, soffice=soffice, python_uno=python_uno) as convertisseur:
+        resultats = [convertisseur.convertir(f'doc{i}'.encode()) for i in range(5)]
+        statistiques = convertisseur.statistiques()
+
+    assert resultats == [f'%PDF uno doc{i}'.encode() for i in range(5)]
+    assert statistiques['mode'] == 'pilote'
+    assert statistiques['conversions'] == 5
+    assert len(lancements('--accept=')) == 1
+    assert lancements('--convert-to') == []
+
+
+def test_mode_pilote_recycle_apres_conversions_max(faux_soffice):
+    soffice, python_uno, lancements = faux_soffice
+    with ConvertisseurPdf(workers=1, soffice=soffice, python_uno=python_uno, conversions_max=2) as convertisseur:
+        for i in range(5):
+            convertisseur.convertir(f'doc{i}'.encode())
+        assert convertisseur.statistiques()['recyclages'] == 2
+    assert len(lancements('--accept=')) == 3
+
+
+def test_mode_pilote_delai_depasse_relance_soffice(faux_soffice):
+    soffice, python_uno, lancements = faux_soffice
+    with ConvertisseurPdf(workers=1, timeout=1, soffice=soffice, python_uno=python_uno) as convertisseur:
+        with pytest.raises(DelaiConversionDepasse):
+            convertisseur.convertir(b'bloque')
+        assert convertisseur.convertir(b'suivant') == b'%PDF uno suivant'
+        statistiques = convertisseur.statistiques()
+
+    assert statistiques['delais_depasses'] == 1
+    assert statistiques['recyclages'] == 1
+    assert len(lancements('--accept=')) == 2
+
+
+def test_mode_pilote_document_illisible_sans_relance(faux_soffice):
+    soffice, python_uno, lancements = faux_soffice
+    with ConvertisseurPdf(workers=1, soffice=soffice, python_uno=python_uno) as convertisseur:
+        with pytest.raises(ErreurConversion, match="illisible"):
+            convertisseur.convertir(b'illisible')
+        assert convertisseur.convertir(b'suivant') == b'%PDF uno suivant'
+    assert len(lancements('--accept=')) == 1
+
+
+def test_mode_ligne_commande_prepare_le_profil_et_avertit(faux_soffice, monkeypatch, capsys):
+    soffice, _, lancements = faux_soffice
+    monkeypatch.setattr(docxPdfConverter, 'trouver_python_uno', lambda soffice: None)
+    with ConvertisseurPdf(workers=1, soffice=soffice) as convertisseur:
+        assert convertisseur.convertir(b'doc') == b'%PDF ligne doc'
+        assert convertisseur.statistiques()['mode'] == 'ligne_commande'
+
+    assert 'ATTENTION' in capsys.readouterr().err
+    assert len(lancements('--terminate_after_init')) == 1
+    profil = lancements('--terminate_after_init')[0].split('-env:UserInstallation=')[1].split()[0]
+    assert profil in lancements('--convert-to')[0]
+
+
+def test_trouver_python_uno_verifie_l_import(faux_soffice, tmp_path, monkeypatch):
+    soffice, python_uno, _ = faux_soffice
+    monkeypatch.setattr(docxPdfConverter.shutil, 'which', lambda nom: None)
+    monkeypatch.setattr(docxPdfConverter.os.path, 'isfile',
+                        lambda chemin: chemin in (python_uno, sys.executable))
+    monkeypatch.setenv('SOFFICE_PYTHON', python_uno)
+    assert docxPdfConverter.trouver_python_uno(soffice) == python_uno
+
+    monkeypatch.setenv('SOFFICE_PYTHON', sys.executable)
+    assert docxPdfConverter.trouver_python_uno(soffice) is None
@@ -0,0 +1,145 @@
+"""
+Tests de la fusion et du découpage des PDF selon le manifeste des pages
+"""
+
+import io
+
+import pytest
+from pypdf import PdfReader
+from reportlab.lib.pagesizes import A4
+from reportlab.pdfgen import canvas
+
+from documentRendu import DocumentRendu, TYPE_PDF
+from pdfAssembly import decouper_pdf, extraire_pages, extraire_participant, fusionner_documents, fusionner_pdf
+
+from supabase_factice import SupabaseFactice
+
+
+def _pdf(*textes):
+    """PDF d'une page par texte"""
+    buffer = io.BytesIO()
+    pdf = canvas.Canvas(buffer, pagesize=A4, invariant=1)
+    for texte in textes:
+        pdf.drawString(100, 700, texte)
+        pdf.showPage()
+    pdf.save()
+    return buffer.getvalue()
+
+
+def _textes(contenu):
+    return [page.extract_text().strip() for page in PdfReader(io.BytesIO(contenu)).pages]
+
+
+@pytest.fixture
+def documents():
+    return [
+        DocumentRendu('convocation_P1.pdf', _pdf('P1 page 1'), TYPE_PDF, 'convocation'),
+        DocumentRendu('convocation_P2.pdf', _pdf('P2 page 1', 'P2 page 2', 'P2 page 3'), TYPE_PDF, 'convocation'),
+        DocumentRendu('convocation_P3.pdf', _pdf('P3 page 1', 'P3 page 2'), TYPE_PDF, 'convocation'),
+    ]
+
+
+def test_manifeste_de_fusion(documents):
+    dossier = fusionner_documents(documents, 'dossier_S1.pdf', session_id='S1')
+
+    assert dossier.type_document == 'dossier_session'
+    assert dossier.metadata['session_id'] == 'S1'
+    assert dossier.metadata['pages'] == [
+        {'nom_fichier': 'convocation_P1.pdf', 'premiere_page': 1, 'derniere_page': 1},
+        {'nom_fichier': 'convocation_P2.pdf', 'premiere_page': 2, 'derniere_page': 4},
+        {'nom_fichier': 'convocation_P3.pdf', 'premiere_page': 5, 'derniere_page': 6},
+    ]
+    assert len(_textes(dossier.contenu)) == 6
+
+
+def test_fusion_puis_decoupage_aller_retour(documents):
+    dossier = fusionner_documents(documents, 'dossier_S1.pdf')
+
+    extraits = list(decouper_pdf(dossier))
+
+    assert [d.nom_fichier for d in extraits] == [d.nom_fichier for d in documents]
+    for extrait, original in zip(extraits, documents):
+        assert _textes(extrait.contenu) == _textes(original.contenu)
+        assert extrait.type_mime == TYPE_PDF
+
+
+def test_decoupage_deterministe(documents):
+    dossier = fusionner_documents(documents, 'dossier_S1.pdf')
+
+    premier = [d.sha256 for d in decouper_pdf(dossier)]
+    second = [d.sha256 for d in decouper_pdf(dossier)]
+
+    assert premier == second
+
+
+def test_decoupage_a_la_demande():
+    manifeste = [
+        {'participant_id': 'P1', 'nom_fichier': 'a_P1.pdf', 'premiere_page': 1, 'derniere_page': 2},
+        {'participant_id': 'P2', 'nom_fichier': 'a_P2.pdf', 'premiere_page': 3, 'derniere_page': 3},
+    ]
+    combine = DocumentRendu('a_session_S1.pdf', _pdf('P1 a', 'P1 b', 'P2 a'), TYPE_PDF,
+                            'attestation_combine', {'session_id': 'S1', 'pages': manifeste})
+
+    extraits = decouper_pdf(combine, participant_ids=['P2'])
+    extrait = next(extraits)
+
+    assert extrait.nom_fichier == 'a_P2.pdf'
+    assert extrait.type_document == 'attestation'
+    assert extrait.metadata == {'session_id': 'S1', 'participant_id': 'P2'}
+    assert _textes(extrait.contenu) == ['P2 a']
+    assert next(extraits, None) is None
+
+    assert _textes(extraire_participant(combine, 'P1').contenu) == ['P1 a', 'P1 b']
+    with pytest.raises(ValueError):
+        extraire_participant(combine, 'P9')
+
+
+def test_plage_de_pages_invalide():
+    with pytest.raises(ValueError):
+        extraire_pages(_pdf('seule page'), 1, 2)
+    with pytest.raises(ValueError):
+        list(decouper_pdf(_pdf('sans manifeste')))
+
+
+def test_destinations_fichier_et_flux(tmp_path, documents):
+    chemin = str(tmp_path / 'sortie' / 'dossier.pdf')
+    assert fusionner_pdf(documents, chemin) == chemin
+    assert len(_textes(open(chemin, 'rb').read())) == 6
+
+    flux = io.BytesIO()
+    fusionner_pdf([documents[0].contenu], flux)
+    assert _textes(flux.getvalue()) == ['P1 page 1']
+
+
+def test_decoupage_du_pdf_combine_par_session():
+    from documentGeneratorExtended import QualiopisDocumentGeneratorExtended
+
+    base = SupabaseFactice({
+        'vue_sessions_formation': [{
+            'id': 'S1', 'entreprise_nom': 'ACME', 'formation_titre': 'Python', 'formation_duree': 14,
+            'date_debut': '2026-11-02', 'date_fin': '2026-11-03', 'lieu': 'Rennes',
+            'horaire_debut': '09:00', 'horaire_fin': '17:00'
+        }],
+        'organisme_formation': [{
+            'nom': 'ALADE', 'raison_sociale': 'ALADE SAS', 'adresse': '1 rue', 'code_postal': '35400',
+            'ville': 'Saint-Malo', 'email': 'o@x', 'telephone': '01', 'siret': '123',
+            'numero_declaration_activite': '53', 'representant_legal_prenom': 'G',
+            'representant_legal_nom': 'P', 'representant_legal_fonction': 'Gérant'
+        }],
+        'participants': [
+            {'id': f'P{i}', 'session_formation_id': 'S1', 'nom': f'Nom{i}', 'prenom': f'Pre{i}',
+             'email': f'p{i}@x', 'fonction': 'dev'}
+            for i in range(3)
+        ],
+    })
+    generateur = QualiopisDocumentGeneratorExtended(base, output_dir=None)
+
+    resultat = generateur.generer_document_combine('evaluation_a_chaud', 'S1')
+    extraits = {d.metadata['participant_id']: d for d in decouper_pdf(resultat['document'])}
+
+    assert sorted(extraits) == ['P0', 'P1', 'P2']
+    for participant_id, extrait in extraits.items():
+        seul = generateur.generer_evaluation_a_chaud('S1', participant_id)
+        assert extrait.nom_fichier == seul.nom_fichier
+        assert extrait.type_document == 'evaluation_a_chaud'
+        assert _textes(extrait.contenu) == _textes(seul.contenu)
@@ -0,0 +1,124 @@
+"""
+Tests de la régénération incrémentale : empreinte des entrées enregistrée dans
+documents.metadata et document publié repris sans nouveau rendu
+"""
+
+import pytest
+
+from documentGenerator import QualiopisDocumentGenerator
+from templateDocumentGenerator import empreinte_variables
+from utils.document_publisher import DocumentPublisher
+
+from supabase_factice import SupabaseFactice
+
+SESSION = {
+    'id': 's1', 'formation_titre': 'Excel avancé', 'formation_duree': 14, 'lieu': 'Paris',
+    'date_debut': '2026-11-02', 'date_fin': '2026-11-03', 'entreprise_nom': 'ACME',
+}
+ORGANISME = {
+    'nom': 'Formations SA', 'email': 'contact@formations.fr', 'telephone': '0102030405',
+    'representant_legal_nom': 'Martin', 'representant_legal_prenom': 'Claire',
+    'representant_legal_fonction': 'Gérante',
+}
+
+
+@pytest.fixture
+def base():
+    return SupabaseFactice({
+        'vue_sessions_formation': [dict(SESSION)],
+        'organisme_formation': [dict(ORGANISME)],
+        'participants': [{'id': 'p1', 'session_formation_id': 's1', 'nom': 'Durand', 'prenom': 'Léa'}],
+        'documents': [],
+    })
+
+
+def _publier(base, rendu):
+    return DocumentPublisher(base, 'documents').publier([{
+        'contenu': rendu.contenu,
+        'empreinte_entrees': rendu.metadata.get('empreinte_entrees'),
+        'metadata': {
+            'session_formation_id': 's1',
+            'participant_id': 'p1',
+            'type': 'convocation',
+            'nom_fichier': rendu.nom_fichier,
+        }
+    }])[0]
+
+
+def test_empreinte_enregistree_dans_les_metadonnees(base):
+    rendu = QualiopisDocumentGenerator(base, output_dir=None).generer_convocation('s1', 'p1')
+
+    resultat = _publier(base, rendu)
+
+    assert resultat['success'] and not resultat['inchange']
+    assert base.tables['documents'][0]['metadata']['empreinte_entrees'] == rendu.metadata['empreinte_entrees']
+
+
+def test_document_publie_repris_sans_rendu(base, monkeypatch):
+    premier = QualiopisDocumentGenerator(base, output_dir=None).generer_convocation('s1', 'p1')
+    _publier(base, premier)
+
+    import documentGenerator
+    def rendu_interdit(*args, **kwargs):
+        raise AssertionError("Document rendu alors qu'il est déjà publié")
+    monkeypatch.setattr(documentGenerator, 'SimpleDocTemplate', rendu_interdit)
+
+    generateur = QualiopisDocumentGenerator(base, output_dir=None)
+    second = generateur.generer_convocation('s1', 'p1')
+    resultat = _publier(base, second)
+
+    assert second.contenu == premier.contenu
+    assert generateur.inchanges == ['convocation_p1.pdf']
+    assert resultat['success'] and resultat['inchange']
+    assert len(base.tables['documents']) == 1
+
+
+def test_entrees_modifiees_nouveau_rendu(base):
+    premier = QualiopisDocumentGenerator(base, output_dir=None).generer_convocation('s1', 'p1')
+    _publier(base, premier)
+    base.tables['vue_sessions_formation'][0]['lieu'] = 'Lyon'
+
+    generateur = QualiopisDocumentGenerator(base, output_dir=None)
+    second = generateur.generer_convocation('s1', 'p1')
+    resultat = _publier(base, second)
+
+    assert second.metadata['empreinte_entrees'] != premier.metadata['empreinte_entrees']
+    assert generateur.inchanges == []
+    assert not resultat['inchange']
+    assert len(base.tables['documents']) == 2
+
+
+def test_document_publie_pour_une_autre_session_non_repris(base):
+    rendu = QualiopisDocumentGenerator(base, output_dir=None).generer_convocation('s1', 'p1')
+    _publier(base, rendu)
+
+    resultat = DocumentPublisher(base, 'documents').publier([{
+        'contenu': rendu.contenu,
+        'empreinte_entrees': rendu.metadata['empreinte_entrees'],
+        'metadata': {'session_formation_id': 's2', 'participant_id': 'p1', 'type': 'convocation'}
+    }])[0]
+
+    assert not resultat['inchange']
+    assert len(base.tables['documents']) == 2
+
+
+def test_contenu_publie(base):
+    rendu = QualiopisDocumentGenerator(base, output_dir=None).generer_convocation('s1', 'p1')
+    _publier(base, rendu)
+    publisher = DocumentPublisher(base, 'documents')
+
+    ligne, contenu = publisher.contenu_publie(rendu.metadata['empreinte_entrees'], 's1', 'p1')
+
+    assert contenu == rendu.contenu
+    assert ligne['nom_fichier'] == 'convocation_p1.pdf'
+    assert publisher.contenu_publie(rendu.metadata['empreinte_entrees'], 's1', 'p2') is None
+
+
+def test_variables_du_jour_hors_empreinte():
+    variables = {'{{session_lieu}}': 'Paris', '{{date_aujourd_hui}}': '18/10/2026', '{{annee}}': '2026'}
+    lendemain = dict(variables, **{'{{date_aujourd_hui}}': '19/10/2026', '{{annee}}': '2027'})
+    autre_lieu = dict(variables, **{'{{session_lieu}}': 'Lyon'})
+
+    assert empreinte_variables(variables, 'template') == empreinte_variables(lendemain, 'template')
+    assert empreinte_variables(variables, 'template') != empreinte_variables(autre_lieu, 'template')
+    assert empreinte_variables(variables, 'template') != empreinte_variables(variables, 'autre template')
@@ -0,0 +1,253 @@
+"""
+Tests des nouvelles tentatives et du disjoncteur des appels Supabase
+"""
+
+import pytest
+from storage3.exceptions import StorageApiError
+
+from utils import resilience
+from utils.resilience import CircuitOuvert, Resilience, est_temporaire, statut_http
+
+
+class ErreurHttp(Exception):
+    def __init__(self, statut, entetes=None):
+        super().__init__(f"HTTP {statut}")
+        self.response = type('Reponse', (), {'status_code': statut, 'headers': entetes or {}})()
+
+
+class Horloge:
+    """Remplace time.monotonic du module pour piloter le disjoncteur"""
+
+    def __init__(self):
+        self.maintenant = 1000.0
+
+    def __call__(self):
+        return self.maintenant
+
+
+@pytest.fixture
+def horloge(monkeypatch):
+    horloge = Horloge()
+    monkeypatch.setattr(resilience.time, 'monotonic', horloge)
+    return horloge
+
+
+@pytest.fixture
+def attentes():
+    return []
+
+
+def _resilience(attentes, **kwargs):
+    instance = Resilience(**kwargs)
+    instance._attendre = attentes.append
+    return instance
+
+
+def _echecs_puis(valeur, *erreurs):
+    """Fonction qui lève les erreurs données puis renvoie valeur"""
+    restantes = list(erreurs)
+    appels = []
+
+    def fonction():
+        appels.append(1)
+        if restantes:
+            raise restantes.pop(0)
+        return valeur
+
+    fonction.appels = appels
+    return fonction
+
+
+# Détection des erreurs temporaires
+
+@pytest.mark.parametrize('erreur, statut', [
+    (ErreurHttp(503), 503),
+    (StorageApiError('indisponible', 'InternalError', 503), 503),
+    (StorageApiError('trop de requêtes', 'TooManyRequests', '429'), 429),
+    (StorageApiError('introuvable', 'NotFound', 404), 404),
+    (type('APIError', (Exception,), {'code': '502'})(), 502),
+    (type('APIError', (Exception,), {'code': 'PGRST116'})(), None),
+    (ValueError('x'), None),
+])
+def test_statut_http(erreur, statut):
+    assert statut_http(erreur) == statut
+
+
+def test_erreurs_storage_temporaires():
+    assert est_temporaire(StorageApiError('x', 'InternalError', 503))
+    assert est_temporaire(StorageApiError('x', 'TooManyRequests', 429))
+    assert not est_temporaire(StorageApiError('x', 'NotFound', 404))
+    assert est_temporaire(ConnectionError())
+
+
+# Nouvelles tentatives
+
+def test_nouvel_essai_apres_erreur_temporaire(attentes):
+    instance = _resilience(attentes, tentatives=3)
+    fonction = _echecs_puis('ok', ErreurHttp(503), StorageApiError('x', 'InternalError', 503))
+
+    assert instance.executer('storage', fonction) == 'ok'
+    assert len(fonction.appels) == 3
+    assert len(attentes) == 2
+    assert instance.statistiques()['operations']['storage']['retries'] == 2
+
+
+def test_pas_de_nouvel_essai_pour_une_erreur_4xx(attentes):
+    instance = _resilience(attentes)
+    fonction = _echecs_puis('ok', ErreurHttp(400))
+
+    with pytest.raises(ErreurHttp):
+        instance.executer('documents', fonction)
+    assert len(fonction.appels) == 1
+    assert attentes == []
+
+
+def test_pas_de_nouvel_essai_sans_retry(attentes):
+    instance = _resilience(attentes)
+    fonction = _echecs_puis('ok', ErreurHttp(503))
+
+    with pytest.raises(ErreurHttp):
+        instance.executer('documents', fonction, retry=False)
+    assert len(fonction.appels) == 1
+
+
+def test_echec_apres_toutes_les_tentatives(attentes):
+    instance = _resilience(attentes, tentatives=3, seuil_echecs=10)
+    fonction = _echecs_puis('ok', *[ErreurHttp(502)] * 3)
+
+    with pytest.raises(ErreurHttp):
+        instance.executer('documents', fonction)
+    assert len(fonction.appels) == 3
+    assert instance.statistiques()['operations']['documents']['echecs'] == 1
+
+
+def test_attente_exponentielle_bornee(attentes):
+    instance = _resilience(attentes, attente_base=0.5, attente_max=8.0)
+
+    for essai in range(10):
+        assert 0 <= instance.attente(essai) <= min(8.0, 0.5 * 2 ** essai)
+
+
+def test_retry_after_respecte(attentes):
+    instance = _resilience(attentes, attente_max=8.0)
+    fonction = _echecs_puis('ok', ErreurHttp(429, {'Retry-After': '3'}))
+
+    assert instance.executer('documents', fonction) == 'ok'
+    assert attentes == [3.0]
+
+
+def test_retry_after_trop_long_ouvre_le_disjoncteur(attentes, horloge):
+    instance = _resilience(attentes, attente_max=8.0, delai_reouverture=30)
+    fonction = _echecs_puis('ok', ErreurHttp(503, {'Retry-After': '120'}))
+
+    # Pas de nouvel essai avant le délai demandé par le serveur
+    with pytest.raises(ErreurHttp):
+        instance.executer('storage', fonction)
+    assert len(fonction.appels) == 1
+    assert attentes == []
+    assert instance.disjoncteur.etat == 'ouvert'
+
+    # Appels suivants refusés sans réseau jusqu'à la fin du délai, au-delà de delai_reouverture
+    horloge.maintenant += 60
+    with pytest.raises(CircuitOuvert):
+        instance.executer('storage', fonction)
+    assert len(fonction.appels) == 1
+
+    horloge.maintenant += 61
+    assert instance.executer('storage', fonction) == 'ok'
+    assert instance.disjoncteur.etat == 'ferme'
+
+
+# Disjoncteur
+
+def test_disjoncteur_ouvert_puis_semi_ouvert_puis_ferme(attentes, horloge):
+    instance = _resilience(attentes, tentatives=1, seuil_echecs=2, delai_reouverture=30)
+    en_panne = _echecs_puis('ok', *[ErreurHttp(503)] * 10)
+
+    for _ in range(2):
+        with pytest.raises(ErreurHttp):
+            instance.executer('documents', en_panne)
+    assert instance.disjoncteur.etat == 'ouvert'
+
+    # Ouvert : échec immédiat, sans appel
+    with pytest.raises(CircuitOuvert):
+        instance.executer('documents', en_panne)
+    assert len(en_panne.appels) == 2
+
+    # Après le délai : un appel d'essai ; s'il échoue, le disjoncteur se rouvre
+    horloge.maintenant += 31
+    with pytest.raises(ErreurHttp):
+        instance.executer('documents', en_panne)
+    assert instance.disjoncteur.etat == 'ouvert'
+    assert len(en_panne.appels) == 3
+
+    # Nouvel essai réussi : le disjoncteur se referme
+    horloge.maintenant += 31
+    assert instance.executer('documents', lambda: 'ok') == 'ok'
+    assert instance.disjoncteur.etat == 'ferme'
+    assert instance.disjoncteur.echecs == 0
+
+    compteurs = instance.statistiques()['operations']['documents']
+    assert compteurs['ouvertures'] == 2
+    assert compteurs['rejets'] == 1
+
+
+def test_semi_ouvert_un_seul_appel_d_essai(attentes, horloge):
+    instance = _resilience(attentes, tentatives=1, seuil_echecs=1, delai_reouverture=30)
+    with pytest.raises(ErreurHttp):
+        instance.executer('documents', _echecs_puis('ok', ErreurHttp(503)))
+    horloge.maintenant += 31
+
+    # Appels concurrents pendant l'appel d'essai : refusés sans atteindre Supabase
+    concurrents = []
+
+    def essai():
+        with pytest.raises(CircuitOuvert):
+            instance.executer('documents', lambda: concurrents.append(1))
+        return 'ok'
+
+    assert instance.executer('documents', essai) == 'ok'
+    assert concurrents == []
+    assert instance.disjoncteur.etat == 'ferme'
+    assert instance.executer('documents', lambda: 'suivant') == 'suivant'
+
+
+def test_semi_ouvert_essai_perdu_remplace(horloge):
+    disjoncteur = resilience.Disjoncteur(seuil_echecs=1, delai_reouverture=30)
+    disjoncteur.echec()
+    horloge.maintenant += 31
+
+    assert disjoncteur.autoriser() is True
+    assert disjoncteur.autoriser() is False
+
+    # Essai sans résultat (appelant interrompu) : un nouvel essai après le délai
+    horloge.maintenant += 31
+    assert disjoncteur.autoriser() is True
+    assert disjoncteur.autoriser() is False
+
+
+def test_erreur_4xx_ne_compte_pas_pour_le_disjoncteur(attentes):
+    instance = _resilience(attentes, tentatives=1, seuil_echecs=2)
+
+    for _ in range(5):
+        with pytest.raises(ErreurHttp):
+            instance.executer('documents', _echecs_puis('ok', ErreurHttp(404)))
+    assert instance.disjoncteur.etat == 'ferme'
+
+
+def test_upload_storage_reessaye_sur_erreur_503(attentes):
+    from utils.document_publisher import DocumentPublisher
+
+    essais = []
+
+    class Bucket:
+        def upload(self, chemin, contenu, options):
+            essais.append(chemin)
+            if len(essais) == 1:
+                raise StorageApiError('indisponible', 'InternalError', 503)
+
+    client = type('Client', (), {'storage': type('Storage', (), {'from_': lambda self, nom: Bucket()})()})()
+    publisher = DocumentPublisher(client, resilience=_resilience(attentes))
+
+    assert publisher._upload({'storage_path': 'sha256/ab/abc.pdf', 'contenu': b'%PDF'}) is None
+    assert len(essais) == 2
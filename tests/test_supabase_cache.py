@@ -0,0 +1,76 @@
+"""
+Tests des lectures groupées par ID à travers le cache de lecture
+"""
+
+import pytest
+
+from utils import supabase_client
+from utils.supabase_client import SupabaseClient
+
+from supabase_factice import SupabaseFactice
+
+
+@pytest.fixture
+def base():
+    return SupabaseFactice({
+        'entreprises': [{'id': f'e{i}', 'nom': f'Entreprise {i}'} for i in range(4)],
+        'formations_catalogue': [{'id': 'f1', 'titre': 'Excel'}],
+    })
+
+
+@pytest.fixture
+def client(base, monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', 'http://localhost')
+    monkeypatch.setenv('SUPABASE_KEY', 'cle')
+    monkeypatch.setattr(supabase_client, 'create_client', lambda url, cle: base)
+    return SupabaseClient(cache=True)
+
+
+def _requetes(base, table):
+    return [requete for requete in base.requetes if requete.table == table]
+
+
+def test_ids_en_cache_servis_sans_requete(client, base):
+    assert sorted(client.get_entreprises_by_ids(['e0', 'e1'])) == ['e0', 'e1']
+    assert sorted(client.get_entreprises_by_ids(['e0', 'e1', 'e2'])) == ['e0', 'e1', 'e2']
+    assert client.get_entreprises_by_ids(['e2', 'e1', 'e0']).keys() == {'e0', 'e1', 'e2'}
+
+    # Page 1 : e0, e1 ; page 2 : e2 seulement ; page 3 : aucune requête
+    assert len(_requetes(base, 'entreprises')) == 2
+
+
+def test_cache_partage_avec_lecture_par_id(client, base):
+    client.get_entreprise_by_id('e3')
+    client.get_formations_by_ids(['f1'])
+
+    assert client.get_entreprises_by_ids(['e3'])['e3']['nom'] == 'Entreprise 3'
+    assert client.get_formation_by_id('f1')['titre'] == 'Excel'
+    assert len(_requetes(base, 'entreprises')) == 1
+    assert len(_requetes(base, 'formations_catalogue')) == 1
+
+
+def test_ids_introuvables_mis_en_cache(client, base):
+    assert client.get_entreprises_by_ids(['inconnue', None]) == {}
+    assert client.get_entreprises_by_ids(['inconnue']) == {}
+    assert client.get_entreprise_by_id('inconnue') is None
+    assert len(_requetes(base, 'entreprises')) == 1
+
+
+def test_invalidation_relit_les_ids(client, base):
+    client.get_entreprises_by_ids(['e0'])
+    base.tables['entreprises'][0]['nom'] = 'Renommée'
+    client.invalider_cache('entreprises')
+
+    assert client.get_entreprises_by_ids(['e0'])['e0']['nom'] == 'Renommée'
+
+
+def test_sans_cache_chaque_lecture_interroge_la_base(base, monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', 'http://localhost')
+    monkeypatch.setenv('SUPABASE_KEY', 'cle')
+    monkeypatch.setenv('SUPABASE_CACHE', '')
+    monkeypatch.setattr(supabase_client, 'create_client', lambda url, cle: base)
+    client = SupabaseClient()
+
+    client.get_entreprises_by_ids(['e0'])
+    client.get_entreprises_by_ids(['e0'])
+    assert len(_requetes(base, 'entreprises')) == 2
@@ -0,0 +1,73 @@
+"""
+Tests de la suppression des fichiers Storage partagés par plusieurs documents
+"""
+
+import pytest
+
+from utils import supabase_client
+from utils.supabase_client import SupabaseClient
+
+from supabase_factice import SupabaseFactice
+
+CHEMIN = 'sha256/ab/abcd.pdf'
+
+
+@pytest.fixture
+def base():
+    base = SupabaseFactice({'documents': []})
+    base.storage.from_('documents').upload(CHEMIN, b'%PDF')
+    return base
+
+
+@pytest.fixture
+def client(base, monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', 'http://localhost')
+    monkeypatch.setenv('SUPABASE_KEY', 'cle')
+    monkeypatch.setenv('SUPABASE_CACHE', '')
+    monkeypatch.setattr(supabase_client, 'create_client', lambda url, cle: base)
+    return SupabaseClient()
+
+
+def _fichiers(base):
+    return base.storage.buckets['documents']
+
+
+def test_fichier_partage_conserve(client, base):
+    base.tables['documents'] = [
+        {'id': 'd1', 'storage_path': CHEMIN},
+        {'id': 'd2', 'storage_path': CHEMIN},
+    ]
+
+    assert client.delete_document('documents', CHEMIN, document_id='d1') is True
+    assert CHEMIN in _fichiers(base)
+
+
+def test_fichier_supprime_quand_seule_la_ligne_supprimee_le_reference(client, base):
+    base.tables['documents'] = [
+        {'id': 'd1', 'storage_path': CHEMIN},
+        {'id': 'd2', 'storage_path': 'sha256/cd/cdef.pdf'},
+    ]
+
+    assert client.delete_document('documents', CHEMIN, document_id='d1') is True
+    assert CHEMIN not in _fichiers(base)
+
+
+def test_fichier_supprime_apres_suppression_des_lignes(client, base):
+    assert client.delete_document('documents', CHEMIN) is True
+    assert CHEMIN not in _fichiers(base)
+
+
+def test_fichier_reference_conserve_sans_document_id(client, base):
+    base.tables['documents'] = [{'id': 'd2', 'storage_path': CHEMIN}]
+
+    assert client.delete_document('documents', CHEMIN) is True
+    assert CHEMIN in _fichiers(base)
+
+
+def test_references_illisibles_fichier_conserve(client, base, monkeypatch):
+    def en_panne(nom):
+        raise ConnectionError("PostgREST indisponible")
+    monkeypatch.setattr(base, 'table', en_panne)
+
+    assert client.delete_document('documents', CHEMIN, document_id='d1') is False
+    assert CHEMIN in _fichiers(base)
@@ -0,0 +1,132 @@
+"""
+Tests de la pagination par clé (date_debut, id) des sessions
+"""
+
+import pytest
+
+from utils import supabase_client
+from utils.supabase_client import SupabaseClient
+
+from supabase_factice import SupabaseFactice
+
+
+@pytest.fixture
+def base():
+    return SupabaseFactice({'sessions_formation': []})
+
+
+@pytest.fixture
+def client(base, monkeypatch):
+    monkeypatch.setenv('SUPABASE_URL', 'http://localhost')
+    monkeypatch.setenv('SUPABASE_KEY', 'cle')
+    monkeypatch.setenv('SUPABASE_CACHE', '')
+    monkeypatch.setattr(supabase_client, 'create_client', lambda url, cle: base)
+    return SupabaseClient()
+
+
+def _sessions(*dates, statut='planifiee'):
+    return [
+        {'id': f's{index:02d}', 'date_debut': date, 'statut': statut}
+        for index, date in enumerate(dates)
+    ]
+
+
+def _parcourir(client, **kwargs):
+    return [session['id'] for page in client.iter_sessions_pages(**kwargs) for session in page]
+
+
+def test_egalites_de_date_entre_deux_pages(client, base):
+    # Sept sessions le même jour : chaque limite de page coupe un groupe de dates égales
+    base.tables['sessions_formation'] = _sessions(
+        '2026-11-02', '2026-11-02', '2026-11-02', '2026-11-02',
+        '2026-11-02', '2026-11-02', '2026-11-02', '2026-11-01', '2026-11-03'
+    )
+
+    ids = _parcourir(client, page_size=2)
+
+    assert ids == ['s07'] + [f's{i:02d}' for i in range(7)] + ['s08']
+
+
+def test_sessions_sans_date_parcourues_en_dernier(client, base):
+    base.tables['sessions_formation'] = _sessions(None, '2026-11-02', None, '2026-11-01', None, None)
+
+    ids = _parcourir(client, page_size=2)
+
+    assert ids == ['s03', 's01', 's00', 's02', 's04', 's05']
+    assert len(ids) == len(set(ids))
+
+
+@pytest.mark.parametrize('page_size', [1, 2, 3, 4, 10])
+def test_aucune_session_perdue_ni_dupliquee(client, base, page_size):
+    base.tables['sessions_formation'] = _sessions(
+        '2026-11-03', None, '2026-11-01', '2026-11-01', None, '2026-11-03', '2026-11-02'
+    )
+
+    ids = _parcourir(client, page_size=page_size)
+
+    assert sorted(ids) == sorted(s['id'] for s in base.tables['sessions_formation'])
+    assert len(ids) == len(set(ids))
+
+
+def test_changement_de_statut_pendant_le_parcours(client, base):
+    sessions = _sessions(*(['2026-11-02'] * 4 + ['2026-11-05'] * 4))
+    base.tables['sessions_formation'] = sessions
+
+    def modifier(requete):
+        # Après la première page : une session déjà lue et une session à venir quittent le filtre
+        if len(base.requetes) == 1:
+            sessions[0]['statut'] = 'terminee'
+            sessions[6]['statut'] = 'terminee'
+
+    base.apres_requete = modifier
+
+    ids = _parcourir(client, page_size=3, filters={'statut': 'planifiee'})
+
+    # Une pagination par offset sauterait une session ; la clé reprend après la dernière lue
+    assert ids == ['s00', 's01', 's02', 's03', 's04', 's05', 's07']
+
+
+def test_session_ajoutee_avant_le_curseur_ignoree(client, base):
+    sessions = _sessions('2026-11-02', '2026-11-03', '2026-11-04', '2026-11-05')
+    base.tables['sessions_formation'] = sessions
+
+    def ajouter(requete):
+        if len(base.requetes) == 1:
+            sessions.append({'id': 's99', 'date_debut': '2026-11-01', 'statut': 'planifiee'})
+
+    base.apres_requete = ajouter
+
+    assert _parcourir(client, page_size=2) == ['s00', 's01', 's02', 's03']
+
+
+def test_page_avec_curseur_et_filtres_de_dates(client, base):
+    base.tables['sessions_formation'] = _sessions(
+        '2026-10-31', '2026-11-02', '2026-11-02', '2026-11-10', '2026-12-01', None
+    )
+
+    sessions, total = client.get_sessions_page(
+        filters={'date_debut_min': '2026-11-01', 'date_debut_max': '2026-12-01'},
+        after=('2026-11-02', 's01'),
+        limit=10
+    )
+
+    assert [s['id'] for s in sessions] == ['s02', 's03']
+    assert total == 2
+
+
+def test_page_sans_comptage(client, base):
+    base.tables['sessions_formation'] = _sessions('2026-11-01', '2026-11-02')
+
+    sessions, total = client.get_sessions_page(limit=1, count=False)
+
+    assert [s['id'] for s in sessions] == ['s00']
+    assert total is None
+
+
+def test_parcours_avec_projection(client, base):
+    base.tables['sessions_formation'] = _sessions('2026-11-01', '2026-11-02')
+
+    ids = _parcourir(client, filters={'statut': 'planifiee'}, columns='scheduling')
+
+    assert ids == ['s00', 's01']
+    assert {requete.colonnes for requete in base.requetes} == {supabase_client.PROJECTIONS['scheduling']['sessions_formation']}
@@ -0,0 +1,117 @@
+"""
+Tests du regroupement des placeholders coupés par Word sur plusieurs runs
+"""
+
+from docx import Document
+from docx.oxml import OxmlElement
+from docx.oxml.ns import qn
+
+from templateCache import parties_texte
+from templateEngine import fusionner_placeholders_coupes, normaliser_placeholders
+
+
+def _paragraphe(*morceaux, document=None):
+    """Paragraphe dont chaque morceau est un run (texte, gras)"""
+    document = document or Document()
+    paragraphe = document.add_paragraph()
+    for texte, gras in morceaux:
+        paragraphe.add_run(texte).bold = gras
+    return paragraphe
+
+
+def test_placeholder_entier_dans_un_run_inchange():
+    paragraphe = _paragraphe(('Bonjour {{participant_nom}}', False))
+
+    assert fusionner_placeholders_coupes(paragraphe._p) == 0
+    assert [run.text for run in paragraphe.runs] == ['Bonjour {{participant_nom}}']
+
+
+def test_placeholder_coupe_sur_trois_runs():
+    paragraphe = _paragraphe(('Bonjour {{partic', False), ('ipant_', False), ('nom}} !', False))
+
+    assert fusionner_placeholders_coupes(paragraphe._p) == 1
+    assert [run.text for run in paragraphe.runs] == ['Bonjour {{participant_nom}}', '', ' !']
+    assert paragraphe.text == 'Bonjour {{participant_nom}} !'
+
+
+def test_mise_en_forme_du_premier_run_conservee():
+    paragraphe = _paragraphe(('{{date_', True), ('debut}}', False), (' et suite', False))
+
+    fusionner_placeholders_coupes(paragraphe._p)
+
+    runs = paragraphe.runs
+    assert runs[0].text == '{{date_debut}}' and runs[0].bold
+    # Le texte hors placeholder garde la mise en forme de son run
+    assert runs[1].text == '' and not runs[1].bold
+    assert runs[2].text == ' et suite' and not runs[2].bold
+
+
+def test_plusieurs_placeholders_dans_un_paragraphe():
+    paragraphe = _paragraphe(('{{a', False), ('}} et {{b', False), ('}}', False))
+
+    assert fusionner_placeholders_coupes(paragraphe._p) == 2
+    assert paragraphe.text == '{{a}} et {{b}}'
+    assert [run.text for run in paragraphe.runs] == ['{{a}}', ' et {{b}}', '']
+
+
+def test_espaces_preserves_dans_les_runs_modifies():
+    paragraphe = _paragraphe(('Du {{date', False), ('}} au', False))
+
+    fusionner_placeholders_coupes(paragraphe._p)
+
+    for run in paragraphe.runs:
+        t = run._r.find(qn('w:t'))
+        assert t.get(qn('xml:space')) == 'preserve'
+
+
+def test_pas_de_fusion_a_travers_une_tabulation():
+    paragraphe = _paragraphe(('{{nom', False))
+    paragraphe.runs[0]._r.append(OxmlElement('w:tab'))
+    paragraphe.add_run('}}')
+
+    assert fusionner_placeholders_coupes(paragraphe._p) == 0
+    assert [run.text for run in paragraphe.runs] == ['{{nom\t', '}}']
+
+
+def test_pas_de_fusion_a_travers_un_saut_de_ligne():
+    paragraphe = _paragraphe(('{{nom', False))
+    paragraphe.runs[0].add_break()
+    paragraphe.add_run('}}')
+
+    assert fusionner_placeholders_coupes(paragraphe._p) == 0
+    assert paragraphe.runs[-1].text == '}}'
+
+
+def test_accolades_sans_placeholder_valide_ignorees():
+    paragraphe = _paragraphe(('{{ nom', False), (' }}', False))
+
+    assert fusionner_placeholders_coupes(paragraphe._p) == 0
+    assert [run.text for run in paragraphe.runs] == ['{{ nom', ' }}']
+
+
+def test_paragraphes_des_tableaux_normalises():
+    document = Document()
+    cellule = document.add_table(rows=1, cols=1).cell(0, 0)
+    cellule.paragraphs[0].add_run('{{formation_')
+    cellule.paragraphs[0].add_run('titre}}')
+
+    assert normaliser_placeholders(document.element.body) == 1
+    assert cellule.paragraphs[0].runs[0].text == '{{formation_titre}}'
+
+
+def test_en_tetes_et_pieds_de_page_normalises():
+    document = Document()
+    _paragraphe(('{{session_', False), ('id}}', False), document=document)
+    section = document.sections[0]
+    en_tete = section.header.paragraphs[0]
+    en_tete.add_run('{{organisme_')
+    en_tete.add_run('nom}}')
+    pied = section.footer.paragraphs[0]
+    pied.add_run('Page {{num')
+    pied.add_run('ero}}')
+
+    fusions = sum(normaliser_placeholders(part.element) for part in parties_texte(document).values())
+
+    assert fusions == 3
+    assert en_tete.runs[0].text == '{{organisme_nom}}'
+    assert pied.runs[0].text == 'Page {{numero}}'